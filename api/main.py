@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routers import articles
+from core.db.config import get_async_engine, pool_status
 
 app = FastAPI(
     title="Greek News NLP API",
@@ -28,6 +29,11 @@ async def root():
         "status": "active"
     }
 
+@app.get("/health/db")
+async def database_health():
+    """Connection pool state and checkout wait times of the API's database engine."""
+    return pool_status(get_async_engine())
+
 # Include routers
 app.include_router(articles.router, prefix="/api/v1", tags=["articles"])
 
@@ -1,16 +1,29 @@
 """Article-related routes."""
+import base64
+import json
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, and_, func, null, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    joinedload,
+    load_only,
+    selectinload,
+    with_expression,
+)
 
-from core.db.config import get_db
+from core.db.config import get_async_db
 from core.db.models import Article, Blogger, StancePrediction
 
 router = APIRouter()
 
+# Newest first; undated articles last on every database
+ORDER = (Article.published_date.desc().nulls_last(), Article.id.desc())
+MAX_PAGE_SIZE = 100
+
 # Pydantic models for response
 class StancePredictionResponse(BaseModel):
     target: str
@@ -47,10 +60,138 @@ class ArticleResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.get("/articles", response_model=List[ArticleResponse])
+class StanceLabelResponse(BaseModel):
+    target: str
+    target_type: str
+    stance: str
+
+    class Config:
+        from_attributes = True
+
+class ArticleSummaryResponse(BaseModel):
+    id: int
+    title: str
+    article_url: str
+    published_date: Optional[datetime]
+    blogger: BloggerResponse
+    stance_predictions: List[StanceLabelResponse]
+    excerpt: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class ArticlePage(BaseModel):
+    items: List[ArticleResponse]
+    next_cursor: Optional[str]
+
+class ArticleSummaryPage(BaseModel):
+    items: List[ArticleSummaryResponse]
+    next_cursor: Optional[str]
+
+
+def full_options() -> List:
+    """Load an article with everything ``ArticleResponse`` shows."""
+    return [
+        joinedload(Article.blogger),
+        selectinload(Article.categories),
+        selectinload(Article.stance_predictions),
+    ]
+
+
+def summary_options(excerpt: int) -> List:
+    """Load only the columns ``ArticleSummaryResponse`` shows.
+
+    ``content`` stays in the database; the excerpt is cut by ``substr``.
+    """
+    return [
+        load_only(
+            Article.id, Article.title, Article.article_url, Article.published_date
+        ),
+        joinedload(Article.blogger).load_only(Blogger.name, Blogger.profile_url),
+        selectinload(Article.stance_predictions).load_only(
+            StancePrediction.target,
+            StancePrediction.target_type,
+            StancePrediction.stance,
+        ),
+        with_expression(
+            Article.excerpt,
+            func.substr(Article.content, 1, excerpt) if excerpt else null(),
+        ),
+    ]
+
+
+def encode_cursor(article: Article) -> str:
+    """Opaque cursor for the page after ``article``."""
+    published = article.published_date and article.published_date.isoformat()
+    key = json.dumps([published, article.id]).encode()
+    return base64.urlsafe_b64encode(key).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        published, article_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return (
+            datetime.fromisoformat(published) if published else None,
+            int(article_id),
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def cursor_page(conditions: List, cursor: Optional[str], limit: int) -> Select:
+    """Ids of the ``limit`` articles matching ``conditions`` after ``cursor``.
+
+    Dated and undated articles are paged in separate branches so that each is
+    a bounded range scan of ``ix_articles_published_date_id``; a single keyset
+    condition OR-ed with ``published_date IS NULL`` could not use the index.
+    """
+    published, article_id = decode_cursor(cursor) if cursor else (None, None)
+    branches = []
+    if article_id is None or published is not None:
+        dated = [Article.published_date.is_not(None)]
+        if published is not None:
+            dated += [
+                Article.published_date <= published,
+                or_(Article.published_date < published, Article.id < article_id),
+            ]
+        branches.append(dated)
+    undated = [Article.published_date.is_(None)]
+    if article_id is not None and published is None:
+        undated.append(Article.id < article_id)
+    branches.append(undated)
+
+    pages = union_all(
+        *(
+            select(Article.id, Article.published_date)
+            .where(*conditions, *branch)
+            .order_by(*ORDER)
+            .limit(limit)
+            .subquery()
+            .select()
+            for branch in branches
+        )
+    ).subquery()
+    return (
+        select(pages.c.id)
+        .order_by(pages.c.published_date.desc().nulls_last(), pages.c.id.desc())
+        .limit(limit)
+    )
+
+
+@router.get(
+    "/articles",
+    response_model=Union[
+        List[ArticleResponse],
+        List[ArticleSummaryResponse],
+        ArticlePage,
+        ArticleSummaryPage,
+    ],
+)
 async def get_articles(
-    skip: int = Query(0, description="Number of articles to skip"),
-    limit: int = Query(10, description="Number of articles to return"),
+    skip: int = Query(0, ge=0, description="Number of articles to skip"),
+    limit: int = Query(
+        10, ge=1, le=MAX_PAGE_SIZE, description="Number of articles to return"
+    ),
     target: Optional[str] = Query(None, 
                                   description="Filter by target " \
                                     "(e.g. team name or referee)"),
@@ -58,44 +199,127 @@ async def get_articles(
                                        description="Filter by target type " \
                                         "(club or referee)"),
     stance: Optional[str] = Query(None, description="Filter by stance"),
-    db: Session = Depends(get_db)
+    pagination: Literal["offset", "cursor"] = Query(
+        "offset",
+        description="'cursor' returns an ArticlePage whose next_cursor fetches "
+        "the next page",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (implies cursor mode)"
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full",
+        description="'summary' leaves out the content, categories and "
+        "justifications (see GET /articles/{article_id} for the full article)",
+    ),
+    excerpt: int = Query(
+        0,
+        ge=0,
+        le=2000,
+        description="Characters of content to include as an excerpt in the "
+        "summary view",
+    ),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get articles with their stance predictions.
+    """Get articles with their stance predictions, newest first.
     
+    A page costs three queries whatever its size: the page's article ids are
+    selected in a subquery, and the articles are loaded with their blogger
+    joined and their categories and stance predictions ``selectin``-loaded.
+
+    ``skip`` pages have to scan past every skipped article, so deep pages get
+    slower. Cursor pages start right after the previous page's last
+    ``(published_date, id)`` on the ``ix_articles_published_date_id`` index
+    and cost the same at any depth.
+
+    The summary view is meant for list views: it loads only the columns it
+    returns, so the article bodies are neither read nor sent.
+
     Args:
         skip: Number of articles to skip (pagination)
         limit: Number of articles to return (pagination)
         target: Optional filter by target (e.g. team name or referee)
         target_type: Optional filter by target type (club or referee)
         stance: Optional filter by stance
+        pagination: ``offset`` (``skip``) or ``cursor``
+        cursor: Cursor of the page to fetch, from ``next_cursor``
+        view: ``full`` articles or their ``summary``
+        excerpt: Length of the summaries' content excerpt (``0`` for none)
         db: Database session
     
     Returns:
-        List of articles with their stance predictions
+        List of articles (or summaries) with their stance predictions, or
+        with cursor pagination a page of them with the next page's cursor
     """
-    query = db.query(Article)
-
-    # Apply filters if provided
-    if any([target, target_type, stance]):
-        query = query.join(StancePrediction)
-        
-        if target:
-            query = query.filter(StancePrediction.target == target)
-        if target_type:
-            query = query.filter(StancePrediction.target_type == target_type)
-        if stance:
-            query = query.filter(StancePrediction.stance == stance)
-
-    # Add joins for eager loading
+    by_cursor = pagination == "cursor" or cursor is not None
+    if by_cursor and skip:
+        raise HTTPException(
+            status_code=400, detail="skip cannot be combined with cursor pagination"
+        )
+
+    # Only articles with a blogger, a category and a (matching) prediction
+    filters = []
+    if target:
+        filters.append(StancePrediction.target == target)
+    if target_type:
+        filters.append(StancePrediction.target_type == target_type)
+    if stance:
+        filters.append(StancePrediction.stance == stance)
+    conditions = [
+        Article.blogger_id.is_not(None),
+        Article.categories.any(),
+        Article.stance_predictions.any(and_(*filters) if filters else None),
+    ]
+
+    if by_cursor:
+        # One more article tells whether there is a next page
+        page = cursor_page(conditions, cursor, limit + 1)
+    else:
+        page = (
+            select(Article.id)
+            .where(*conditions)
+            .order_by(*ORDER)
+            .offset(skip)
+            .limit(limit)
+        )
     query = (
-        query
-        .join(Blogger)
-        .join(Article.categories)
-        .join(Article.stance_predictions)
-        .distinct()
-        .order_by(Article.published_date.desc())
-        .offset(skip)
-        .limit(limit)
+        select(Article)
+        .where(Article.id.in_(page.scalar_subquery()))
+        .options(*(summary_options(excerpt) if view == "summary" else full_options()))
+        .order_by(*ORDER)
     )
 
-    return query.all() 
\ No newline at end of file
+    articles = (await db.scalars(query)).all()
+    if view == "summary":
+        # Validated here, as the full models would load the deferred columns
+        articles = [ArticleSummaryResponse.model_validate(a) for a in articles]
+    if not by_cursor:
+        return articles
+    items = articles[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(articles) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/articles/{article_id}", response_model=ArticleResponse)
+async def get_article(
+    article_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    """Get one article with its full content and stance predictions.
+
+    Args:
+        article_id: Article id
+        db: Database session
+
+    Returns:
+        The article, or 404 if there is none with a blogger for the id
+    """
+    article = (
+        await db.scalars(
+            select(Article)
+            .where(Article.id == article_id, Article.blogger_id.is_not(None))
+            .options(*full_options())
+        )
+    ).first()
+    if article is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return article
@@ -0,0 +1 @@
+"""Benchmarks for the scraping, loading and prediction pipelines."""
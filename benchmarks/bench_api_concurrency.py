@@ -0,0 +1,203 @@
+"""Load-test the articles API under concurrent requests.
+
+Serves the API with uvicorn on a local port and keeps ``--concurrency``
+clients requesting article pages for ``--duration`` seconds, a mix of cheap
+first pages and expensive deep ``skip`` pages. It runs twice: with the
+routes as they were, running synchronous SQLAlchemy queries inside ``async``
+routes, so each query blocks the event loop and every other request with it;
+and with the current routes on an ``AsyncSession``. Reports requests per
+second and latency percentiles.
+
+Usage:
+    uv run python -m benchmarks.bench_api_concurrency --articles 100000
+    DATABASE_URL=postgresql://... uv run python -m benchmarks.bench_api_concurrency
+"""
+
+import asyncio
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import aiohttp
+import typer
+import uvicorn
+from fastapi import FastAPI
+from rich import print as rprint
+from rich.table import Table
+from sqlalchemy import and_, create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from api.main import app as api_app
+from api.routers.articles import ORDER, ArticleResponse, full_options
+from benchmarks.bench_articles_api import async_session_dependency, seed
+from core.db.config import async_url, get_async_db
+from core.db.models import Article, Base
+
+app = typer.Typer()
+
+
+# Bound to the benchmark database in ``run``
+BlockingSession = sessionmaker(autoflush=False)
+
+
+async def blocking_get_articles(skip: int = 0, limit: int = 10):
+    """The listing as it ran before: synchronous queries in an async route.
+
+    The session is opened in the route rather than by a (threadpool) dependency
+    so that its SQLite connection is used and returned on one thread.
+    """
+    page = (
+        select(Article.id)
+        .where(
+            and_(
+                Article.blogger_id.is_not(None),
+                Article.categories.any(),
+                Article.stance_predictions.any(),
+            )
+        )
+        .order_by(*ORDER)
+        .offset(skip)
+        .limit(limit)
+    )
+    with BlockingSession() as db:
+        articles = db.scalars(
+            select(Article)
+            .where(Article.id.in_(page.scalar_subquery()))
+            .options(*full_options())
+            .order_by(*ORDER)
+        ).all()
+        return [ArticleResponse.model_validate(article) for article in articles]
+
+
+blocking_app = FastAPI()
+blocking_app.get("/api/v1/articles", response_model=List[ArticleResponse])(
+    blocking_get_articles
+)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """uvicorn serving ``app`` from a background thread."""
+
+    def __init__(self, app: FastAPI):
+        self.port = free_port()
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return f"http://127.0.0.1:{self.port}"
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+async def load(
+    base_url: str, offsets: List[int], concurrency: int, duration: float
+) -> List[float]:
+    """Latencies of the requests ``concurrency`` clients complete in ``duration``."""
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+
+    async def client(session: aiohttp.ClientSession, seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            params = {"skip": rng.choice(offsets), "limit": 10}
+            start = time.perf_counter()
+            async with session.get("/api/v1/articles", params=params) as response:
+                assert response.status == 200
+                await response.read()
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(base_url, connector=connector) as session:
+        await asyncio.gather(*(client(session, i) for i in range(concurrency)))
+    return latencies
+
+
+@app.command()
+def run(
+    articles: int = typer.Option(100_000, "--articles", "-n", help="Articles"),
+    bloggers: int = typer.Option(150, "--bloggers", help="Distinct bloggers"),
+    concurrency: int = typer.Option(32, "--concurrency", "-c", help="Clients"),
+    duration: float = typer.Option(15, "--duration", help="Seconds per run"),
+    database_url: Optional[str] = typer.Option(
+        os.getenv("DATABASE_URL"),
+        "--database-url",
+        help="Database to benchmark against (a temporary SQLite file by default)",
+    ),
+):
+    """Compare requests/second of blocking and async database sessions."""
+    # Mostly first pages, with some deep pages as the slow queries
+    offsets = [0] * 8 + [articles // 10, articles // 2]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        rprint(f"[yellow]Benchmarking against {url.split('@')[-1]}[/yellow]")
+        engine = create_engine(url)
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        BlockingSession.configure(bind=engine)
+        async_engine = create_async_engine(async_url(url))
+        api_app.dependency_overrides[get_async_db] = async_session_dependency(
+            async_engine
+        )
+        try:
+            rprint(f"[yellow]Seeding {articles} articles...[/yellow]")
+            with BlockingSession() as db:
+                seed(db, articles, bloggers)
+
+            results = []
+            for name, server_app in [
+                ("sync session (before)", blocking_app),
+                ("async session", api_app),
+            ]:
+                rprint(f"[yellow]Load testing {name} for {duration:.0f}s...[/yellow]")
+                with Server(server_app) as base_url:
+                    latencies = asyncio.run(
+                        load(base_url, offsets, concurrency, duration)
+                    )
+                results.append((name, sorted(latencies)))
+        finally:
+            api_app.dependency_overrides.clear()
+            Base.metadata.drop_all(engine)
+            engine.dispose()
+            asyncio.run(async_engine.dispose())
+
+    table = Table(title=f"GET /api/v1/articles, {concurrency} concurrent clients")
+    table.add_column("Routes")
+    table.add_column("Requests/s", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    for name, latencies in results:
+        table.add_row(
+            name,
+            f"{len(latencies) / duration:.0f}",
+            *(
+                f"{latencies[int(len(latencies) * q)] * 1000:.0f}"
+                for q in (0.5, 0.95, 0.99)
+            ),
+        )
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,248 @@
+"""Benchmark ``GET /api/v1/articles`` latency on a large corpus.
+
+Seeds synthetic articles (two categories and two stance predictions each)
+and requests pages at increasing depths three ways: with ``skip`` through
+the endpoint's previous query, which joined the relations only for filtering
+and lazy-loaded them again per article while serializing; with ``skip``
+through the current endpoint; and with cursors, for full articles and for
+the summary view. Reports median and p95 latency per depth, the SQL
+statements per request and the response size.
+
+Usage:
+    uv run python -m benchmarks.bench_articles_api --articles 100000
+    DATABASE_URL=postgresql://... uv run python -m benchmarks.bench_articles_api
+"""
+
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import typer
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from rich import print as rprint
+from rich.table import Table
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.main import app as api_app
+from api.routers.articles import ORDER, ArticleResponse, encode_cursor
+from core.db.config import async_url, get_async_db, get_db
+from core.db.models import (
+    Article,
+    Base,
+    Blogger,
+    Category,
+    StancePrediction,
+    article_categories,
+)
+
+app = typer.Typer()
+
+
+def legacy_get_articles(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
+    """The endpoint's query before eager loading."""
+    return (
+        db.query(Article)
+        .join(Blogger)
+        .join(Article.categories)
+        .join(Article.stance_predictions)
+        .distinct()
+        .order_by(Article.published_date.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+legacy_app = FastAPI()
+legacy_app.get("/api/v1/articles", response_model=List[ArticleResponse])(
+    legacy_get_articles
+)
+
+
+def async_session_dependency(async_engine):
+    """A ``get_async_db`` replacement with sessions on ``async_engine``."""
+    factory = async_sessionmaker(async_engine)
+
+    async def get_async_db():
+        async with factory() as db:
+            yield db
+
+    return get_async_db
+
+
+def seed(db: Session, count: int, bloggers: int, chunk_size: int = 10_000):
+    db.execute(
+        insert(Blogger),
+        [
+            {"name": f"Blogger {i}", "profile_url": f"https://b/{i}"}
+            for i in range(bloggers)
+        ],
+    )
+    db.execute(insert(Category), [{"name": "Ποδόσφαιρο"}, {"name": "Μπάσκετ"}])
+    blogger_ids = db.scalars(select(Blogger.id)).all()
+    category_ids = db.scalars(select(Category.id)).all()
+    start = datetime(2020, 1, 1)
+    for offset in range(0, count, chunk_size):
+        ids = db.scalars(
+            insert(Article).returning(Article.id),
+            [
+                {
+                    "blogger_id": blogger_ids[i % bloggers],
+                    "title": f"Άρθρο {i}",
+                    "content": "Κείμενο άρθρου " * 100,
+                    "article_url": f"https://www.gazzetta.gr/article/{i}",
+                    "published_date": start + timedelta(minutes=i),
+                }
+                for i in range(offset, min(offset + chunk_size, count))
+            ],
+        ).all()
+        db.execute(
+            insert(article_categories),
+            [
+                {"article_id": article_id, "category_id": category_id}
+                for article_id in ids
+                for category_id in category_ids
+            ],
+        )
+        db.execute(
+            insert(StancePrediction),
+            [
+                {
+                    "article_id": article_id,
+                    "target": target,
+                    "target_type": target_type,
+                    "stance": "θετική",
+                    "justification": "Αιτιολόγηση",
+                }
+                for article_id in ids
+                for target, target_type in [("ΠΑΟΚ", "club"), ("διαιτησία", "referee")]
+            ],
+        )
+        db.commit()
+
+
+def bench(client: TestClient, engine, pages: List[Dict], limit: int, repeat: int):
+    """Latencies of every page request, statements and bytes per request."""
+    statements = 0
+    size = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    latencies = [[] for _ in pages]
+    try:
+        for _ in range(repeat):
+            for params, timings in zip(pages, latencies):
+                start = time.perf_counter()
+                response = client.get(
+                    "/api/v1/articles", params={**params, "limit": limit}
+                )
+                timings.append(time.perf_counter() - start)
+                assert response.status_code == 200
+                size += len(response.content)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    requests = len(pages) * repeat
+    return latencies, statements / requests, size / requests
+
+
+def cursor_pages(db: Session, offsets: List[int]) -> List[Dict]:
+    """Cursor requests for the pages starting at ``offsets``."""
+    pages = []
+    for skip in offsets:
+        params = {"pagination": "cursor"}
+        if skip:
+            previous = db.scalars(
+                select(Article).order_by(*ORDER).offset(skip - 1).limit(1)
+            ).one()
+            params["cursor"] = encode_cursor(previous)
+        pages.append(params)
+    return pages
+
+
+@app.command()
+def run(
+    articles: int = typer.Option(100_000, "--articles", "-n", help="Articles"),
+    bloggers: int = typer.Option(150, "--bloggers", help="Distinct bloggers"),
+    limit: int = typer.Option(10, "--limit", help="Articles per page"),
+    repeat: int = typer.Option(5, "--repeat", help="Requests per page"),
+    database_url: Optional[str] = typer.Option(
+        os.getenv("DATABASE_URL"),
+        "--database-url",
+        help="Database to benchmark against (a temporary SQLite file by default)",
+    ),
+):
+    """Compare page latency by depth for offset and cursor pagination."""
+    offsets = [0, articles // 100, articles // 10, articles // 2, articles - limit]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        rprint(f"[yellow]Benchmarking against {url.split('@')[-1]}[/yellow]")
+        engine = create_engine(url)
+        Base.metadata.drop_all(engine)
+        Base.metadata.create_all(engine)
+        async_engine = create_async_engine(async_url(url))
+        db = sessionmaker(autoflush=False, bind=engine)()
+        try:
+            rprint(f"[yellow]Seeding {articles} articles...[/yellow]")
+            seed(db, articles, bloggers)
+            skip_pages = [{"skip": skip} for skip in offsets]
+            cursors = cursor_pages(db, offsets)
+            summaries = [{**params, "view": "summary"} for params in cursors]
+            modes = [
+                ("lazy, skip (before)", legacy_app, skip_pages),
+                ("eager, skip", api_app, skip_pages),
+                ("eager, cursor", api_app, cursors),
+                ("summary, cursor", api_app, summaries),
+            ]
+            legacy_app.dependency_overrides[get_db] = lambda: db
+            api_app.dependency_overrides[get_async_db] = async_session_dependency(
+                async_engine
+            )
+
+            results = []
+            for name, endpoint, pages in modes:
+                rprint(f"[yellow]Requesting pages: {name}...[/yellow]")
+                queried = engine if endpoint is legacy_app else async_engine.sync_engine
+                with TestClient(endpoint) as client:
+                    results.append(
+                        (name, *bench(client, queried, pages, limit, repeat))
+                    )
+        finally:
+            legacy_app.dependency_overrides.clear()
+            api_app.dependency_overrides.clear()
+            db.close()
+            Base.metadata.drop_all(engine)
+            engine.dispose()
+
+    table = Table(title=f"GET /api/v1/articles ({articles} articles, {limit}/page)")
+    table.add_column("Pagination")
+    for skip in offsets:
+        table.add_column(f"p50 @{skip} (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("Queries/request", justify="right")
+    table.add_column("KB/page", justify="right")
+    for name, latencies, queries, size in results:
+        every = sorted(timing for timings in latencies for timing in timings)
+        table.add_row(
+            name,
+            *(f"{statistics.median(timings) * 1000:.1f}" for timings in latencies),
+            f"{every[int(len(every) * 0.95)] * 1000:.1f}",
+            f"{queries:.0f}",
+            f"{size / 1024:.1f}",
+        )
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,127 @@
+"""Benchmark the per-row article loader against ``BulkArticleLoader``.
+
+Loads the same synthetic archive into a fresh database with the original
+``ScrapedArticlesLoader.process_article`` path (committing every 100
+articles like ``load_data``) and with the set-based bulk loader, and
+reports throughput and the number of SQL statements issued.
+
+Usage:
+    uv run python -m benchmarks.bench_loaders --articles 20000
+    DATABASE_URL=postgresql+psycopg2://... uv run python -m benchmarks.bench_loaders
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import typer
+from rich import print as rprint
+from rich.table import Table
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.db.loaders import BulkArticleLoader, ScrapedArticlesLoader
+from core.db.models import Base
+
+app = typer.Typer()
+
+
+def make_articles(count: int, bloggers: int, categories: int) -> List[Dict]:
+    return [
+        {
+            "categories": [f"Κατηγορία {i % categories}", "Ποδόσφαιρο"],
+            "date": f"{i % 28 + 1:02d}/02/2025 - 12:00",
+            "title": f"Άρθρο {i}",
+            "article_url": f"https://www.gazzetta.gr/article/{i}",
+            "content": "Κείμενο άρθρου " * 200,
+            "blogger_name": f"Blogger {i % bloggers}",
+            "blogger_url": f"https://www.gazzetta.gr/blogger/{i % bloggers}",
+        }
+        for i in range(count)
+    ]
+
+
+def load_row_by_row(db: Session, articles: List[Dict], chunk_size: int):
+    loader = ScrapedArticlesLoader(db)
+    for i, article in enumerate(articles, 1):
+        loader.process_article(article)
+        if i % 100 == 0:
+            db.commit()
+    db.commit()
+
+
+def load_bulk(db: Session, articles: List[Dict], chunk_size: int):
+    loader = BulkArticleLoader(db)
+    for start in range(0, len(articles), chunk_size):
+        loader.load_chunk(articles[start : start + chunk_size])
+        db.commit()
+
+
+def bench(
+    database_url: str,
+    load: Callable[[Session, List[Dict], int], None],
+    articles: List[Dict],
+    chunk_size: int,
+) -> tuple[float, int]:
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        start = time.perf_counter()
+        load(db, articles, chunk_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+    return len(articles) / elapsed, statements
+
+
+@app.command()
+def run(
+    articles: int = typer.Option(20000, "--articles", "-n", help="Articles to load"),
+    bloggers: int = typer.Option(150, "--bloggers", help="Distinct bloggers"),
+    categories: int = typer.Option(40, "--categories", help="Distinct categories"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", help="Bulk chunk size"),
+    database_url: Optional[str] = typer.Option(
+        os.getenv("DATABASE_URL"),
+        "--database-url",
+        help="Database to benchmark against (a temporary SQLite file by default)",
+    ),
+):
+    """Compare articles/second of the per-row and bulk loaders."""
+    data = make_articles(articles, bloggers, categories)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        rprint(f"[yellow]Benchmarking against {url.split('@')[-1]}[/yellow]")
+
+        results = []
+        for name, load in [("row-by-row", load_row_by_row), ("bulk", load_bulk)]:
+            rprint(f"[yellow]Loading {articles} articles {name}...[/yellow]")
+            results.append((name, *bench(url, load, data, chunk_size)))
+
+    baseline = results[0][1]
+    table = Table(title=f"Article loading ({articles} articles)")
+    table.add_column("Loader")
+    table.add_column("Articles/s", justify="right")
+    table.add_column("Statements", justify="right")
+    table.add_column("Speedup", justify="right")
+    for name, rate, statements in results:
+        table.add_row(name, f"{rate:.0f}", str(statements), f"{rate / baseline:.1f}x")
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    app()
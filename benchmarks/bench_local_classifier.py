@@ -0,0 +1,74 @@
+"""Benchmark the throughput of the local stance classifier.
+
+Trains ``LocalStanceClassifier`` on synthetic labelled articles of realistic
+length and reports how many articles per minute it scores for a set of
+targets, per chunk size. No database or API is involved.
+
+Usage:
+    uv run python -m benchmarks.bench_local_classifier --articles 20000
+"""
+
+import random
+import time
+from typing import List
+
+import typer
+from rich import print as rprint
+from rich.table import Table
+
+from core.nlp.local_classifier import LocalStanceClassifier
+
+app = typer.Typer()
+
+WORDS = {
+    "θετική": ["εξαιρετικά", "νίκη", "δίκαια", "εντυπωσιακή", "ανωτερότητα"],
+    "αρνητική": ["απογοήτευση", "ήττα", "άσχημη", "λάθη", "κρίση"],
+    "ουδέτερη": ["αγωνιστική", "πρόγραμμα", "προπόνηση", "ρόστερ", "μεταγραφή"],
+}
+FILLER = "ο αγώνας της ομάδας στο γήπεδο με τους φιλάθλους και τον προπονητή".split()
+
+
+def make_article(rng: random.Random, stance: str, words: int) -> str:
+    return " ".join(
+        rng.choice(WORDS[stance]) if rng.random() < 0.1 else rng.choice(FILLER)
+        for _ in range(words)
+    )
+
+
+@app.command()
+def run(
+    articles: int = typer.Option(20000, "--articles", "-n", help="Articles to score"),
+    targets: int = typer.Option(5, "--targets", "-t", help="Targets per article"),
+    words: int = typer.Option(600, "--words", help="Words per article"),
+    train_size: int = typer.Option(3000, "--train", help="Training articles"),
+):
+    """Report articles/minute of the local classifier per chunk size."""
+    rng = random.Random(0)
+    stances = list(WORDS)
+    target_names = [(f"Ομάδα {i}", "club") for i in range(targets)]
+
+    rprint(f"[yellow]Training on {train_size} articles...[/yellow]")
+    classifier = LocalStanceClassifier()
+    labels = [rng.choice(stances) for _ in range(train_size)]
+    features = classifier.vectorize(make_article(rng, s, words) for s in labels)
+    for target in target_names:
+        classifier.fit(features, labels, target)
+
+    texts: List[str] = [
+        make_article(rng, rng.choice(stances), words) for _ in range(articles)
+    ]
+    table = Table(title=f"Local classifier ({articles} articles, {targets} targets)")
+    table.add_column("Chunk size", justify="right")
+    table.add_column("Articles/min", justify="right")
+    for chunk_size in (100, 1000, 5000):
+        start = time.perf_counter()
+        for offset in range(0, articles, chunk_size):
+            classifier.predict_batch(texts[offset : offset + chunk_size], target_names)
+        rate = articles / (time.perf_counter() - start) * 60
+        table.add_row(str(chunk_size), f"{rate:,.0f}")
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,119 @@
+"""Benchmark HTML extraction throughput of the scraper parser backends.
+
+Compares the original inline ``html.parser`` extraction against the lxml and
+selectolax backends, both inline and offloaded to a ``ParsePool``, on saved
+fixture pages.
+
+Usage:
+    uv run python -m benchmarks.bench_parsers --pages 500 --workers 4
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import List
+
+import typer
+from rich import print as rprint
+from rich.table import Table
+
+from data_collection.extractors import (
+    LexborHTMLParser,
+    ParsePool,
+    extract_article_content,
+)
+
+app = typer.Typer()
+
+DEFAULT_FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "gazzetta"
+
+# Real article pages carry a lot of navigation, ad and script markup around
+# the article body; pad the fixtures so parse cost is representative.
+FILLER_BLOCK = (
+    '<div class="nav-item"><a href="/football">Ποδόσφαιρο</a>'
+    '<span class="admanager-slot" data-slot="sidebar"></span>'
+    "<ul><li>Super League</li><li>Champions League</li></ul></div>\n"
+)
+
+
+def load_pages(fixtures_dir: Path, pad_kb: int) -> List[str]:
+    pages = []
+    for path in sorted(fixtures_dir.glob("article*.html")):
+        html = path.read_text(encoding="utf-8")
+        filler = FILLER_BLOCK * (pad_kb * 1024 // len(FILLER_BLOCK.encode()))
+        pages.append(html.replace("<main>", f"<main>\n{filler}", 1))
+    return pages
+
+
+def bench_inline(pages: List[str], count: int, parser: str) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        extract_article_content(pages[i % len(pages)], parser)
+    return count / (time.perf_counter() - start)
+
+
+async def bench_pool(pages: List[str], count: int, parser: str, workers: int) -> float:
+    pool = ParsePool(workers=workers, parser=parser)
+    try:
+        # Warm up the worker processes so spawn cost is not measured
+        await asyncio.gather(*(pool.article_content(pages[0]) for _ in range(workers)))
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(pool.article_content(pages[i % len(pages)]) for i in range(count))
+        )
+        return count / (time.perf_counter() - start)
+    finally:
+        pool.close()
+
+
+@app.command()
+def run(
+    fixtures_dir: Path = typer.Option(
+        DEFAULT_FIXTURES, "--fixtures-dir", help="Directory with article*.html pages"
+    ),
+    pages: int = typer.Option(500, "--pages", "-n", help="Article pages to parse"),
+    pad_kb: int = typer.Option(
+        200, "--pad-kb", help="Filler markup added to each page, in KB"
+    ),
+    workers: int = typer.Option(
+        os.cpu_count() or 1, "--workers", "-w", help="Parse pool worker processes"
+    ),
+):
+    """Compare articles/second across parser backends."""
+    html_pages = load_pages(fixtures_dir, pad_kb)
+    if not html_pages:
+        rprint(f"[red]Error: No article*.html fixtures in {fixtures_dir}[/red]")
+        raise typer.Exit(1)
+
+    parsers = ["html.parser", "lxml"]
+    if LexborHTMLParser is not None:
+        parsers.append("selectolax")
+
+    results = []
+    for parser in parsers:
+        rprint(f"[yellow]Benchmarking {parser} inline...[/yellow]")
+        results.append((parser, "inline", bench_inline(html_pages, pages, parser)))
+        rprint(f"[yellow]Benchmarking {parser} with {workers} workers...[/yellow]")
+        results.append(
+            (
+                parser,
+                f"pool x{workers}",
+                asyncio.run(bench_pool(html_pages, pages, parser, workers)),
+            )
+        )
+
+    baseline = results[0][2]
+    table = Table(title=f"Article extraction ({pages} pages, ~{pad_kb} KB each)")
+    table.add_column("Parser")
+    table.add_column("Mode")
+    table.add_column("Articles/s", justify="right")
+    table.add_column("Speedup", justify="right")
+    for parser, mode, rate in results:
+        table.add_row(parser, mode, f"{rate:.1f}", f"{rate / baseline:.1f}x")
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,138 @@
+"""Benchmark the stance prediction pipeline with a stubbed classifier.
+
+Runs ``PredictionEngine`` and its ``PredictionWriter`` over growing numbers
+of synthetic articles against a stub chat client that answers instantly, so
+the time measured is the engine, queueing and database write path alone.
+Each size runs twice: the first run inserts predictions, the second
+re-predicts the same articles and updates every row through the
+``ON CONFLICT DO UPDATE`` path. Time per article should stay flat as the
+article count grows.
+
+Usage:
+    uv run python -m benchmarks.bench_predictions --articles 100000
+    DATABASE_URL=postgresql+psycopg2://... uv run python -m benchmarks.bench_predictions
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+import typer
+from rich import print as rprint
+from rich.table import Table
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from core.db.models import Article, Base
+from core.nlp.engine import PredictionEngine, PredictionWriter
+
+app = typer.Typer()
+
+REPLY = SimpleNamespace(
+    choices=[SimpleNamespace(message=SimpleNamespace(content="θετική\nΑιτιολόγηση"))],
+    usage=None,
+)
+
+
+class StubCompletions:
+    async def create(self, **kwargs):
+        return REPLY
+
+
+STUB_CLIENT = SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions()))
+
+
+async def predict(db, articles, batch_size: int, concurrency: int):
+    engine = PredictionEngine(
+        STUB_CLIENT,
+        [("ΠΑΟΚ", "club")],
+        PredictionWriter(db, batch_size=batch_size),
+        concurrency=concurrency,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+    )
+    stats = await engine.run(articles)
+    assert stats.completed == len(articles)
+
+
+def bench(database_url: str, count: int, batch_size: int, concurrency: int):
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+    try:
+        db.execute(
+            insert(Article),
+            [
+                {
+                    "title": f"Άρθρο {i}",
+                    "content": f"Κείμενο {i}",
+                    "article_url": f"https://www.gazzetta.gr/article/{i}",
+                }
+                for i in range(count)
+            ],
+        )
+        db.commit()
+        articles = db.execute(select(Article.id, Article.content)).all()
+
+        timings = []
+        for _ in ("insert", "update"):
+            start = time.perf_counter()
+            asyncio.run(predict(db, articles, batch_size, concurrency))
+            timings.append(time.perf_counter() - start)
+    finally:
+        db.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+    return timings
+
+
+@app.command()
+def run(
+    articles: int = typer.Option(
+        100_000, "--articles", "-n", help="Largest number of articles"
+    ),
+    steps: int = typer.Option(4, "--steps", help="Sizes, halving from --articles"),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Rows per commit"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Engine workers"),
+    database_url: Optional[str] = typer.Option(
+        os.getenv("DATABASE_URL"),
+        "--database-url",
+        help="Database to benchmark against (a temporary SQLite file by default)",
+    ),
+):
+    """Show that prediction time grows linearly with the number of articles."""
+    sizes = [articles >> i for i in reversed(range(steps))]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        rprint(f"[yellow]Benchmarking against {url.split('@')[-1]}[/yellow]")
+        results = []
+        for size in sizes:
+            rprint(f"[yellow]Predicting {size} articles...[/yellow]")
+            results.append((size, *bench(url, size, batch_size, concurrency)))
+
+    table = Table(title="Stance prediction with a stub classifier")
+    table.add_column("Articles", justify="right")
+    table.add_column("Insert (s)", justify="right")
+    table.add_column("Update (s)", justify="right")
+    table.add_column("µs/article (insert)", justify="right")
+    table.add_column("µs/article (update)", justify="right")
+    for size, inserted, updated in results:
+        table.add_row(
+            str(size),
+            f"{inserted:.2f}",
+            f"{updated:.2f}",
+            f"{inserted / size * 1e6:.0f}",
+            f"{updated / size * 1e6:.0f}",
+        )
+
+    rprint(table)
+
+
+if __name__ == "__main__":
+    app()
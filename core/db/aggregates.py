@@ -0,0 +1,219 @@
+"""Materialized stance distributions per blogger, target and month.
+
+``stance_aggregates`` holds the number of predictions per ``(blogger,
+target, target_type, month, stance)``, so dashboards and notebooks read a
+few thousand precomputed rows instead of scanning ``stance_predictions``
+joined to ``articles``. Months come from the article's publication date;
+articles without a blogger or a publication date are left out.
+
+``refresh_aggregates`` keeps the table current incrementally. Whenever
+predictions are written, ``record_changes`` logs the ``(blogger, target,
+target_type, month)`` cells they fall in to ``stance_aggregate_changes``
+within the same transaction; a refresh recomputes just the logged cells,
+with one set-based ``DELETE`` and one ``INSERT ... SELECT ... GROUP BY``,
+and empties the log in a single transaction. Unlike a timestamp watermark,
+the log cannot miss predictions committed late by a slower writer or
+carrying an older ``created_at``. A plain table is used rather than a
+PostgreSQL materialized view because those can only be refreshed in full,
+and the same code then runs on SQLite.
+
+Predictions that are deleted, or articles that move to another blogger or
+month, are only picked up by a ``full`` refresh.
+
+``load_aggregates`` returns the table as a pandas DataFrame with one column
+per stance plus totals and shares, for bulk analysis.
+"""
+
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Date,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.db.models import (
+    Article,
+    Blogger,
+    StanceAggregate,
+    StanceAggregateChange,
+    StancePrediction,
+)
+
+CELL = ("blogger_id", "target", "target_type", "month")
+
+
+def _month(db: Session):
+    """Expression for the first day of an article's publication month."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return cast(func.date_trunc("month", Article.published_date), Date)
+    if dialect == "sqlite":
+        return func.date(Article.published_date, "start of month")
+    raise ValueError(f"Unsupported database dialect: {dialect}")
+
+
+def _predictions(db: Session):
+    """Predictions with the cell they are counted in."""
+    return (
+        select(
+            Article.blogger_id,
+            StancePrediction.target,
+            StancePrediction.target_type,
+            _month(db).label("month"),
+            StancePrediction.stance,
+        )
+        .join(Article, StancePrediction.article_id == Article.id)
+        .where(Article.blogger_id.is_not(None), Article.published_date.is_not(None))
+        .subquery()
+    )
+
+
+def record_changes(db: Session, keys: Iterable[Tuple[int, str, str]]):
+    """Log the cells of the predictions ``keys`` for the next refresh.
+
+    Call in the transaction that writes the predictions, with their
+    ``(article_id, target, target_type)``. A cell already logged is updated
+    rather than skipped, so that on PostgreSQL its row lock orders this
+    transaction against a refresh clearing the log.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    dialect = db.get_bind().dialect.name
+    insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    cells = (
+        select(
+            Article.blogger_id,
+            StancePrediction.target,
+            StancePrediction.target_type,
+            _month(db),
+            literal(datetime.utcnow()),
+        )
+        .join(Article, StancePrediction.article_id == Article.id)
+        .where(
+            tuple_(
+                StancePrediction.article_id,
+                StancePrediction.target,
+                StancePrediction.target_type,
+            ).in_(keys),
+            Article.blogger_id.is_not(None),
+            Article.published_date.is_not(None),
+        )
+        .distinct()
+    )
+    statement = insert_(StanceAggregateChange).from_select([*CELL, "changed_at"], cells)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(CELL),
+            set_={"changed_at": statement.excluded.changed_at},
+        )
+    )
+
+
+def refresh_aggregates(db: Session, full: bool = False) -> int:
+    """Recompute the aggregate cells logged as changed.
+
+    Args:
+        db: Database session
+        full: Rebuild the whole table instead
+
+    Returns:
+        int: Number of ``(blogger, target, target_type, month)`` cells
+        recomputed
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        # Writers logging a cell wait until the refresh commits, and the
+        # refresh waits for writers that have already logged one
+        db.execute(text("LOCK TABLE stance_aggregate_changes IN EXCLUSIVE MODE"))
+
+    predictions = _predictions(db)
+    cell = [predictions.c[name] for name in CELL]
+    counts = select(
+        *cell,
+        predictions.c.stance,
+        func.count().label("count"),
+    ).group_by(*cell, predictions.c.stance)
+    clear = delete(StanceAggregate)
+    if not full:
+        changed = select(*(getattr(StanceAggregateChange, name) for name in CELL))
+        counts = counts.where(tuple_(*cell).in_(changed))
+        clear = clear.where(
+            tuple_(*(getattr(StanceAggregate, name) for name in CELL)).in_(changed)
+        )
+        cells = db.scalar(select(func.count(StanceAggregateChange.id)))
+    else:
+        cells = db.scalar(
+            select(func.count()).select_from(select(*cell).distinct().subquery())
+        )
+
+    try:
+        db.execute(clear)
+        db.execute(
+            insert(StanceAggregate).from_select([*CELL, "stance", "count"], counts)
+        )
+        db.execute(delete(StanceAggregateChange))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return cells
+
+
+def load_aggregates(
+    db: Session,
+    target: Optional[str] = None,
+    target_type: Optional[str] = None,
+    since: Optional[date] = None,
+) -> pd.DataFrame:
+    """Stance distributions as a DataFrame, one row per cell.
+
+    Columns are ``blogger``, ``target``, ``target_type`` and ``month``, the
+    prediction count of every stance, ``total``, and a ``share_<stance>``
+    per stance (its fraction of ``total``).
+    """
+    query = select(
+        Blogger.name.label("blogger"),
+        StanceAggregate.target,
+        StanceAggregate.target_type,
+        StanceAggregate.month,
+        StanceAggregate.stance,
+        StanceAggregate.count,
+    ).join(Blogger, StanceAggregate.blogger_id == Blogger.id)
+    if target:
+        query = query.where(StanceAggregate.target == target)
+    if target_type:
+        query = query.where(StanceAggregate.target_type == target_type)
+    if since:
+        query = query.where(StanceAggregate.month >= since)
+
+    rows = pd.DataFrame(
+        db.execute(query).all(),
+        columns=["blogger", "target", "target_type", "month", "stance", "count"],
+    )
+    index: List[str] = ["blogger", "target", "target_type", "month"]
+    wide = rows.pivot_table(
+        index=index, columns="stance", values="count", aggfunc="sum", fill_value=0
+    )
+    stances = list(wide.columns)
+    counts = wide.to_numpy(dtype=np.int64)
+    totals = counts.sum(axis=1)
+    shares = counts / np.maximum(totals, 1)[:, None]
+
+    frame = pd.DataFrame(counts, index=wide.index, columns=stances)
+    frame["total"] = totals
+    for i, stance in enumerate(stances):
+        frame[f"share_{stance}"] = shares[:, i]
+    frame.columns.name = None
+    return frame.reset_index()
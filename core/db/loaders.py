@@ -1,13 +1,18 @@
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from rich import print as rprint
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from core.db.models import Article, Blogger, Category
+from core.db.models import Article, Blogger, Category, article_categories
+from core.db.streaming import LoadCheckpoint, StreamPosition, iter_articles
+
+# Date formats of the scraped (DD/MM/YYYY) and older Gazzetta exports
+DATE_FORMATS = ("%d/%m/%Y - %H:%M", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S")
 
 
 class BaseLoader:
@@ -100,7 +105,9 @@ class ScrapedArticlesLoader(BaseLoader):
                 return
 
             # Get or create blogger
-            blogger = self.get_or_create_blogger(article_data["blogger_name"])
+            blogger = self.get_or_create_blogger(
+                article_data["blogger_name"], article_data.get("blogger_url", "")
+            )
 
             # Process categories
             article_categories = [
@@ -207,65 +214,306 @@ class GazzettaBloggersLoader(BaseLoader):
             raise
 
 
+def collect_references(
+    article: Dict[str, Any], bloggers: Dict[str, str], categories: Set[str]
+):
+    """Add an article's blogger (name to profile URL) and categories."""
+    if article["blogger_name"] not in bloggers:
+        bloggers[article["blogger_name"]] = article.get("blogger_url") or article.get(
+            "profile_url", ""
+        )
+    categories.update(article.get("categories", []))
+
+
+class BulkArticleLoader:
+    """Set-based loader that inserts articles a chunk at a time.
+
+    Per chunk it issues one ``IN`` query each for existing article URLs,
+    bloggers and categories, inserts the missing bloggers and categories,
+    then inserts all new articles and their ``article_categories`` rows with
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING``. Blogger and category
+    ids are cached across chunks. Rows that already exist are skipped, so
+    loading the same file twice is harmless.
+
+    Rows are inserted in key order, so concurrent loaders touching the same
+    unique keys wait on each other instead of deadlocking.
+
+    Accepts articles in either the scraped (``blogger_url``) or the nested
+    Gazzetta (``profile_url``) shape.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.blogger_ids: Dict[str, int] = {}
+        self.category_ids: Dict[str, int] = {}
+        dialect = db.get_bind().dialect.name
+        if dialect not in ("postgresql", "sqlite"):
+            raise ValueError(f"Bulk loading is not supported on {dialect}")
+        self._insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    def parse_date(self, date_str: str) -> datetime:
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(date_str, date_format)
+            except (TypeError, ValueError):
+                continue
+        rprint(
+            f"[yellow]Warning: Could not parse date {date_str}, "
+            "using current time[/yellow]"
+        )
+        return datetime.utcnow()
+
+    def _ensure_ids(
+        self, model, cache: Dict[str, int], rows: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Fill ``cache`` with the ids of the ``name``-keyed ``rows``."""
+        missing = sorted(name for name in rows if name not in cache)
+        if not missing:
+            return
+
+        cache.update(
+            self.db.execute(
+                select(model.name, model.id).where(model.name.in_(missing))
+            ).all()
+        )
+        new_rows = [rows[name] for name in missing if name not in cache]
+        if not new_rows:
+            return
+
+        now = datetime.utcnow()
+        cache.update(
+            self.db.execute(
+                self._insert(model)
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(model.name, model.id),
+                [{**row, "created_at": now} for row in new_rows],
+            ).all()
+        )
+        # Rows inserted concurrently by another loader come back empty above
+        still_missing = [row["name"] for row in new_rows if row["name"] not in cache]
+        if still_missing:
+            cache.update(
+                self.db.execute(
+                    select(model.name, model.id).where(model.name.in_(still_missing))
+                ).all()
+            )
+
+    def resolve_references(self, bloggers: Dict[str, str], categories: Set[str]):
+        """Look up or create bloggers (name to profile URL) and categories."""
+        blogger_rows = {
+            name: {"name": name, "profile_url": profile_url}
+            for name, profile_url in bloggers.items()
+        }
+        self._ensure_ids(Blogger, self.blogger_ids, blogger_rows)
+        self._ensure_ids(
+            Category, self.category_ids, {name: {"name": name} for name in categories}
+        )
+
+    def load_chunk(self, articles: List[Dict[str, Any]]) -> int:
+        """Insert the new articles of a chunk; the caller commits.
+
+        Returns:
+            int: Number of articles inserted
+        """
+        by_url = {}
+        for article in sorted(articles, key=lambda a: a.get("article_url", "")):
+            url = article.get("article_url", "")
+            if url and url not in by_url:
+                by_url[url] = article
+        if not by_url:
+            return 0
+
+        existing = set(
+            self.db.execute(
+                select(Article.article_url).where(Article.article_url.in_(by_url))
+            ).scalars()
+        )
+        new_articles = [a for url, a in by_url.items() if url not in existing]
+        if not new_articles:
+            return 0
+
+        bloggers: Dict[str, str] = {}
+        categories: Set[str] = set()
+        for article in new_articles:
+            collect_references(article, bloggers, categories)
+        self.resolve_references(bloggers, categories)
+
+        now = datetime.utcnow()
+        inserted = self.db.execute(
+            self._insert(Article)
+            .on_conflict_do_nothing(index_elements=["article_url"])
+            .returning(Article.article_url, Article.id),
+            [
+                {
+                    "blogger_id": self.blogger_ids[article["blogger_name"]],
+                    "title": article["title"],
+                    "content": article["content"],
+                    "article_url": article["article_url"],
+                    "published_date": self.parse_date(article.get("date")),
+                    "created_at": now,
+                }
+                for article in new_articles
+            ],
+        ).all()
+        article_ids = dict(inserted)
+
+        links = [
+            {"article_id": article_id, "category_id": category_id}
+            for article_id, category_id in sorted(
+                (article_id, self.category_ids[cat_name])
+                for url, article_id in article_ids.items()
+                for cat_name in set(by_url[url].get("categories", []))
+            )
+        ]
+        if links:
+            self.db.execute(
+                self._insert(article_categories).on_conflict_do_nothing(), links
+            )
+
+        return len(article_ids)
+
+
+def iter_batches(
+    file_path: Path, batch_size: int, position: Optional[StreamPosition] = None
+) -> Iterator[Tuple[List[Dict[str, Any]], StreamPosition]]:
+    """Stream a scraped articles file as ``(batch, position)`` pairs.
+
+    ``position`` is where reading resumes after the batch.
+    """
+    batch = []
+    for article, article_position in iter_articles(file_path, position):
+        batch.append(article)
+        if len(batch) >= batch_size:
+            yield batch, article_position
+            batch = []
+    if batch:
+        yield batch, article_position
+
+
+def _load_batches(
+    db: Session,
+    file_path: Path,
+    batch_size: int,
+    load_batch: Callable[[List[Dict[str, Any]]], int],
+    on_error: Callable[[], None],
+    resume: bool,
+) -> int:
+    """Feed a file to ``load_batch`` one committed batch at a time.
+
+    A checkpoint is saved after every batch. A failed batch is rolled back,
+    reported and recorded in the checkpoint, and the load carries on; a
+    resumed load retries the failed batches first. The checkpoint is only
+    removed once every batch has been loaded.
+    """
+    checkpoint = LoadCheckpoint.for_file(file_path)
+    if not resume:
+        checkpoint.clear()
+        checkpoint = LoadCheckpoint.for_file(file_path)
+    elif checkpoint.offset:
+        rprint(
+            f"[yellow]Resuming {file_path} at byte {checkpoint.offset} "
+            f"({checkpoint.loaded} articles already loaded, "
+            f"{len(checkpoint.failed)} failed batches to retry)[/yellow]"
+        )
+
+    def load(batch: List[Dict[str, Any]]) -> bool:
+        try:
+            loaded = load_batch(batch)
+            db.commit()
+            checkpoint.loaded += loaded
+            return True
+        except Exception as e:
+            rprint(f"[red]Error loading batch of {len(batch)} articles: {e}[/red]")
+            db.rollback()
+            on_error()
+            return False
+
+    retries, checkpoint.failed = checkpoint.failed, []
+    for start in retries:
+        batch, _ = next(iter_batches(file_path, batch_size, start))
+        if not load(batch):
+            checkpoint.failed.append(start)
+        checkpoint.save(checkpoint.position, checkpoint.loaded)
+
+    total_bytes = Path(file_path).stat().st_size or 1
+    start = checkpoint.position
+    for batch, position in iter_batches(file_path, batch_size, start):
+        if not load(batch):
+            checkpoint.failed.append(start)
+        checkpoint.save(position, checkpoint.loaded)
+        start = position
+        rprint(
+            f"[green]Loaded {checkpoint.loaded} articles "
+            f"({position.offset / total_bytes:.0%} of {file_path})[/green]"
+        )
+
+    if checkpoint.failed:
+        rprint(
+            f"[red]{len(checkpoint.failed)} batches failed; load {file_path} "
+            "again to retry them[/red]"
+        )
+    else:
+        checkpoint.clear()
+    return checkpoint.loaded
+
+
+def load_data_bulk(
+    db: Session, file_path: Path, chunk_size: int = 1000, resume: bool = True
+) -> int:
+    """Stream a scraped JSONL/JSON file into the database with ``BulkArticleLoader``.
+
+    Returns:
+        int: Number of articles inserted
+    """
+    loader = BulkArticleLoader(db)
+
+    def reset_cache():
+        # Cached ids may belong to rows that were just rolled back
+        loader.blogger_ids.clear()
+        loader.category_ids.clear()
+
+    inserted = _load_batches(
+        db, file_path, chunk_size, loader.load_chunk, reset_cache, resume
+    )
+    rprint(f"[green]Successfully inserted {inserted} articles![/green]")
+    return inserted
+
+
 def load_data(
     db: Session,
     file_path: Path,
     loader_class: type[BaseLoader],  # Specify the type more precisely
-):
+    batch_size: int = 100,
+    resume: bool = True,
+) -> int:
     """Generic function to load data using the specified loader.
 
+    The file is streamed (see ``core.db.streaming``), so memory stays flat
+    regardless of its size, and committed every ``batch_size`` articles.
+    An interrupted load resumes from its checkpoint unless ``resume`` is off.
+
     Args:
         db: SQLAlchemy database session
-        file_path: Path to the JSON data file
+        file_path: Path to the JSON (or JSONL) data file
         loader_class: Class to use for loading the data
             (ScrapedArticlesLoader or GazzettaBloggersLoader)
+        batch_size: Articles per transaction
+        resume: Continue from the checkpoint of an interrupted load
+
+    Returns:
+        int: Number of articles processed
     """
     loader = loader_class(db)
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    if loader_class == GazzettaBloggersLoader:
-        # Handle nested structure for GazzettaBloggersLoader
-        total_articles = sum(len(blogger["articles"]) for blogger in data)
-        processed = 0
-
-        for blogger_data in data:
-            try:
-                for article in blogger_data["articles"]:
-                    # Add blogger info to each article
-                    article["blogger_name"] = blogger_data["name"]
-                    article["profile_url"] = blogger_data["profile_url"]
-
-                    loader.process_article(article)
-                    processed += 1
-
-                    if processed % 100 == 0:  # Progress update every 100 articles
-                        rprint(
-                            "[green]Processed "
-                            f"{processed}/{total_articles} articles[/green]"
-                        )
-                        db.commit()  # Intermediate commit
-            except Exception as e:
-                rprint(
-                    "[red]Error processing article "
-                    f"{processed}/{total_articles}: {e}[/red]"
-                )
-                db.rollback()
-                continue
-    else:
-        # Original handling for other loaders
-        total = len(data)
-        for i, article_data in enumerate(data, 1):
-            try:
-                loader.process_article(article_data)
-                if i % 100 == 0:  # Progress update every 100 articles
-                    rprint(f"[green]Processed {i}/{total} articles[/green]")
-                    db.commit()  # Intermediate commit
-            except Exception as e:
-                rprint(f"[red]Error processing article {i}/{total}: {e}[/red]")
-                db.rollback()
-                continue
+    def load_batch(batch: List[Dict[str, Any]]) -> int:
+        for article in batch:
+            if loader_class == GazzettaBloggersLoader:
+                article["profile_url"] = article.get("blogger_url", "")
+            loader.process_article(article)
+        return len(batch)
 
-    db.commit()
+    processed = _load_batches(
+        db, file_path, batch_size, load_batch, loader.category_map.clear, resume
+    )
     rprint("[green]Successfully processed all articles![/green]")
+    return processed
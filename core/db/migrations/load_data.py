@@ -5,31 +5,39 @@ from rich import print as rprint
 
 from core.db.config import get_db
 from core.db.loaders import (
+    BaseLoader,
     GazzettaBloggersLoader,
     ScrapedArticlesLoader,
     load_data,
+    load_data_bulk,
 )
+from core.db.parallel_load import load_data_parallel
 
 app = typer.Typer()
 
 
-@app.command()
-def load_scraped_articles(
-    data_dir: str = typer.Option("scraped_data_v2", "--data-dir", "-d"),
-    file_name: str = typer.Option("scraped_articles.json", "--file", "-f"),
+def run_load(
+    data_file: Path,
+    loader_class: type[BaseLoader],
+    bulk: bool,
+    chunk_size: int,
+    resume: bool,
+    workers: int,
 ):
-    """Load data from scraped_articles.json"""
-    data_file = Path(data_dir) / file_name
-
-    if not data_file.exists():
-        rprint(f"[red]Error: File {data_file} not found![/red]")
+    if workers > 1 and not bulk:
+        rprint("[red]Error: --workers requires the bulk loader[/red]")
         raise typer.Exit(1)
 
     rprint(f"[yellow]Loading data from {data_file}...[/yellow]")
 
     db = next(get_db())
     try:
-        load_data(db, data_file, ScrapedArticlesLoader)
+        if workers > 1:
+            load_data_parallel(db, data_file, workers, chunk_size)
+        elif bulk:
+            load_data_bulk(db, data_file, chunk_size, resume=resume)
+        else:
+            load_data(db, data_file, loader_class, resume=resume)
         rprint("[green]Data loaded successfully![/green]")
     except Exception as e:
         rprint(f"[red]Error loading data: {e}[/red]")
@@ -38,10 +46,53 @@ def load_scraped_articles(
         db.close()
 
 
+@app.command()
+def load_scraped_articles(
+    data_dir: str = typer.Option("scraped_data_v2", "--data-dir", "-d"),
+    file_name: str = typer.Option("scraped_articles.jsonl", "--file", "-f"),
+    bulk: bool = typer.Option(
+        True, "--bulk/--row-by-row", help="Use set-based inserts per chunk"
+    ),
+    chunk_size: int = typer.Option(
+        1000, "--chunk-size", help="Articles per bulk insert transaction"
+    ),
+    resume: bool = typer.Option(
+        True,
+        "--resume/--restart",
+        help="Continue an interrupted load from its checkpoint",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Worker processes loading partitions in parallel"
+    ),
+):
+    """Load data from scraped_articles.jsonl (or a legacy scraped_articles.json)"""
+    data_file = Path(data_dir) / file_name
+
+    if not data_file.exists():
+        rprint(f"[red]Error: File {data_file} not found![/red]")
+        raise typer.Exit(1)
+
+    run_load(data_file, ScrapedArticlesLoader, bulk, chunk_size, resume, workers)
+
+
 @app.command()
 def load_gazzetta_bloggers(
     data_dir: str = typer.Option("scraped_data_v2", "--data-dir", "-d"),
     file_name: str = typer.Option("gazzetta_bloggers_articles.json", "--file", "-f"),
+    bulk: bool = typer.Option(
+        True, "--bulk/--row-by-row", help="Use set-based inserts per chunk"
+    ),
+    chunk_size: int = typer.Option(
+        1000, "--chunk-size", help="Articles per bulk insert transaction"
+    ),
+    resume: bool = typer.Option(
+        True,
+        "--resume/--restart",
+        help="Continue an interrupted load from its checkpoint",
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Worker processes loading partitions in parallel"
+    ),
 ):
     """Load data from gazzetta_bloggers_articles.json"""
     data_file = Path(data_dir) / file_name
@@ -50,17 +101,7 @@ def load_gazzetta_bloggers(
         rprint(f"[red]Error: File {data_file} not found![/red]")
         raise typer.Exit(1)
 
-    rprint(f"[yellow]Loading data from {data_file}...[/yellow]")
-
-    db = next(get_db())
-    try:
-        load_data(db, data_file, GazzettaBloggersLoader)
-        rprint("[green]Data loaded successfully![/green]")
-    except Exception as e:
-        rprint(f"[red]Error loading data: {e}[/red]")
-        raise typer.Exit(1)
-    finally:
-        db.close()
+    run_load(data_file, GazzettaBloggersLoader, bulk, chunk_size, resume, workers)
 
 
 if __name__ == "__main__":
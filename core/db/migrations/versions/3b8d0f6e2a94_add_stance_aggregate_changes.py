@@ -0,0 +1,41 @@
+"""add stance aggregate changes
+
+Revision ID: 3b8d0f6e2a94
+Revises: 9f1e6a2b7c53
+Create Date: 2025-03-16 11:24:05.318277
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "3b8d0f6e2a94"
+down_revision = "9f1e6a2b7c53"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stance_aggregate_changes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("blogger_id", sa.Integer(), nullable=False),
+        sa.Column("target", sa.String(length=100), nullable=False),
+        sa.Column("target_type", sa.String(length=20), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["blogger_id"], ["bloggers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "blogger_id",
+            "target",
+            "target_type",
+            "month",
+            name="unique_stance_aggregate_change",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stance_aggregate_changes")
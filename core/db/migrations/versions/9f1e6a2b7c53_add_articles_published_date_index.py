@@ -0,0 +1,30 @@
+"""add articles published date index
+
+Revision ID: 9f1e6a2b7c53
+Revises: e5b3c8d41f07
+Create Date: 2025-03-12 21:47:05.392614
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "9f1e6a2b7c53"
+down_revision = "e5b3c8d41f07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches the API's ORDER BY published_date DESC NULLS LAST, id DESC, so
+    # cursor pages are a range scan
+    op.create_index(
+        "ix_articles_published_date_id",
+        "articles",
+        ["published_date", "id"],
+        postgresql_ops={"published_date": "DESC NULLS LAST", "id": "DESC"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_published_date_id", table_name="articles")
@@ -0,0 +1,28 @@
+"""add prediction source
+
+Revision ID: c41e9a07d2b5
+Revises: 7a671aaf6adf
+Create Date: 2025-03-02 10:24:51.118402
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "c41e9a07d2b5"
+down_revision = "7a671aaf6adf"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing predictions all came from the LLM
+    op.add_column(
+        "stance_predictions",
+        sa.Column("source", sa.String(length=20), nullable=False, server_default="llm"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("stance_predictions", "source")
@@ -0,0 +1,43 @@
+"""add stance aggregates
+
+Revision ID: e5b3c8d41f07
+Revises: c41e9a07d2b5
+Create Date: 2025-03-09 18:02:37.540913
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic
+revision = "e5b3c8d41f07"
+down_revision = "c41e9a07d2b5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stance_aggregates",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("blogger_id", sa.Integer(), nullable=False),
+        sa.Column("target", sa.String(length=100), nullable=False),
+        sa.Column("target_type", sa.String(length=20), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("stance", sa.String(length=100), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["blogger_id"], ["bloggers.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "blogger_id",
+            "target",
+            "target_type",
+            "month",
+            "stance",
+            name="unique_stance_aggregate",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stance_aggregates")
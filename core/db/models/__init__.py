@@ -3,15 +3,17 @@ from datetime import datetime
 
 from sqlalchemy import (
     Column,
+    Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
     Text,
     UniqueConstraint,
 )
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, query_expression, relationship
 
 Base = declarative_base()
 
@@ -57,12 +59,25 @@ class Article(Base):
     article_url = Column(Text, nullable=False, unique=True)
     published_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Start of the content, loaded by queries that ask for it (the API's
+    # summary view) with ``with_expression``
+    excerpt = query_expression()
 
     blogger = relationship("Blogger", back_populates="articles")
     categories = relationship(
         "Category", secondary=article_categories, back_populates="articles"
     )
 
+    # Newest-first listing and its keyset pagination (the API's cursors)
+    __table_args__ = (
+        Index(
+            "ix_articles_published_date_id",
+            "published_date",
+            "id",
+            postgresql_ops={"published_date": "DESC NULLS LAST", "id": "DESC"},
+        ),
+    )
+
 
 class StancePrediction(Base):
     __tablename__ = "stance_predictions"
@@ -73,6 +88,8 @@ class StancePrediction(Base):
     target_type = Column(String(20), nullable=False)  # 'club' or 'referee'
     stance = Column(String(100), nullable=False)
     justification = Column(Text)
+    # 'llm', 'local' or 'prefilter'; only LLM predictions train the local model
+    source = Column(String(20), nullable=False, default="llm", server_default="llm")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Update unique constraint to include target_type
@@ -86,3 +103,58 @@ class StancePrediction(Base):
     )
 
     article = relationship("Article", backref="stance_predictions")
+
+
+class StanceAggregate(Base):
+    """Prediction count per blogger, target, month and stance.
+
+    Maintained by ``core.db.aggregates.refresh_aggregates``.
+    """
+
+    __tablename__ = "stance_aggregates"
+
+    id = Column(Integer, primary_key=True)
+    blogger_id = Column(Integer, ForeignKey("bloggers.id"), nullable=False)
+    target = Column(String(100), nullable=False)
+    target_type = Column(String(20), nullable=False)
+    month = Column(Date, nullable=False)  # first day of the publication month
+    stance = Column(String(100), nullable=False)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "blogger_id",
+            "target",
+            "target_type",
+            "month",
+            "stance",
+            name="unique_stance_aggregate",
+        ),
+    )
+
+
+class StanceAggregateChange(Base):
+    """An aggregate cell with predictions written since its last refresh.
+
+    Filled by ``core.nlp.engine.upsert_predictions`` in the transaction that
+    writes the predictions, and emptied by ``refresh_aggregates``.
+    """
+
+    __tablename__ = "stance_aggregate_changes"
+
+    id = Column(Integer, primary_key=True)
+    blogger_id = Column(Integer, ForeignKey("bloggers.id"), nullable=False)
+    target = Column(String(100), nullable=False)
+    target_type = Column(String(20), nullable=False)
+    month = Column(Date, nullable=False)
+    changed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "blogger_id",
+            "target",
+            "target_type",
+            "month",
+            name="unique_stance_aggregate_change",
+        ),
+    )
@@ -0,0 +1,144 @@
+"""Load a scraped articles file from several worker processes.
+
+The load runs in two phases:
+
+1. The parent streams the file once, records where every partition of
+   ``chunk_size`` articles starts, and creates all of the file's bloggers
+   and categories in a single transaction. Workers therefore only ever read
+   those rows, so they cannot race to create duplicates.
+2. A spawn-based process pool loads the partitions with ``BulkArticleLoader``,
+   each worker on its own database connection. Articles are inserted in URL
+   order, so workers that meet the same URL wait rather than deadlock.
+
+Loads are idempotent (existing articles are skipped), so an interrupted
+parallel load is resumed by simply running it again.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from rich import print as rprint
+from sqlalchemy.orm import Session
+
+from core.db.config import DatabaseSettings, create_db_engine
+from core.db.loaders import BulkArticleLoader, collect_references
+from core.db.streaming import StreamPosition, iter_articles
+
+Partition = Tuple[StreamPosition, int]
+
+# Per-process loader, created by the pool initializer
+_worker_loader: Optional[BulkArticleLoader] = None
+
+
+def plan_partitions(
+    file_path: Path, chunk_size: int
+) -> Tuple[List[Partition], Dict[str, str], Set[str]]:
+    """Split a file into partitions and collect the references it uses.
+
+    Returns:
+        The ``(start position, article count)`` partitions, the bloggers
+        (name to profile URL) and the category names
+    """
+    partitions: List[Partition] = []
+    bloggers: Dict[str, str] = {}
+    categories: Set[str] = set()
+    start = StreamPosition()
+    count = 0
+
+    for article, position in iter_articles(file_path):
+        collect_references(article, bloggers, categories)
+        count += 1
+        if count == chunk_size:
+            partitions.append((start, count))
+            start, count = position, 0
+    if count:
+        partitions.append((start, count))
+
+    return partitions, bloggers, categories
+
+
+def _init_worker(database_url: str):
+    global _worker_loader
+    # One connection per worker, configured like every other engine
+    settings = replace(DatabaseSettings.from_env(), pool_size=1, max_overflow=0)
+    engine = create_db_engine(database_url, settings)
+    _worker_loader = BulkArticleLoader(Session(engine, autoflush=False))
+
+
+def _load_partition(file_path: Path, partition: Partition) -> int:
+    start, count = partition
+    db = _worker_loader.db
+    articles = [
+        article for article, _ in islice(iter_articles(file_path, start), count)
+    ]
+    try:
+        inserted = _worker_loader.load_chunk(articles)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return inserted
+
+
+def load_data_parallel(
+    db: Session, file_path: Path, workers: int, chunk_size: int = 1000
+) -> int:
+    """Load a scraped JSONL/JSON file with ``workers`` processes.
+
+    Args:
+        db: Session on the target database; used for the reference phase and
+            to derive the workers' connection URL
+        file_path: JSONL store or JSON export
+        workers: Number of worker processes
+        chunk_size: Articles per partition (one transaction each)
+
+    Returns:
+        int: Number of articles inserted
+    """
+    url = db.get_bind().url
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        raise ValueError("Parallel loading needs a database shared between processes")
+
+    rprint(f"[yellow]Partitioning {file_path}...[/yellow]")
+    partitions, bloggers, categories = plan_partitions(file_path, chunk_size)
+    BulkArticleLoader(db).resolve_references(bloggers, categories)
+    db.commit()
+    rprint(
+        f"[green]{len(partitions)} partitions, {len(bloggers)} bloggers, "
+        f"{len(categories)} categories[/green]"
+    )
+
+    inserted = 0
+    failed = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(url.render_as_string(hide_password=False),),
+    ) as executor:
+        futures = [
+            executor.submit(_load_partition, file_path, partition)
+            for partition in partitions
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                inserted += future.result()
+            except Exception as e:
+                failed += 1
+                rprint(f"[red]Error loading partition: {e}[/red]")
+            rprint(
+                f"[green]Loaded {done}/{len(partitions)} partitions "
+                f"({inserted} new articles)[/green]"
+            )
+
+    if failed:
+        rprint(
+            f"[yellow]{failed} partitions failed; run the load again to retry "
+            "them[/yellow]"
+        )
+    rprint(f"[green]Successfully inserted {inserted} articles![/green]")
+    return inserted
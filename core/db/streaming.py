@@ -0,0 +1,251 @@
+"""Constant-memory readers for scraped article files.
+
+``iter_articles`` streams flat article dicts out of
+
+- JSONL stores (``scraped_articles.jsonl``), one article per line
+- flat JSON arrays of articles (legacy ``scraped_articles.json``)
+- nested JSON exports (``[{name, profile_url, articles: [...]}]``), where the
+  ``articles`` arrays are streamed item by item as well
+
+Only the article currently being decoded is held in memory. Every article
+comes with a ``StreamPosition`` (byte offset plus the enclosing blogger for
+nested exports) from which reading can resume, which ``LoadCheckpoint``
+persists so an interrupted load continues where it stopped.
+"""
+
+import codecs
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@dataclass
+class StreamPosition:
+    """Resume point after an article.
+
+    Attributes:
+        offset: Byte offset just past the article
+        blogger: ``name``/``profile_url`` of the enclosing blogger when the
+            offset lies inside a nested ``articles`` array
+    """
+
+    offset: int = 0
+    blogger: Optional[Dict[str, Any]] = None
+
+
+class _JsonReader:
+    """Pull-style JSON tokenizer over a binary file, tracking byte offsets."""
+
+    def __init__(self, f: BinaryIO, offset: int, chunk_size: int = CHUNK_SIZE):
+        f.seek(offset)
+        self.f = f
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json_decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk_size)
+        self.eof = not data
+        self.buf = self.buf[self.pos :] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return not self.eof
+
+    def _consume(self, chars: int):
+        end = self.pos + chars
+        self.offset += len(self.buf[self.pos : end].encode("utf-8"))
+        self.pos = end
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            # Whitespace is ASCII, so characters and bytes line up
+            end = _WHITESPACE.match(self.buf, self.pos).end()
+            self.offset += end - self.pos
+            self.pos = end
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(
+                f"Expected {char!r} at byte {self.offset}, found {found or 'EOF'!r}"
+            )
+        self._consume(1)
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.json_decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof:
+                self._fill()
+                continue
+            self._consume(end - self.pos)
+            return value
+
+    def separator(self, closing: str) -> bool:
+        """Consume a ``,`` between items; return False at the closing bracket."""
+        char = self.peek()
+        if char == closing:
+            self._consume(1)
+            return False
+        if char == ",":
+            self._consume(1)
+        return True
+
+
+def _nested_article(article: Dict, blogger: Dict[str, Any]) -> Dict:
+    return {
+        **article,
+        "blogger_name": blogger["name"],
+        "blogger_url": blogger.get("profile_url", ""),
+    }
+
+
+def _iter_blogger_articles(
+    reader: _JsonReader, blogger: Dict[str, Any]
+) -> Iterator[Tuple[Dict, StreamPosition]]:
+    """Stream the rest of an ``articles`` array, then the rest of its object."""
+    if "name" not in blogger:
+        raise ValueError(f"Blogger without a name before byte {reader.offset}")
+    context = {"name": blogger["name"], "profile_url": blogger.get("profile_url", "")}
+
+    while reader.separator("]"):
+        article = reader.value()
+        yield _nested_article(article, context), StreamPosition(reader.offset, context)
+
+    # Remaining keys of the blogger object carry no articles
+    while reader.separator("}"):
+        reader.value()
+        reader.expect(":")
+        reader.value()
+
+
+def _iter_json_array(
+    reader: _JsonReader, position: StreamPosition
+) -> Iterator[Tuple[Dict, StreamPosition]]:
+    if position.blogger is not None:
+        yield from _iter_blogger_articles(reader, position.blogger)
+    elif position.offset == 0:
+        reader.expect("[")
+
+    while reader.separator("]"):
+        reader.expect("{")
+        item: Dict[str, Any] = {}
+        nested = False
+        while reader.separator("}"):
+            key = reader.value()
+            reader.expect(":")
+            if key == "articles" and reader.peek() == "[":
+                reader.expect("[")
+                nested = True
+                yield from _iter_blogger_articles(reader, item)
+                break
+            item[key] = reader.value()
+        if not nested:
+            yield item, StreamPosition(reader.offset)
+
+
+def _iter_jsonl(f: BinaryIO, offset: int) -> Iterator[Tuple[Dict, StreamPosition]]:
+    f.seek(offset)
+    for line in f:
+        offset += len(line)
+        if line.strip():
+            yield json.loads(line), StreamPosition(offset)
+
+
+def iter_articles(
+    file_path: Path, position: Optional[StreamPosition] = None
+) -> Iterator[Tuple[Dict, StreamPosition]]:
+    """Stream ``(article, position)`` pairs from a scraped articles file.
+
+    Nested articles get the blogger's ``blogger_name`` and ``blogger_url``.
+
+    Args:
+        file_path: JSONL store or JSON export
+        position: Resume point returned with a previously read article
+    """
+    position = position or StreamPosition()
+    with open(file_path, "rb") as f:
+        if Path(file_path).suffix == ".jsonl":
+            yield from _iter_jsonl(f, position.offset)
+        else:
+            yield from _iter_json_array(_JsonReader(f, position.offset), position)
+
+
+@dataclass
+class LoadCheckpoint:
+    """Progress of a load, stored next to the data file.
+
+    The checkpoint is written atomically after each batch and is ignored if
+    the data file shrank below its offset (i.e. was replaced). ``failed``
+    holds the start positions of batches that were rolled back, for a
+    resumed load to retry.
+    """
+
+    path: Path
+    offset: int = 0
+    blogger: Optional[Dict[str, Any]] = None
+    loaded: int = 0
+    failed: List[StreamPosition] = field(default_factory=list)
+
+    @classmethod
+    def for_file(cls, file_path: Path) -> "LoadCheckpoint":
+        file_path = Path(file_path)
+        path = file_path.with_name(file_path.name + ".checkpoint")
+        if not path.exists():
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data["offset"] > file_path.stat().st_size:
+            return cls(path)
+        return cls(
+            path,
+            data["offset"],
+            data.get("blogger"),
+            data.get("loaded", 0),
+            [StreamPosition(**failed) for failed in data.get("failed", [])],
+        )
+
+    @property
+    def position(self) -> StreamPosition:
+        return StreamPosition(self.offset, self.blogger)
+
+    def save(self, position: StreamPosition, loaded: int):
+        self.offset = position.offset
+        self.blogger = position.blogger
+        self.loaded = loaded
+        data = {
+            **asdict(position),
+            "loaded": loaded,
+            "failed": [asdict(failed) for failed in self.failed],
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
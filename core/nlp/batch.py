@@ -0,0 +1,492 @@
+"""Offline stance prediction through batch jobs.
+
+Large backfills don't need real-time answers, so instead of one live call per
+article a job goes through three resumable steps:
+
+1. ``export_batch_job`` streams the pending articles into JSONL shards of
+   chat requests (``custom_id`` is ``article-<id>``)
+2. ``submit_batch_job`` hands every shard to a batch backend
+3. ``ingest_batch_job`` polls the backend, downloads finished results and
+   upserts them into ``stance_predictions``
+
+All progress is recorded in ``job.json`` inside the job directory, so any
+step can be re-run after an interruption and continues where it stopped:
+export resumes after the last article id written, submit skips submitted
+shards and ingest skips ingested ones (re-ingesting a shard is harmless, the
+predictions are upserted).
+
+Failures are retried by re-running the steps: submit resubmits shards whose
+batch failed (or expired with no results), and once every shard is ingested,
+export writes the requests that got no usable reply into new shards.
+
+Backends expose ``submit(requests_path) -> batch_id``,
+``status(batch_id) -> str`` (``"in_progress"``, ``"completed"`` or
+``"failed"``) and ``download(batch_id, results_path)``:
+
+- ``OpenAIBatchBackend`` uses the OpenAI Batch API
+- ``LocalBatchBackend`` is a filesystem stand-in that answers a batch
+  synchronously with a completion callable, for tests and local models
+"""
+
+import json
+import shutil
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from openai import OpenAI
+from rich import print as rprint
+from sqlalchemy.orm import Session
+
+from core.db.models import Article
+from core.nlp.engine import PredictionResult, upsert_predictions
+from core.nlp.prompts import MODEL, Target, build_request, parse_target_replies
+from core.nlp.tokens import TokenBudget
+
+BACKENDS = ("openai", "local")
+BATCH_ENDPOINT = "/v1/chat/completions"
+# The OpenAI Batch API accepts up to 50,000 requests per input file
+DEFAULT_SHARD_SIZE = 10_000
+
+JOB_FILE = "job.json"
+
+
+@dataclass
+class BatchShard:
+    """One requests file and the backend batch that answers it."""
+
+    name: str
+    requests: int
+    batch_id: Optional[str] = None
+    status: str = "exported"  # exported, submitted, completed, failed, ingested
+    ingested: int = 0
+    failed: int = 0
+    submissions: int = 0
+    # Whether the failed requests have been exported into a new shard
+    retried: bool = False
+
+    @property
+    def requests_file(self) -> str:
+        return f"{self.name}.requests.jsonl"
+
+    @property
+    def results_file(self) -> str:
+        return f"{self.name}.results.jsonl"
+
+
+@dataclass
+class BatchJob:
+    """State of a batch prediction job, persisted as ``job.json``."""
+
+    path: Path
+    targets: List[Target]
+    model: str = MODEL
+    backend: Optional[str] = None
+    last_article_id: int = 0
+    exported: bool = False
+    shards: List[BatchShard] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchJob":
+        state = json.loads((Path(path) / JOB_FILE).read_text(encoding="utf-8"))
+        return cls(
+            path=Path(path),
+            targets=[tuple(target) for target in state["targets"]],
+            model=state["model"],
+            backend=state["backend"],
+            last_article_id=state["last_article_id"],
+            exported=state["exported"],
+            shards=[BatchShard(**shard) for shard in state["shards"]],
+        )
+
+    def save(self):
+        state = asdict(self)
+        state.pop("path")
+        tmp_path = self.path / f"{JOB_FILE}.tmp"
+        tmp_path.write_text(
+            json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        tmp_path.replace(self.path / JOB_FILE)
+
+
+def _article_id(custom_id: str) -> int:
+    return int(custom_id.removeprefix("article-"))
+
+
+def export_batch_job(
+    db: Session,
+    job_dir: Path,
+    targets: List[Target],
+    query,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    model: str = MODEL,
+    budget: Optional[TokenBudget] = None,
+) -> BatchJob:
+    """Write the articles selected by ``query`` as shards of chat requests.
+
+    Args:
+        db: Database session
+        job_dir: Job directory, created if missing; an existing job is resumed
+        targets: ``(target, target_type)`` pairs every article is scored for
+        query: Select of ``(Article.id, Article.content)`` rows, e.g.
+            ``pending_articles_query(targets)``; it is read in id order
+        shard_size: Requests per shard (one backend batch each)
+        model: Chat model the requests are addressed to
+        budget: Token budget long articles are cut to; a batch request holds
+            one article, so ``chunk`` budgets are not supported
+
+    Returns:
+        BatchJob: The job, with every shard exported
+
+    On a job that is already exported and fully ingested, the requests that
+    got no usable reply are written into new shards instead (see
+    ``export_retries``).
+    """
+    job_dir = Path(job_dir)
+    if (job_dir / JOB_FILE).exists():
+        job = BatchJob.load(job_dir)
+        if job.targets != list(targets):
+            raise ValueError(f"{job_dir} is a job for other targets")
+    else:
+        job_dir.mkdir(parents=True, exist_ok=True)
+        job = BatchJob(path=job_dir, targets=list(targets), model=model)
+        job.save()
+    if job.exported:
+        if all(shard.status == "ingested" for shard in job.shards):
+            export_retries(job, shard_size)
+        return job
+    if budget is not None and budget.strategy != "select":
+        raise ValueError("Batch jobs only support the 'select' token budget")
+
+    rows = db.execute(
+        query.where(Article.id > job.last_article_id)
+        .order_by(Article.id)
+        .execution_options(yield_per=1000)
+    )
+
+    shard: Optional[BatchShard] = None
+    out = None
+    try:
+        for article_id, content in rows:
+            if shard is None:
+                shard = BatchShard(name=f"shard-{len(job.shards):04d}", requests=0)
+                out = open(
+                    job_dir / f"{shard.requests_file}.tmp", "w", encoding="utf-8"
+                )
+            if budget is not None:
+                [content] = budget.prepare(content, job.targets)
+            body = {"model": job.model, "temperature": 0.0}
+            body.update(build_request(content, job.targets))
+            out.write(
+                json.dumps(
+                    {
+                        "custom_id": f"article-{article_id}",
+                        "method": "POST",
+                        "url": BATCH_ENDPOINT,
+                        "body": body,
+                    },
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+            shard.requests += 1
+            if shard.requests == shard_size:
+                _finish_shard(job, shard, out, article_id)
+                shard, out = None, None
+        if shard is not None:
+            _finish_shard(job, shard, out, article_id)
+            shard, out = None, None
+    finally:
+        if out is not None:
+            out.close()
+
+    job.exported = True
+    job.save()
+    total = sum(shard.requests for shard in job.shards)
+    rprint(f"[green]Exported {total} requests in {len(job.shards)} shards[/green]")
+    if budget is not None:
+        rprint(budget.stats.summary())
+    return job
+
+
+def _finish_shard(job: BatchJob, shard: BatchShard, out, last_article_id: int):
+    # A shard only counts once its file is complete, so a crash mid-shard
+    # re-exports that shard from its first article
+    out.close()
+    tmp_path = job.path / f"{shard.requests_file}.tmp"
+    tmp_path.replace(job.path / shard.requests_file)
+    job.shards.append(shard)
+    job.last_article_id = last_article_id
+    job.save()
+    rprint(f"[green]Exported {shard.name} ({shard.requests} requests)[/green]")
+
+
+def export_retries(job: BatchJob, shard_size: int = DEFAULT_SHARD_SIZE) -> int:
+    """Write the failed requests of ingested shards into new shards.
+
+    A request failed if its result line is missing (e.g. the batch expired
+    first), reports an error, or holds an unusable reply. Each shard's
+    failures are exported once; the job is saved after all new shard files
+    are complete, so an interrupted retry export simply starts over.
+
+    Returns:
+        int: Number of requests exported again
+    """
+    sources = [
+        shard
+        for shard in job.shards
+        if shard.status == "ingested" and shard.failed and not shard.retried
+    ]
+    shards: List[BatchShard] = []
+    out = None
+    try:
+        for source in sources:
+            answered = {
+                article_id
+                for article_id, predictions in iter_results(
+                    job.path / source.results_file, job.targets
+                )
+                if predictions is not None
+            }
+            with open(job.path / source.requests_file, encoding="utf-8") as f:
+                for line in f:
+                    if _article_id(json.loads(line)["custom_id"]) in answered:
+                        continue
+                    if out is None:
+                        name = f"shard-{len(job.shards) + len(shards):04d}"
+                        shards.append(BatchShard(name=name, requests=0))
+                        out = open(
+                            job.path / shards[-1].requests_file, "w", encoding="utf-8"
+                        )
+                    out.write(line)
+                    shards[-1].requests += 1
+                    if shards[-1].requests == shard_size:
+                        out.close()
+                        out = None
+    finally:
+        if out is not None:
+            out.close()
+
+    for source in sources:
+        source.retried = True
+    job.shards.extend(shards)
+    job.save()
+    total = sum(shard.requests for shard in shards)
+    rprint(f"[green]Exported {total} failed requests in {len(shards)} shards[/green]")
+    return total
+
+
+def submit_batch_job(job: BatchJob, backend, backend_name: str):
+    """Submit every shard that has no batch yet, or whose batch failed."""
+    if job.backend not in (None, backend_name):
+        raise ValueError(f"Job was submitted to the {job.backend} backend")
+    job.backend = backend_name
+    for shard in job.shards:
+        if shard.batch_id is not None and shard.status != "failed":
+            continue
+        shard.batch_id = backend.submit(job.path / shard.requests_file)
+        shard.status = "submitted"
+        shard.submissions += 1
+        job.save()
+        rprint(f"[green]Submitted {shard.name} as {shard.batch_id}[/green]")
+
+
+def poll_batch_job(job: BatchJob, backend) -> bool:
+    """Refresh the status of submitted shards.
+
+    Returns:
+        bool: Whether no shard is still waiting on the backend
+    """
+    for shard in job.shards:
+        if shard.status != "submitted":
+            continue
+        status = backend.status(shard.batch_id)
+        if status in ("completed", "failed"):
+            shard.status = status
+            job.save()
+            rprint(f"[green]{shard.name}: {status}[/green]")
+    return not any(shard.status in ("exported", "submitted") for shard in job.shards)
+
+
+def iter_results(
+    results_path: Path, targets: List[Target]
+) -> Iterator[Tuple[int, Optional[Dict[Target, Tuple[str, str]]]]]:
+    """Yield ``(article_id, predictions)`` per line of a batch results file.
+
+    ``predictions`` is None for requests that failed or got an unusable reply.
+    """
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            article_id = _article_id(result["custom_id"])
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                yield article_id, None
+                continue
+            try:
+                reply = response["body"]["choices"][0]["message"]["content"]
+                yield article_id, parse_target_replies(reply, targets)
+            except (KeyError, IndexError, TypeError, ValueError):
+                yield article_id, None
+
+
+def ingest_batch_job(
+    db: Session, job: BatchJob, backend, batch_size: int = 1000
+) -> Tuple[int, int]:
+    """Download completed shards and upsert their predictions.
+
+    Returns:
+        ``(ingested, failed)`` article counts of the shards ingested now.
+        Failed articles, including those the batch returned no result for,
+        have no prediction; ``export_retries`` exports them again.
+    """
+    ingested = failed = 0
+    for shard in job.shards:
+        if shard.status != "completed":
+            continue
+        results_path = job.path / shard.results_file
+        backend.download(shard.batch_id, results_path)
+
+        shard.ingested = shard.failed = 0
+        batch: List[PredictionResult] = []
+        for article_id, predictions in iter_results(results_path, job.targets):
+            if predictions is None:
+                continue
+            shard.ingested += 1
+            batch.extend(
+                PredictionResult(article_id, target, target_type, *prediction)
+                for (target, target_type), prediction in predictions.items()
+            )
+            if len(batch) >= batch_size:
+                upsert_predictions(db, batch)
+                batch = []
+        if batch:
+            upsert_predictions(db, batch)
+
+        shard.failed = shard.requests - shard.ingested
+        shard.status = "ingested"
+        job.save()
+        ingested += shard.ingested
+        failed += shard.failed
+        rprint(
+            f"[green]Ingested {shard.name}: {shard.ingested} articles, "
+            f"{shard.failed} failed[/green]"
+        )
+    return ingested, failed
+
+
+class OpenAIBatchBackend:
+    """Batches through the OpenAI Batch API (results within 24 hours)."""
+
+    def __init__(self, client: Optional[OpenAI] = None):
+        self.client = client or OpenAI()
+
+    def submit(self, requests_path: Path) -> str:
+        with open(requests_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status == "completed":
+            return "completed"
+        if batch.status in ("expired", "cancelled"):
+            # Requests answered before the batch ended are still delivered
+            return "completed" if batch.output_file_id else "failed"
+        if batch.status == "failed":
+            return "failed"
+        return "in_progress"
+
+    def download(self, batch_id: str, results_path: Path):
+        batch = self.client.batches.retrieve(batch_id)
+        tmp_path = results_path.with_name(results_path.name + ".tmp")
+        with open(tmp_path, "wb") as out:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    out.write(self.client.files.content(file_id).content)
+        tmp_path.replace(results_path)
+
+
+class LocalBatchBackend:
+    """Filesystem stand-in for a batch API.
+
+    Submitted files are copied into ``root/<batch_id>/``; the first status
+    check answers every request with ``complete`` (request body to reply
+    text) and writes the results in the OpenAI batch output format.
+
+    Args:
+        root: Directory holding the submitted batches
+        complete: Returns the reply content for a chat request body
+    """
+
+    def __init__(self, root: Path, complete: Callable[[Dict], str]):
+        self.root = Path(root)
+        self.complete = complete
+
+    def submit(self, requests_path: Path) -> str:
+        batch_id = f"local-batch-{uuid.uuid4().hex}"
+        (self.root / batch_id).mkdir(parents=True)
+        shutil.copyfile(requests_path, self.root / batch_id / "input.jsonl")
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        batch_dir = self.root / batch_id
+        if not (batch_dir / "output.jsonl").exists():
+            self._process(batch_dir)
+        return "completed"
+
+    def _process(self, batch_dir: Path):
+        tmp_path = batch_dir / "output.jsonl.tmp"
+        with (
+            open(batch_dir / "input.jsonl", encoding="utf-8") as f,
+            open(tmp_path, "w", encoding="utf-8") as out,
+        ):
+            for line in f:
+                request = json.loads(line)
+                result = {"custom_id": request["custom_id"]}
+                try:
+                    reply = self.complete(request["body"])
+                except Exception as e:
+                    result.update(response=None, error={"message": str(e)})
+                else:
+                    result.update(
+                        response={
+                            "status_code": 200,
+                            "body": {
+                                "choices": [
+                                    {
+                                        "index": 0,
+                                        "message": {
+                                            "role": "assistant",
+                                            "content": reply,
+                                        },
+                                    }
+                                ]
+                            },
+                        },
+                        error=None,
+                    )
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        tmp_path.replace(batch_dir / "output.jsonl")
+
+    def download(self, batch_id: str, results_path: Path):
+        shutil.copyfile(self.root / batch_id / "output.jsonl", results_path)
+
+
+def openai_completion(client: Optional[OpenAI] = None) -> Callable[[Dict], str]:
+    """Completion callable for ``LocalBatchBackend`` making live API calls."""
+    client = client or OpenAI()
+
+    def complete(body: Dict) -> str:
+        response = client.chat.completions.create(**body)
+        return response.choices[0].message.content
+
+    return complete
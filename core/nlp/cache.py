@@ -0,0 +1,190 @@
+"""Persistent, size-bounded cache of LLM replies.
+
+Replies are stored in a SQLite file keyed by a SHA-256 hash of the model,
+``PROMPT_VERSION``, the targets and the normalized article text, so
+re-running a prediction (``--force``, after a crash, or for an unchanged
+prompt) reuses the earlier reply instead of paying for it again. Bumping
+``PROMPT_VERSION`` whenever a prompt changes keeps stale replies from being
+served.
+
+When the stored replies exceed ``max_bytes`` the least recently used ones
+are evicted. Hit and miss counts are kept in the same file. Lookups write
+nothing themselves: the counters and ``last_used`` times they update are
+buffered and written in one transaction every ``flush_interval`` seconds,
+before an eviction, and on ``close``.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from core.nlp.prompts import PROMPT_VERSION, Target
+
+DEFAULT_CACHE_PATH = Path(".cache") / "stance_responses.sqlite"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of an article for cache keys (NFC, collapsed spaces)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model: str, targets: List[Target], article_text: str) -> str:
+    payload = json.dumps(
+        [model, PROMPT_VERSION, [list(target) for target in targets]],
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(article_text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of raw model replies in a SQLite file.
+
+    Args:
+        path: SQLite file, created if missing
+        max_bytes: Upper bound on the total size of stored replies
+        flush_interval: Longest time in seconds lookups stay buffered
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        max_bytes: int = 256 << 20,
+        flush_interval: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, reply TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used "
+                "ON responses (last_used)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, "
+                "value INTEGER NOT NULL)"
+            )
+        self.total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        # Buffered lookups: counter increments and last use per key
+        self._counts: Dict[str, int] = {}
+        self._used: Dict[str, float] = {}
+        self._flushed = time.monotonic()
+
+    def _count(self, name: str):
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def _flush(self):
+        """Write the buffered lookups (with ``self._lock`` held)."""
+        if self._counts or self._used:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE responses SET last_used = ? WHERE key = ?",
+                    [(used, key) for key, used in self._used.items()],
+                )
+                self._conn.executemany(
+                    "INSERT INTO stats (name, value) VALUES (?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                    list(self._counts.items()),
+                )
+            self._counts.clear()
+            self._used.clear()
+        self._flushed = time.monotonic()
+
+    def flush(self):
+        """Write the buffered hit and miss counts and ``last_used`` times."""
+        with self._lock:
+            self._flush()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reply FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                self._count("misses")
+            else:
+                self._used[key] = time.time()
+                self.hits += 1
+                self._count("hits")
+            if time.monotonic() - self._flushed >= self.flush_interval:
+                self._flush()
+            return None if row is None else row[0]
+
+    def put(self, key: str, reply: str):
+        size = len(reply.encode("utf-8"))
+        with self._lock:
+            with self._conn:
+                previous = self._conn.execute(
+                    "SELECT size FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, reply, size, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, reply, size, time.time()),
+                )
+                self.total_bytes += size - (previous[0] if previous else 0)
+            self._used.pop(key, None)
+            if self.total_bytes > self.max_bytes:
+                # Evict by up-to-date last_used times
+                self._flush()
+                with self._conn:
+                    self._evict()
+
+    def _evict(self):
+        """Drop least recently used replies down to 90% of ``max_bytes``."""
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used")
+        evicted = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            evicted.append((key,))
+            self.total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self._conn.execute(
+            "INSERT INTO stats (name, value) VALUES ('evictions', ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+            (len(evicted),),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Lifetime counters plus the current number and size of entries."""
+        with self._lock:
+            self._flush()
+            counters = dict(self._conn.execute("SELECT name, value FROM stats"))
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries[0],
+            "bytes": self.total_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush()
+        self._conn.close()
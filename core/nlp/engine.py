@@ -0,0 +1,484 @@
+"""Concurrent stance prediction against the chat completions API.
+
+``PredictionEngine`` classifies articles with an ``AsyncOpenAI`` client:
+
+- ``concurrency`` workers keep that many requests in flight
+- a ``RateLimiter`` holds every request until the requests-per-minute and
+  tokens-per-minute token buckets allow it
+- 429 responses pause all workers for the server's ``Retry-After`` (or an
+  exponential backoff), other transient errors back off the failing request
+- with a ``TargetMatcher`` pre-filter, targets an article never mentions
+  get an automatic neutral prediction and are left out of its request;
+  articles mentioning no target are not sent at all
+- results go through a queue to a ``PredictionWriter`` that upserts them
+  into ``stance_predictions`` in batches, off the event loop
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import openai
+from openai import AsyncOpenAI
+from rich import print as rprint
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.db.aggregates import record_changes
+from core.db.models import StancePrediction
+from core.nlp.cache import ResponseCache, cache_key
+from core.nlp.prefilter import AUTO_NEUTRAL, TargetMatcher
+from core.nlp.prefilter import SOURCE as PREFILTER_SOURCE
+from core.nlp.prompts import MODEL, Target, build_request, parse_target_replies
+from core.nlp.tokens import TokenBudget, aggregate_stances, count_tokens
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """Upper-bound estimate of the tokens a request will use."""
+    # A few tokens of chat formatting per message
+    prompt_tokens = sum(count_tokens(message["content"]) + 4 for message in messages)
+    return prompt_tokens + max_tokens
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate_per_minute``; ``0`` disables it.
+
+    The bucket may go into debt (``consume``) when a request turns out to
+    use more tokens than were reserved for it.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def consume(self, amount: float):
+        if self.rate:
+            self._refill()
+            self.tokens -= amount
+
+    async def acquire(self, amount: float = 1):
+        if not self.rate:
+            return
+        amount = min(amount, self.capacity)
+        # Waiters are served in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Requests/tokens per minute limits plus a shared 429 pause."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, tokens: int):
+        while (delay := self.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        await self.requests.acquire(1)
+        await self.tokens.acquire(tokens)
+
+
+def retry_after(error: openai.APIStatusError) -> Optional[float]:
+    """Seconds the server asked us to wait, if it said so."""
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+@dataclass
+class PredictionResult:
+    article_id: int
+    target: str
+    target_type: str
+    stance: str
+    justification: str
+    source: str = "llm"
+
+
+def upsert_predictions(
+    db: Session, results: List[PredictionResult], keep_sources: Iterable[str] = ()
+):
+    """Insert or update the predictions in ``results`` and commit.
+
+    One ``INSERT ... ON CONFLICT (article_id, target, target_type) DO UPDATE``
+    statement writes the whole batch without reading existing rows first. A
+    later result for the same key wins, except over existing predictions
+    whose ``source`` is in ``keep_sources``, which are left as they are. The
+    aggregate cells the batch touches are logged for ``refresh_aggregates``
+    in the same transaction.
+    """
+    if not results:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        raise ValueError(f"Prediction upserts are not supported on {dialect}")
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+    now = datetime.utcnow()
+    rows = {
+        (result.article_id, result.target, result.target_type): {
+            "article_id": result.article_id,
+            "target": result.target,
+            "target_type": result.target_type,
+            "stance": result.stance,
+            "justification": result.justification,
+            "source": result.source,
+            "created_at": now,
+        }
+        for result in results
+    }
+    keep_sources = list(keep_sources)
+    statement = insert(StancePrediction)
+    statement = statement.on_conflict_do_update(
+        index_elements=["article_id", "target", "target_type"],
+        set_={
+            column: statement.excluded[column]
+            for column in ("stance", "justification", "source", "created_at")
+        },
+        # Not NOT IN, whose expanding parameter executemany cannot bind
+        where=and_(*(StancePrediction.source != source for source in keep_sources))
+        if keep_sources
+        else None,
+    )
+    try:
+        db.execute(statement, list(rows.values()))
+        record_changes(db, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+class PredictionWriter:
+    """Upsert prediction results in batches from a background task.
+
+    Args:
+        db: Session used (from a worker thread) for the writes
+        batch_size: Results per transaction
+        flush_interval: Maximum seconds a result waits before it is written
+        queue_size: Bound of the result queue
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        queue_size: int = 1000,
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue[Optional[PredictionResult]] = asyncio.Queue(
+            queue_size
+        )
+        self.written = 0
+        self.failed = 0
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def put(self, result: PredictionResult):
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+        await self.queue.put(result)
+
+    async def close(self):
+        """Wait for every queued result to be written, then stop."""
+        if self._consumer is None:
+            return
+        # The sentinel ends the last partial batch without waiting it out
+        await self.queue.put(None)
+        await self.queue.join()
+        self._consumer.cancel()
+        self._consumer = None
+
+    async def _next_batch(self) -> List[Optional[PredictionResult]]:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _consume(self):
+        while True:
+            items = await self._next_batch()
+            batch = [result for result in items if result is not None]
+            if not batch:
+                self.queue.task_done()
+                continue
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+                self.written += len(batch)
+                rprint(f"[green]Saved {self.written} predictions[/green]")
+            except Exception as e:
+                self.failed += len(batch)
+                rprint(f"[red]Error saving {len(batch)} predictions: {e}[/red]")
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+    def _write_batch(self, batch: List[PredictionResult]):
+        upsert_predictions(self.db, batch)
+
+
+@dataclass
+class EngineStats:
+    completed: int = 0
+    cached: int = 0
+    skipped: int = 0
+    auto_neutral: int = 0
+    predictions: int = 0
+    failed: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def articles_per_minute(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.completed * 60 / elapsed if elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.completed} classified ({self.cached} from cache, "
+            f"{self.skipped} skipped by the pre-filter, "
+            f"{self.predictions} predictions of which {self.auto_neutral} "
+            f"automatic neutrals), "
+            f"{self.failed} failed, "
+            f"{self.retries} retries ({self.rate_limited} rate limited), "
+            f"{self.prompt_tokens + self.completion_tokens} tokens, "
+            f"{self.articles_per_minute:.0f} articles/min"
+        )
+
+
+class PredictionEngine:
+    """Classify articles concurrently within rate limits.
+
+    With several targets each article is scored for all of them in a single
+    structured-output request, so its text is sent (and paid for) once.
+
+    Args:
+        client: Async OpenAI client; create it with ``max_retries=0`` so the
+            engine's backoff is the only retry layer
+        targets: ``(target, target_type)`` pairs to score every article for
+        writer: Receives every successful prediction
+        concurrency: Maximum requests in flight
+        requests_per_minute: Request budget (``0`` disables the limit)
+        tokens_per_minute: Token budget (``0`` disables the limit)
+        max_attempts: Attempts per article before it is counted as failed
+        base_delay: First backoff delay in seconds, doubled per attempt
+        max_delay: Longest backoff delay in seconds
+        cache: Response cache consulted before calling the API
+        budget: Token budget that long articles are cut or chunked to
+        prefilter: Matcher deciding which targets each article mentions
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        targets: List[Target],
+        writer: PredictionWriter,
+        concurrency: int = 16,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 200_000,
+        max_attempts: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        model: str = MODEL,
+        cache: Optional[ResponseCache] = None,
+        budget: Optional[TokenBudget] = None,
+        prefilter: Optional[TargetMatcher] = None,
+    ):
+        if not targets:
+            raise ValueError("At least one target is required")
+        self.client = client
+        self.targets = targets
+        self.writer = writer
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.model = model
+        self.cache = cache
+        self.budget = budget
+        self.prefilter = prefilter
+        self.stats = EngineStats()
+
+    def _backoff(self, attempt: int) -> float:
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def classify(
+        self, article_text: str, targets: Optional[List[Target]] = None
+    ) -> Dict[Target, Tuple[str, str]]:
+        """Classify one article for ``targets`` (default: every target).
+
+        With a token budget, long articles are cut to their most relevant
+        paragraphs or classified chunk by chunk.
+
+        Returns:
+            ``(stance, justification)`` per target
+        """
+        targets = targets or self.targets
+        if self.budget is None:
+            return await self._classify_text(article_text, targets)
+        texts = self.budget.prepare(article_text, targets)
+        results = [await self._classify_text(text, targets) for text in texts]
+        if len(results) == 1:
+            return results[0]
+        return {
+            target: aggregate_stances([result[target] for result in results])
+            for target in targets
+        }
+
+    async def _classify_text(
+        self, article_text: str, targets: List[Target]
+    ) -> Dict[Target, Tuple[str, str]]:
+        """Classify one text, with the response cache and retries."""
+        key = cache_key(self.model, targets, article_text)
+        # The cache is a SQLite file; keep its I/O off the event loop
+        if (
+            self.cache is not None
+            and (reply := await asyncio.to_thread(self.cache.get, key)) is not None
+        ):
+            self.stats.cached += 1
+            return parse_target_replies(reply, targets)
+
+        request = build_request(article_text, targets)
+        estimate = estimate_tokens(request["messages"], request["max_tokens"])
+
+        for attempt in range(1, self.max_attempts + 1):
+            await self.limiter.acquire(estimate)
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.model, temperature=0.0, **request
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts:
+                    raise
+                self.stats.retries += 1
+                if isinstance(e, openai.RateLimitError):
+                    self.stats.rate_limited += 1
+                    delay = retry_after(e) or self._backoff(attempt)
+                    self.limiter.pause(delay)
+                else:
+                    delay = self._backoff(attempt)
+                    await asyncio.sleep(delay)
+                continue
+
+            if response.usage is not None:
+                self.stats.prompt_tokens += response.usage.prompt_tokens
+                self.stats.completion_tokens += response.usage.completion_tokens
+                self.limiter.tokens.consume(response.usage.total_tokens - estimate)
+            reply = response.choices[0].message.content
+            results = parse_target_replies(reply, targets)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.put, key, reply)
+            return results
+
+        raise RuntimeError("no attempts made")
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            article_id, content = item
+            targets = self.targets
+            if self.prefilter is not None:
+                mentioned = self.prefilter.mentioned(content)
+                targets = [target for target in self.targets if target in mentioned]
+            try:
+                predictions = await self.classify(content, targets) if targets else {}
+            except Exception as e:
+                self.stats.failed += 1
+                rprint(f"[red]Error processing article {article_id}: {e}[/red]")
+                continue
+            self.stats.completed += 1
+            if not targets:
+                self.stats.skipped += 1
+            for target, target_type in self.targets:
+                if (target, target_type) in predictions:
+                    stance, justification = predictions[target, target_type]
+                    result = PredictionResult(
+                        article_id, target, target_type, stance, justification
+                    )
+                else:
+                    self.stats.auto_neutral += 1
+                    result = PredictionResult(
+                        article_id, target, target_type, *AUTO_NEUTRAL, PREFILTER_SOURCE
+                    )
+                self.stats.predictions += 1
+                await self.writer.put(result)
+
+    async def run(self, articles: Iterable[Tuple[int, str]]) -> EngineStats:
+        """Classify ``(article_id, content)`` pairs and write the results.
+
+        ``articles`` is advanced in a worker thread, ``concurrency`` articles
+        at a time, so that a streaming database reader fetching its next page
+        does not stall the requests in flight.
+        """
+        self.stats = EngineStats()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [
+            asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)
+        ]
+        try:
+            articles = iter(articles)
+            while chunk := await asyncio.to_thread(
+                list, islice(articles, self.concurrency)
+            ):
+                for article in chunk:
+                    await queue.put(article)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await self.writer.close()
+        return self.stats
@@ -0,0 +1,279 @@
+"""Local CPU stance classifier distilled from the LLM predictions.
+
+``LocalStanceClassifier`` learns one linear model per ``(target,
+target_type)`` from the LLM labels in ``stance_predictions``. Articles are
+turned into accent-insensitive word 1-2 grams by a stateless hashing
+vectorizer, so a chunk of articles is vectorized once and scored for every
+target with a single sparse matrix product per target. Vectorizing dominates
+and runs at tens of thousands of articles per minute on one CPU core
+(``benchmarks/bench_local_classifier.py``), with no API costs, at the price
+of lower agreement with the LLM.
+
+Requires the optional ``scikit-learn`` dependency (``pip install
+greek-news-nlp[local]``).
+"""
+
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from rich import print as rprint
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.db.models import Article, StancePrediction
+from core.nlp.engine import PredictionResult, upsert_predictions
+from core.nlp.prompts import Target
+from core.nlp.text import fold
+
+try:
+    import joblib
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score, cohen_kappa_score, f1_score
+    from sklearn.model_selection import train_test_split
+except ImportError:  # pragma: no cover - optional dependency
+    HashingVectorizer = None
+
+DEFAULT_MODEL_PATH = Path("models") / "stance_local.joblib"
+SOURCE = "local"
+
+# Examples needed before a target gets a model
+MIN_EXAMPLES = 20
+
+# (stance, justification) per target for every article of a chunk
+Predictions = List[Dict[Target, Tuple[str, str]]]
+
+
+def _require_sklearn():
+    if HashingVectorizer is None:
+        raise RuntimeError(
+            "The local classifier requires the 'scikit-learn' package to be installed"
+        )
+
+
+class LocalStanceClassifier:
+    """Per-target linear stance models over hashed text features.
+
+    Args:
+        models: Fitted ``LogisticRegression`` per ``(target, target_type)``
+    """
+
+    def __init__(self, models: Optional[Dict[Target, "LogisticRegression"]] = None):
+        _require_sklearn()
+        self.models = models or {}
+        self.vectorizer = HashingVectorizer(
+            preprocessor=fold,
+            ngram_range=(1, 2),
+            n_features=1 << 20,
+            alternate_sign=False,
+        )
+
+    @property
+    def targets(self) -> List[Target]:
+        return list(self.models)
+
+    def vectorize(self, texts: Iterable[str]):
+        return self.vectorizer.transform(text or "" for text in texts)
+
+    def fit(self, features, stances: List[str], target: Target):
+        model = LogisticRegression(C=4.0, class_weight="balanced", max_iter=1000)
+        model.fit(features, stances)
+        self.models[target] = model
+
+    def predict_features(self, features, targets: List[Target]) -> Predictions:
+        missing = [target for target, _ in set(targets) - set(self.models)]
+        if missing:
+            raise ValueError(f"No local model for targets: {', '.join(missing)}")
+
+        predictions: Predictions = [{} for _ in range(features.shape[0])]
+        for target in targets:
+            model = self.models[target]
+            probabilities = model.predict_proba(features)
+            best = probabilities.argmax(axis=1)
+            for row, (index, probability) in enumerate(
+                zip(best, probabilities.max(axis=1))
+            ):
+                predictions[row][target] = (
+                    model.classes_[index],
+                    f"Πρόβλεψη τοπικού μοντέλου (βεβαιότητα {probability:.0%})",
+                )
+        return predictions
+
+    def predict_batch(self, texts: List[str], targets: List[Target]) -> Predictions:
+        """Score a chunk of articles for every target."""
+        return self.predict_features(self.vectorize(texts), targets)
+
+    def classify(
+        self, article_text: str, target: str, target_type: str = "club"
+    ) -> Tuple[str, str]:
+        """Same contract as ``classify_article_with_explanation``."""
+        target = (target, target_type)
+        return self.predict_batch([article_text], [target])[0][target]
+
+    def save(self, path: Path = DEFAULT_MODEL_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self.models, path, compress=3)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_MODEL_PATH) -> "LocalStanceClassifier":
+        _require_sklearn()
+        return cls(joblib.load(path))
+
+
+def load_labels(
+    db: Session, targets: Optional[List[Target]] = None
+) -> Tuple[List[str], Dict[Target, Tuple[List[int], List[str]]]]:
+    """LLM stance labels, grouped by target.
+
+    Returns:
+        The labelled articles' texts, and per target the indices of its
+        articles in that list with their stances
+    """
+    query = (
+        select(
+            Article.id,
+            Article.content,
+            StancePrediction.target,
+            StancePrediction.target_type,
+            StancePrediction.stance,
+        )
+        .join(StancePrediction, StancePrediction.article_id == Article.id)
+        .where(StancePrediction.source == "llm")
+        .order_by(Article.id)
+    )
+
+    texts: List[str] = []
+    positions: Dict[int, int] = {}
+    labels: Dict[Target, Tuple[List[int], List[str]]] = {}
+    for article_id, content, target, target_type, stance in db.execute(
+        query.execution_options(yield_per=1000)
+    ):
+        if targets is not None and (target, target_type) not in targets:
+            continue
+        if article_id not in positions:
+            positions[article_id] = len(texts)
+            texts.append(content or "")
+        indices, stances = labels.setdefault((target, target_type), ([], []))
+        indices.append(positions[article_id])
+        stances.append(stance)
+    return texts, labels
+
+
+def agreement(llm_stances: List[str], local_stances: List[str]) -> Dict[str, float]:
+    """Agreement of local predictions with the LLM labels."""
+    _require_sklearn()
+    return {
+        "articles": len(llm_stances),
+        "accuracy": accuracy_score(llm_stances, local_stances),
+        "kappa": cohen_kappa_score(llm_stances, local_stances),
+        "macro_f1": f1_score(
+            llm_stances, local_stances, average="macro", zero_division=0
+        ),
+    }
+
+
+def train_local_classifier(
+    db: Session,
+    targets: Optional[List[Target]] = None,
+    holdout: float = 0.2,
+    min_examples: int = MIN_EXAMPLES,
+) -> Tuple[LocalStanceClassifier, Dict[Target, Dict[str, float]]]:
+    """Fit a local model per target on the LLM predictions.
+
+    Args:
+        db: Database session
+        targets: Targets to train (default: every target with LLM labels)
+        holdout: Share of each target's labels kept out of training to
+            measure agreement with the LLM (``0`` trains on everything)
+        min_examples: Targets with fewer labels are skipped
+
+    Returns:
+        The classifier and, per trained target, its agreement on the held-out
+        labels (empty when ``holdout`` is 0)
+    """
+    classifier = LocalStanceClassifier()
+    texts, labels = load_labels(db, targets)
+    features = classifier.vectorize(texts)
+
+    report: Dict[Target, Dict[str, float]] = {}
+    for target, (indices, stances) in labels.items():
+        if len(indices) < min_examples or len(set(stances)) < 2:
+            continue
+        if holdout:
+            train, test, train_stances, test_stances = train_test_split(
+                indices, stances, test_size=holdout, random_state=0
+            )
+        else:
+            train, train_stances, test = indices, stances, []
+        classifier.fit(features[train], train_stances, target)
+        if test:
+            predicted = classifier.predict_features(features[test], [target])
+            report[target] = agreement(
+                test_stances, [prediction[target][0] for prediction in predicted]
+            )
+    return classifier, report
+
+
+def evaluate_local_classifier(
+    db: Session, classifier: LocalStanceClassifier, batch_size: int = 1000
+) -> Dict[Target, Dict[str, float]]:
+    """Agreement of a trained classifier with all the LLM labels of its targets.
+
+    Labels the classifier was trained on are included, so this overstates the
+    agreement on unseen articles; use it to track new LLM predictions.
+    """
+    texts, labels = load_labels(db, classifier.targets)
+    report = {}
+    for target, (indices, stances) in labels.items():
+        predicted = []
+        for start in range(0, len(indices), batch_size):
+            chunk = [texts[i] for i in indices[start : start + batch_size]]
+            predicted.extend(
+                prediction[target][0]
+                for prediction in classifier.predict_batch(chunk, [target])
+            )
+        report[target] = agreement(stances, predicted)
+    return report
+
+
+def predict_local(
+    db: Session,
+    articles: Iterable[Tuple[int, str]],
+    targets: List[Target],
+    classifier: LocalStanceClassifier,
+    batch_size: int = 1000,
+) -> int:
+    """Score ``(article_id, content)`` pairs locally and upsert the results.
+
+    Articles are vectorized and scored a chunk of ``batch_size`` at a time,
+    and every chunk is saved in one transaction. Existing LLM predictions are
+    never overwritten, as they are the classifier's training labels.
+
+    Returns:
+        int: Number of articles scored
+    """
+    scored = 0
+    started = time.monotonic()
+    articles = iter(articles)
+    while chunk := list(islice(articles, batch_size)):
+        predictions = classifier.predict_batch(
+            [content for _, content in chunk], targets
+        )
+        upsert_predictions(
+            db,
+            [
+                PredictionResult(
+                    article_id, target, target_type, stance, justification, SOURCE
+                )
+                for (article_id, _), scores in zip(chunk, predictions)
+                for (target, target_type), (stance, justification) in scores.items()
+            ],
+            keep_sources=("llm",),
+        )
+        scored += len(chunk)
+        rate = scored / max(time.monotonic() - started, 1e-9) * 60
+        rprint(f"[green]Scored {scored} articles ({rate:,.0f}/min)[/green]")
+    return scored
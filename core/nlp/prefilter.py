@@ -0,0 +1,98 @@
+"""Local pre-filter deciding which targets an article actually mentions.
+
+Articles that never mention a target are neutral towards it by definition
+(the prompts say as much), so ``predict`` records an automatic neutral for
+them instead of paying for an LLM call.
+
+Matching is accent- and case-insensitive and stemmed: every alias is folded
+(``core.nlp.text.fold``) and stripped of its inflectional ending, and matches
+any word starting with that stem, so ``Ολυμπιακός`` also finds "του
+Ολυμπιακού". Short all-caps acronyms (``ΠΑΟ``, ``VAR``) only match whole
+words, so ``ΠΑΟ`` does not match "ΠΑΟΚ". Each club and the refereeing have
+an alias dictionary; clubs without an entry match on their own name.
+"""
+
+import re
+from typing import Dict, List, Set
+
+from core.nlp.prompts import NEUTRAL, Target
+from core.nlp.text import fold
+
+SOURCE = "prefilter"
+# (stance, justification) recorded for a target an article does not mention
+AUTO_NEUTRAL = (NEUTRAL, "Το άρθρο δεν αναφέρεται στον στόχο")
+
+# Nicknames and abbreviations per club, keyed by the name used as a target
+CLUB_ALIASES: Dict[str, List[str]] = {
+    "Ολυμπιακός": ["Θρύλος", "ΟΣΦΠ", "ερυθρόλευκοι", "Πειραιώτες"],
+    "Παναθηναϊκός": ["ΠΑΟ", "Τριφύλλι", "πράσινοι"],
+    "ΑΕΚ": ["Ένωση", "κιτρινόμαυροι", "Δικέφαλος"],
+    "ΠΑΟΚ": ["Δικέφαλος του Βορρά", "ασπρόμαυροι"],
+    "Άρης": ["κιτρινόμαυροι", "Θεός του Πολέμου"],
+    "Αστέρας Τρίπολης": ["Αστέρας"],
+}
+
+REFEREE_ALIASES = [
+    "διαιτητής",
+    "διαιτησία",
+    "ρέφερι",
+    "VAR",
+    "ΚΕΔ",
+    "πέναλτι",
+    "οφσάιντ",
+    "σφυρίχτρα",
+    "κόκκινη κάρτα",
+    "κίτρινη κάρτα",
+]
+
+# Inflectional endings, tried longest first
+_SUFFIXES = sorted(
+    "ος ου ον οι ους ο ων ης η ας α ες ε ις ι ια ιας ιες ιων ς".split(),
+    key=len,
+    reverse=True,
+)
+MIN_STEM = 3
+
+
+def stem(word: str) -> str:
+    """Strip the inflectional ending of a folded Greek word."""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[: -len(suffix)]
+    return word
+
+
+def target_aliases(target: str, target_type: str) -> List[str]:
+    if target_type == "referee":
+        return list(REFEREE_ALIASES)
+    aliases = {fold(name): names for name, names in CLUB_ALIASES.items()}
+    return [target, *aliases.get(fold(target), [])]
+
+
+def _alias_pattern(alias: str) -> str:
+    if alias.isupper() and " " not in alias and len(alias) <= 5:
+        return rf"\b{re.escape(fold(alias))}\b"
+    # Every word of a multi-word alias may be inflected
+    stems = [re.escape(stem(word)) for word in fold(alias).split()]
+    return r"\b" + r"\w*\s+".join(stems)
+
+
+def mentions_pattern(targets: List[Target]) -> re.Pattern:
+    """Regex matching a mention of any target in ``fold``-ed text."""
+    aliases = [alias for target in targets for alias in target_aliases(*target)]
+    return re.compile("|".join(_alias_pattern(alias) for alias in aliases))
+
+
+class TargetMatcher:
+    """Find which of ``targets`` an article mentions."""
+
+    def __init__(self, targets: List[Target]):
+        self.patterns = {target: mentions_pattern([target]) for target in targets}
+
+    def mentioned(self, text: str) -> Set[Target]:
+        folded = fold(text or "")
+        return {
+            target
+            for target, pattern in self.patterns.items()
+            if pattern.search(folded)
+        }
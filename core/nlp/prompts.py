@@ -0,0 +1,207 @@
+"""Prompt construction and reply parsing for stance classification."""
+
+import json
+from typing import Dict, List, Tuple
+
+MODEL = "gpt-4o-mini"
+# Bump whenever a prompt or output schema changes, so cached replies to the
+# old prompt are not reused
+PROMPT_VERSION = "1"
+MAX_TOKENS = 200
+NEUTRAL = "ουδέτερη"
+VALID_STANCES = {"θετική", "αρνητική", NEUTRAL}
+
+
+def build_messages(
+    article_text: str, target: str, target_type: str = "club"
+) -> List[Dict[str, str]]:
+    """Build the chat messages asking for the stance towards a target."""
+
+    # Customize prompt based on target type
+    if target_type == "referee":
+        system_prompt = (
+            "Είσαι ένας βοηθός ανάλυσης κειμένου για ελληνικά κείμενα. "
+            "Θέλω να αναλύσεις το παρακάτω απόσπασμα και να προσδιορίσεις "
+            "αν η στάση του κειμένου απέναντι στη διαιτησία "
+            "είναι θετική (επαινετική/υποστηρικτική), "
+            "αρνητική (επικριτική/αμφισβητεί), "
+            "ή ουδέτερη (αντικειμενική/περιγραφική). "
+            "Αν δεν υπάρχει αναφορά στη διαιτησία, απαντήσε με 'ουδέτερη'. "
+            "Στη συνέχεια, εξήγησε σε μία σύντομη παράγραφο γιατί "
+            "κατέληξες σε αυτό το συμπέρασμα."
+        )
+    else:
+        system_prompt = (
+            "Είσαι ένας βοηθός ανάλυσης κειμένου για ελληνικά κείμενα. "
+            "Θέλω να αναλύσεις το παρακάτω απόσπασμα και να προσδιορίσεις "
+            f"αν η στάση του κειμένου απέναντι στην ομάδα {target} "
+            "είναι θετική, αρνητική, ή ουδέτερη. "
+            "Στη συνέχεια, εξήγησε σε μία σύντομη παράγραφο γιατί "
+            "κατέληξες σε αυτό το συμπέρασμα."
+        )
+
+    return [
+        {
+            "role": "developer",
+            "content": system_prompt,
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Απόσπασμα:\n{article_text}\n\n"
+                "Απάντησε ΜΟΝΟ με μία από τις λέξεις 'θετική', 'αρνητική' "
+                "ή 'ουδέτερη' στην πρώτη γραμμή, και μετά σε νέα γραμμή "
+                "δώσε μια σύντομη εξήγηση για τη συλλογιστική σου."
+            ),
+        },
+    ]
+
+
+def parse_reply(full_reply: str) -> Tuple[str, str]:
+    """Split a model reply into a validated stance and its justification."""
+    lines = full_reply.strip().split("\n", 1)
+
+    stance = lines[0].strip().lower()
+    if stance not in VALID_STANCES:
+        stance = "ουδέτερη"  # Default to neutral if invalid
+    justification = lines[1].strip() if len(lines) > 1 else ""
+
+    return stance, justification
+
+
+# (target, target_type); refereeing is scored as the fixed target below
+Target = Tuple[str, str]
+REFEREE_TARGET: Target = ("διαιτησία", "referee")
+
+
+def build_multi_target_messages(
+    article_text: str, targets: List[Target]
+) -> List[Dict[str, str]]:
+    """Build chat messages asking for the stance towards several targets."""
+    described = "\n".join(
+        f"- {target}: "
+        + ("η διαιτησία" if target_type == "referee" else f"η ομάδα {target}")
+        for target, target_type in targets
+    )
+    system_prompt = (
+        "Είσαι ένας βοηθός ανάλυσης κειμένου για ελληνικά κείμενα. "
+        "Θέλω να αναλύσεις το παρακάτω απόσπασμα και να προσδιορίσεις "
+        "τη στάση του κειμένου απέναντι σε καθέναν από τους παρακάτω στόχους:\n"
+        f"{described}\n"
+        "Η στάση είναι θετική (επαινετική/υποστηρικτική), "
+        "αρνητική (επικριτική/αμφισβητεί) "
+        "ή ουδέτερη (αντικειμενική/περιγραφική). "
+        "Αν δεν υπάρχει αναφορά σε έναν στόχο, η στάση του είναι 'ουδέτερη'. "
+        "Για κάθε στόχο εξήγησε σε μία σύντομη πρόταση γιατί "
+        "κατέληξες σε αυτό το συμπέρασμα."
+    )
+    return [
+        {"role": "developer", "content": system_prompt},
+        {
+            "role": "user",
+            "content": (
+                f"Απόσπασμα:\n{article_text}\n\n"
+                "Απάντησε σε JSON με ένα στοιχείο του 'predictions' για κάθε "
+                "στόχο, με τα πεδία 'target', 'stance' και 'justification'."
+            ),
+        },
+    ]
+
+
+def multi_target_response_format(targets: List[Target]) -> Dict:
+    """Structured-output schema restricting targets and stances to valid values."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "stance_predictions",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "predictions": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "target": {
+                                    "type": "string",
+                                    "enum": [target for target, _ in targets],
+                                },
+                                "stance": {
+                                    "type": "string",
+                                    "enum": sorted(VALID_STANCES),
+                                },
+                                "justification": {"type": "string"},
+                            },
+                            "required": ["target", "stance", "justification"],
+                            "additionalProperties": False,
+                        },
+                    }
+                },
+                "required": ["predictions"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+def parse_multi_target_reply(
+    full_reply: str, targets: List[Target]
+) -> Dict[Target, Tuple[str, str]]:
+    """Validate a multi-target JSON reply.
+
+    Unknown targets are ignored and invalid stances default to neutral, like
+    ``parse_reply``.
+
+    Raises:
+        ValueError: The reply is not the expected JSON or misses a target
+    """
+    try:
+        predictions = json.loads(full_reply)["predictions"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed multi-target reply: {e}") from e
+
+    by_name = dict(targets)
+    results = {}
+    for prediction in predictions:
+        target = prediction.get("target") if isinstance(prediction, dict) else None
+        if target not in by_name:
+            continue
+        stance = str(prediction.get("stance", "")).strip().lower()
+        if stance not in VALID_STANCES:
+            stance = "ουδέτερη"  # Default to neutral if invalid
+        justification = str(prediction.get("justification", "")).strip()
+        results[(target, by_name[target])] = (stance, justification)
+
+    missing = [name for name, _ in set(targets) - set(results)]
+    if missing:
+        raise ValueError(f"Reply misses targets: {', '.join(missing)}")
+    return results
+
+
+def build_request(article_text: str, targets: List[Target]) -> Dict:
+    """Chat completion arguments (without the model) scoring ``targets``.
+
+    A single target uses the plain-text prompt, several targets one
+    structured-output request.
+    """
+    if len(targets) == 1:
+        target, target_type = targets[0]
+        return {
+            "messages": build_messages(article_text, target, target_type),
+            "max_tokens": MAX_TOKENS,
+        }
+    return {
+        "messages": build_multi_target_messages(article_text, targets),
+        "max_tokens": MAX_TOKENS * len(targets),
+        "response_format": multi_target_response_format(targets),
+    }
+
+
+def parse_target_replies(
+    full_reply: str, targets: List[Target]
+) -> Dict[Target, Tuple[str, str]]:
+    """Parse the reply to a ``build_request`` request, per target."""
+    if len(targets) == 1:
+        return {targets[0]: parse_reply(full_reply)}
+    return parse_multi_target_reply(full_reply, targets)
@@ -1,108 +1,356 @@
 """Script to predict stance of articles and save to database."""
 
+import asyncio
 import os
+import random
+import time
 from datetime import datetime
-from typing import Optional, Tuple
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import typer
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from rich import print as rprint
-from rich.progress import track
 from rich.table import Table
-from sqlalchemy import func, select
+from sqlalchemy import Select, exists, func, literal, or_, select, tablesample
+from sqlalchemy.orm import Session, aliased
 
+from core.db import aggregates
 from core.db.config import get_db
 from core.db.models import Article, StancePrediction
+from core.nlp.batch import (
+    BACKENDS,
+    DEFAULT_SHARD_SIZE,
+    BatchJob,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+    export_batch_job,
+    ingest_batch_job,
+    openai_completion,
+    poll_batch_job,
+    submit_batch_job,
+)
+from core.nlp.cache import DEFAULT_CACHE_PATH, ResponseCache, cache_key
+from core.nlp.engine import PredictionEngine, PredictionWriter
+from core.nlp.local_classifier import (
+    DEFAULT_MODEL_PATH,
+    LocalStanceClassifier,
+    evaluate_local_classifier,
+    predict_local,
+    train_local_classifier,
+)
+from core.nlp.prefilter import AUTO_NEUTRAL, TargetMatcher
+from core.nlp.prompts import (
+    MAX_TOKENS,
+    MODEL,
+    REFEREE_TARGET,
+    Target,
+    build_messages,
+    build_multi_target_messages,
+    multi_target_response_format,
+    parse_multi_target_reply,
+    parse_reply,
+)
+from core.nlp.tokens import TokenBudget, aggregate_stances
 
 app = typer.Typer()
+CLASSIFIER_BACKENDS = ("openai", "local")
+batch_app = typer.Typer(help="Predict stances offline through batch jobs")
+app.add_typer(batch_app, name="predict-batch")
 
 
 def classify_article_with_explanation(
-    client: OpenAI, article_text: str, target: str, target_type: str = "club"
+    client: Union[OpenAI, LocalStanceClassifier],
+    article_text: str,
+    target: str,
+    target_type: str = "club",
+    cache: Optional[ResponseCache] = None,
+    budget: Optional[TokenBudget] = None,
+    prefilter: Optional[TargetMatcher] = None,
 ) -> Tuple[str, str]:
-    """Classifies the stance of an article towards a target (club or referee)."""
-
-    # Customize prompt based on target type
-    if target_type == "referee":
-        system_prompt = (
-            "Είσαι ένας βοηθός ανάλυσης κειμένου για ελληνικά κείμενα. "
-            "Θέλω να αναλύσεις το παρακάτω απόσπασμα και να προσδιορίσεις "
-            "αν η στάση του κειμένου απέναντι στη διαιτησία "
-            "είναι θετική (επαινετική/υποστηρικτική), "
-            "αρνητική (επικριτική/αμφισβητεί), "
-            "ή ουδέτερη (αντικειμενική/περιγραφική). "
-            "Αν δεν υπάρχει αναφορά στη διαιτησία, απαντήσε με 'ουδέτερη'. "
-            "Στη συνέχεια, εξήγησε σε μία σύντομη παράγραφο γιατί "
-            "κατέληξες σε αυτό το συμπέρασμα."
-        )
-    else:
-        system_prompt = (
-            "Είσαι ένας βοηθός ανάλυσης κειμένου για ελληνικά κείμενα. "
-            "Θέλω να αναλύσεις το παρακάτω απόσπασμα και να προσδιορίσεις "
-            f"αν η στάση του κειμένου απέναντι στην ομάδα {target} "
-            "είναι θετική, αρνητική, ή ουδέτερη. "
-            "Στη συνέχεια, εξήγησε σε μία σύντομη παράγραφο γιατί "
-            "κατέληξες σε αυτό το συμπέρασμα."
+    """Classifies the stance of an article towards a target (club or referee).
+
+    ``client`` is either an OpenAI client or a ``LocalStanceClassifier``,
+    which scores the article on the CPU instead. A reply found in ``cache``
+    is reused instead of calling the API. With a ``budget``, long articles
+    are cut to their most relevant paragraphs or classified chunk by chunk.
+    With a ``prefilter``, articles that do not mention the target are neutral
+    without an API call.
+    """
+    if isinstance(client, LocalStanceClassifier):
+        return client.classify(article_text, target, target_type)
+
+    if prefilter is not None and (target, target_type) not in prefilter.mentioned(
+        article_text
+    ):
+        return AUTO_NEUTRAL
+
+    if budget is not None:
+        return aggregate_stances(
+            [
+                classify_article_with_explanation(
+                    client, text, target, target_type, cache
+                )
+                for text in budget.prepare(article_text, [(target, target_type)])
+            ]
         )
 
+    key = cache_key(MODEL, [(target, target_type)], article_text)
+    if cache is not None and (reply := cache.get(key)) is not None:
+        return parse_reply(reply)
+
     response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "developer",
-                "content": system_prompt,
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"Απόσπασμα:\n{article_text}\n\n"
-                    "Απάντησε ΜΟΝΟ με μία από τις λέξεις 'θετική', 'αρνητική' "
-                    "ή 'ουδέτερη' στην πρώτη γραμμή, και μετά σε νέα γραμμή "
-                    "δώσε μια σύντομη εξήγηση για τη συλλογιστική σου."
-                ),
-            },
-        ],
+        model=MODEL,
+        messages=build_messages(article_text, target, target_type),
         temperature=0.0,
-        max_tokens=200,
+        max_tokens=MAX_TOKENS,
     )
 
-    full_reply = response.choices[0].message.content.strip()
-    lines = full_reply.split("\n", 1)
+    reply = response.choices[0].message.content
+    if cache is not None:
+        cache.put(key, reply)
+    return parse_reply(reply)
+
+
+def classify_article_multi_target(
+    client: OpenAI,
+    article_text: str,
+    targets: List[Target],
+    cache: Optional[ResponseCache] = None,
+    budget: Optional[TokenBudget] = None,
+) -> Dict[Target, Tuple[str, str]]:
+    """Classifies the stance of an article towards several targets at once.
+
+    Returns:
+        ``(stance, justification)`` per ``(target, target_type)``
+    """
+    if budget is not None:
+        results = [
+            classify_article_multi_target(client, text, targets, cache)
+            for text in budget.prepare(article_text, targets)
+        ]
+        return {
+            target: aggregate_stances([result[target] for result in results])
+            for target in targets
+        }
+    key = cache_key(MODEL, targets, article_text)
+    if cache is not None and (reply := cache.get(key)) is not None:
+        return parse_multi_target_reply(reply, targets)
+
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=build_multi_target_messages(article_text, targets),
+        temperature=0.0,
+        max_tokens=MAX_TOKENS * len(targets),
+        response_format=multi_target_response_format(targets),
+    )
 
-    # Validate the stance
-    valid_stances = {"θετική", "αρνητική", "ουδέτερη"}
+    reply = response.choices[0].message.content
+    results = parse_multi_target_reply(reply, targets)
+    if cache is not None:
+        cache.put(key, reply)
+    return results
 
-    if len(lines) == 1:
-        stance = lines[0].strip().lower()
-        if stance not in valid_stances:
-            stance = "ουδέτερη"  # Default to neutral if invalid
-        justification = ""
-    else:
-        stance = lines[0].strip().lower()
-        if stance not in valid_stances:
-            stance = "ουδέτερη"  # Default to neutral if invalid
-        justification = lines[1].strip()
 
-    return stance, justification
+def resolve_targets(
+    clubs: List[str], target_type: str, referee: bool = False
+) -> List[Target]:
+    """Turn the CLI target options into ``(target, target_type)`` pairs."""
+    if target_type not in ["club", "referee"]:
+        raise ValueError("Invalid target type. Must be either 'club' or 'referee'")
+
+    # Set fixed target for referee type
+    if target_type == "referee":
+        return [REFEREE_TARGET]
+
+    if not clubs:
+        raise ValueError("Target is required when target_type is 'club'")
+
+    targets = [(club, "club") for club in dict.fromkeys(clubs)]
+    if referee:
+        targets.append(REFEREE_TARGET)
+    return targets
+
+
+def pending_articles_query(
+    targets: List[Target], force: bool = False, article=Article
+) -> Select:
+    """Articles missing a prediction for any of ``targets``.
+
+    ``article`` may be an alias of ``Article``, e.g. over a table sample.
+    """
+    query = select(article.id, article.content)
+    if not force:
+        query = query.where(
+            or_(
+                *(
+                    ~exists().where(
+                        StancePrediction.article_id == article.id,
+                        StancePrediction.target == target,
+                        StancePrediction.target_type == target_type,
+                    )
+                    for target, target_type in targets
+                )
+            )
+        )
+    return query
+
+
+def iter_pending_articles(
+    db: Session,
+    targets: List[Target],
+    force: bool = False,
+    limit: Optional[int] = None,
+    sample: Optional[float] = None,
+    page_size: int = 1000,
+    seed: Optional[int] = None,
+) -> Iterator[Tuple[int, str]]:
+    """Stream pending ``(article_id, content)`` rows in id order.
+
+    Rows are read a page at a time by keyset pagination (``id > last id``,
+    which the primary key index serves without sorting) through a
+    server-side cursor, so memory stays constant however large the corpus
+    is and the first rows arrive immediately. A PostgreSQL table sample is
+    streamed in a single unordered pass.
+
+    Args:
+        db: Session used only for reading; writes belong on another session
+        targets: Articles missing a prediction for any of these are pending
+        force: Stream every article, predicted or not
+        limit: Stop after this many articles
+        sample: Percentage of articles to draw at random: ``TABLESAMPLE
+            SYSTEM`` on PostgreSQL, a per-row random filter elsewhere
+        page_size: Rows per page query
+        seed: ``REPEATABLE`` seed of the PostgreSQL table sample, which then
+            reads the same blocks every time (a fresh sample if ``None``)
+    """
+    article = Article
+    random_filter = None
+    if sample is not None:
+        if db.get_bind().dialect.name == "postgresql":
+            article = aliased(
+                Article,
+                tablesample(
+                    Article,
+                    func.system(sample),
+                    name="sample",
+                    seed=None if seed is None else literal(seed),
+                ),
+            )
+        else:
+            # SQLite's random() is a signed 64-bit integer
+            random_filter = func.abs(func.random()) % 1_000_000 < sample * 10_000
+
+    query = pending_articles_query(targets, force, article)
+    if random_filter is not None:
+        query = query.where(random_filter)
+    if article is not Article:
+        # Page queries would each sample the table again; a table sample is
+        # small and unsorted, so it is read in one streamed pass instead
+        yield from db.execute(
+            query.limit(limit).execution_options(
+                stream_results=True, yield_per=page_size
+            )
+        )
+        return
+
+    last_id = 0
+    streamed = 0
+    while limit is None or streamed < limit:
+        page_limit = page_size if limit is None else min(page_size, limit - streamed)
+        page = db.execute(
+            query.where(article.id > last_id)
+            .order_by(article.id)
+            .limit(page_limit)
+            .execution_options(stream_results=True, yield_per=page_limit)
+        )
+        count = 0
+        for article_id, content in page:
+            count += 1
+            yield article_id, content
+        if count < page_limit:
+            return
+        streamed += count
+        last_id = article_id
+
+
+async def run_predictions(
+    db: Session,
+    articles: Iterable[Tuple[int, str]],
+    targets: List[Target],
+    batch_size: int = 100,
+    concurrency: int = 16,
+    requests_per_minute: float = 500,
+    tokens_per_minute: float = 200_000,
+    client: Optional[AsyncOpenAI] = None,
+    cache: Optional[ResponseCache] = None,
+    budget: Optional[TokenBudget] = None,
+    prefilter: bool = True,
+):
+    """Classify ``(article_id, content)`` pairs and store the predictions.
+
+    With ``prefilter``, targets an article does not mention are recorded as
+    neutral without asking the API.
+    """
+    client = client or AsyncOpenAI(max_retries=0)
+    writer = PredictionWriter(db, batch_size=batch_size)
+    engine = PredictionEngine(
+        client,
+        targets,
+        writer,
+        concurrency=concurrency,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        cache=cache,
+        budget=budget,
+        prefilter=TargetMatcher(targets) if prefilter else None,
+    )
+    stats = await engine.run(articles)
+    rprint(f"[bold]{stats.summary()}[/bold]")
+    if budget is not None:
+        rprint(budget.stats.summary())
+    return stats
 
 
 @app.command()
 def predict(
-    target: Optional[str] = typer.Option(
+    targets: Optional[List[str]] = typer.Option(
         None,
         "--target",
         "-t",
-        help="Target club (required for club type, ignored for referee type)",
+        help=(
+            "Target club, repeat for several clubs "
+            "(required for club type, ignored for referee type)"
+        ),
     ),
     target_type: str = typer.Option(
         "club", "--type", "-y", help="Type of target (club or referee)"
     ),
+    referee: bool = typer.Option(
+        False,
+        "--referee",
+        "-r",
+        help="Also score refereeing, in the same request as the clubs",
+    ),
     batch_size: int = typer.Option(
-        100, "--batch-size", "-b", help="Number of articles to process in each batch"
+        100, "--batch-size", "-b", help="Number of predictions saved per transaction"
     ),
     limit: int = typer.Option(
         None, "--limit", "-l", help="Limit the number of articles to process"
     ),
+    sample: Optional[float] = typer.Option(
+        None,
+        "--sample",
+        "-s",
+        min=0,
+        max=100,
+        help="Predict a random sample of this percentage of the articles",
+    ),
+    seed: Optional[int] = typer.Option(
+        None,
+        "--seed",
+        help="Seed of the --sample draw, to repeat a sample (random by default)",
+    ),
     force: bool = typer.Option(
         False,
         "--force",
@@ -110,19 +358,79 @@ def predict(
         help="Force re-prediction of articles that already have predictions",
     ),
     api_key: Optional[str] = typer.Option(None, "--api-key", help="OpenAI API key"),
+    concurrency: int = typer.Option(
+        16, "--concurrency", "-c", help="Maximum API requests in flight"
+    ),
+    requests_per_minute: float = typer.Option(
+        500, "--rpm", help="API requests per minute (0 disables the limit)"
+    ),
+    tokens_per_minute: float = typer.Option(
+        200_000, "--tpm", help="API tokens per minute (0 disables the limit)"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse cached replies for unchanged prompts"
+    ),
+    cache_path: Path = typer.Option(
+        DEFAULT_CACHE_PATH, "--cache-path", help="SQLite file of the response cache"
+    ),
+    cache_max_mb: int = typer.Option(
+        256, "--cache-max-mb", help="Size limit of the response cache, in MB"
+    ),
+    max_article_tokens: int = typer.Option(
+        3000,
+        "--max-article-tokens",
+        help="Longest article text sent in one request (0 sends articles whole)",
+    ),
+    oversize: str = typer.Option(
+        "select",
+        "--oversize",
+        help=(
+            "Longer articles: 'select' the most relevant paragraphs or "
+            "'chunk' them into several requests"
+        ),
+    ),
+    prefilter: bool = typer.Option(
+        True,
+        "--prefilter/--no-prefilter",
+        help="Record unmentioned targets as neutral without an API call",
+    ),
+    backend: str = typer.Option(
+        "openai",
+        "--backend",
+        help="Classifier: the OpenAI API or the local CPU model (see train-local)",
+    ),
+    model_path: Path = typer.Option(
+        DEFAULT_MODEL_PATH, "--model-path", help="Trained local model"
+    ),
 ):
-    """Predict stance for articles in the database."""
-    if target_type not in ["club", "referee"]:
-        rprint("[red]Invalid target type. Must be either 'club' or 'referee'[/red]")
-        raise typer.Exit(1)
+    """Predict stance for articles in the database.
 
-    if target_type == "club" and not target:
-        rprint("[red]Target is required when target_type is 'club'[/red]")
+    With several targets (e.g. ``-t ΠΑΟΚ -t ΑΕΚ --referee``) each article is
+    scored for all of them in one structured-output request.
+    """
+    try:
+        prediction_targets = resolve_targets(targets, target_type, referee)
+        if backend not in CLASSIFIER_BACKENDS:
+            raise ValueError(
+                f"Invalid backend {backend}, expected one of {CLASSIFIER_BACKENDS}"
+            )
+        budget = (
+            TokenBudget(max_article_tokens, oversize) if max_article_tokens else None
+        )
+    except ValueError as e:
+        rprint(f"[red]{e}[/red]")
         raise typer.Exit(1)
 
-    # Set fixed target for referee type
-    if target_type == "referee":
-        target = "διαιτησία"
+    if sample is not None:
+        if seed is None:
+            seed = random.randrange(2**31)
+        rprint(f"[yellow]Sampling {sample:g}% of the articles (seed {seed})[/yellow]")
+
+    if backend == "local":
+        predict_with_local_model(
+            prediction_targets, model_path, batch_size, limit, sample, force, seed
+        )
+        return
 
     if api_key:
         os.environ["OPENAI_API_KEY"] = api_key
@@ -130,79 +438,146 @@ def predict(
         api_key = typer.prompt("OpenAI API key", hide_input=True)
         os.environ["OPENAI_API_KEY"] = api_key
 
-    client = OpenAI()
     db = next(get_db())
+    # Pending articles are streamed on their own session, since the writer
+    # commits on ``db`` from a worker thread meanwhile
+    read_db = next(get_db())
+    cache = ResponseCache(cache_path, cache_max_mb << 20) if use_cache else None
 
     try:
-        # Query to get articles that don't have predictions for this target_club
-        query = select(Article)
-        if not force:
-            query = query.outerjoin(
-                StancePrediction,
-                (Article.id == StancePrediction.article_id)
-                & (StancePrediction.target == target)
-                & (StancePrediction.target_type == target_type),
-            ).where(StancePrediction.id.is_(None))
-
-        # Add random ordering and limit
-        query = query.order_by(func.random())
-        if limit:
-            query = query.limit(limit)
-
-        articles = db.execute(query).scalars().all()
-
-        if not articles:
+        articles = iter_pending_articles(
+            read_db, prediction_targets, force, limit=limit, sample=sample, seed=seed
+        )
+        stats = asyncio.run(
+            run_predictions(
+                db,
+                articles,
+                prediction_targets,
+                batch_size=batch_size,
+                concurrency=concurrency,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                cache=cache,
+                budget=budget,
+                prefilter=prefilter,
+            )
+        )
+        if not stats.completed + stats.failed:
             rprint("[yellow]No articles found to process[/yellow]")
             return
+        rprint("[bold green]Successfully processed all articles![/bold green]")
+        if cache is not None:
+            rprint(f"Response cache: {cache.hits} hits, {cache.misses} misses")
 
-        rprint(f"[green]Found {len(articles)} articles to process[/green]")
-
-        # Process articles in batches
-        for article in track(articles, description="Processing articles..."):
-            try:
-                stance, justification = classify_article_with_explanation(
-                    client, article.content, target, target_type
-                )
-
-                # Check if prediction exists and update it, or create new one
-                prediction = (
-                    db.query(StancePrediction)
-                    .filter_by(
-                        article_id=article.id, target=target, target_type=target_type
-                    )
-                    .first()
-                )
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        db.close()
+        read_db.close()
+        if cache is not None:
+            cache.close()
+
+
+def predict_with_local_model(
+    targets: List[Target],
+    model_path: Path,
+    batch_size: int,
+    limit: Optional[int],
+    sample: Optional[float],
+    force: bool,
+    seed: Optional[int] = None,
+):
+    """Score pending articles with the local classifier, streaming them."""
+    db = next(get_db())
+    read_db = next(get_db())
+    try:
+        classifier = LocalStanceClassifier.load(model_path)
+        articles = iter_pending_articles(
+            read_db,
+            targets,
+            force,
+            limit=limit,
+            sample=sample,
+            page_size=batch_size,
+            seed=seed,
+        )
+        scored = predict_local(db, articles, targets, classifier, batch_size)
+        rprint(f"[bold green]Scored {scored} articles locally![/bold green]")
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        db.close()
+        read_db.close()
+
+
+def print_agreement(report: Dict[Target, Dict[str, float]], title: str):
+    table = Table(title=title)
+    table.add_column("Target")
+    table.add_column("Articles", justify="right")
+    table.add_column("Accuracy", justify="right")
+    table.add_column("Cohen's kappa", justify="right")
+    table.add_column("Macro F1", justify="right")
+    for (target, target_type), scores in report.items():
+        table.add_row(
+            f"{target} ({target_type})",
+            str(scores["articles"]),
+            f"{scores['accuracy']:.1%}",
+            f"{scores['kappa']:.2f}",
+            f"{scores['macro_f1']:.2f}",
+        )
+    rprint(table)
 
-                if prediction and force:
-                    prediction.stance = stance
-                    prediction.justification = justification
-                    prediction.created_at = datetime.utcnow()
-                else:
-                    prediction = StancePrediction(
-                        article_id=article.id,
-                        target=target,
-                        target_type=target_type,
-                        stance=stance,
-                        justification=justification,
-                    )
-                    db.add(prediction)
 
-                # Commit every batch_size articles
-                if articles.index(article) % batch_size == 0:
-                    db.commit()
-                    rprint(
-                        f"[green]Processed {articles.index(article)} articles[/green]"
-                    )
+@app.command()
+def train_local(
+    holdout: float = typer.Option(
+        0.2, "--holdout", help="Share of labels held out to measure agreement"
+    ),
+    min_examples: int = typer.Option(
+        20, "--min-examples", help="Skip targets with fewer LLM predictions"
+    ),
+    model_path: Path = typer.Option(
+        DEFAULT_MODEL_PATH, "--model-path", help="Where to save the model"
+    ),
+):
+    """Train the local classifier on the LLM predictions in the database."""
+    db = next(get_db())
+    try:
+        classifier, report = train_local_classifier(
+            db, holdout=holdout, min_examples=min_examples
+        )
+        if not classifier.targets:
+            rprint("[yellow]Not enough LLM predictions to train on[/yellow]")
+            raise typer.Exit(1)
+        classifier.save(model_path)
+        rprint(
+            f"[green]Saved models for {len(classifier.targets)} targets to "
+            f"{model_path}[/green]"
+        )
+        if report:
+            print_agreement(report, "Agreement with the LLM on held-out articles")
+    finally:
+        db.close()
 
-            except Exception as e:
-                rprint(f"[red]Error processing article {article.id}: {e}[/red]")
-                db.rollback()
-                continue
 
-        # Final commit
-        db.commit()
-        rprint("[bold green]Successfully processed all articles![/bold green]")
+@app.command("agreement")
+def agreement_report(
+    model_path: Path = typer.Option(
+        DEFAULT_MODEL_PATH, "--model-path", help="Trained local model"
+    ),
+):
+    """Compare the local classifier with every LLM prediction of its targets.
 
+    Includes the articles it was trained on; ``train-local`` reports the
+    agreement on held-out articles.
+    """
+    db = next(get_db())
+    try:
+        classifier = LocalStanceClassifier.load(model_path)
+        report = evaluate_local_classifier(db, classifier)
+        print_agreement(report, "Agreement with the LLM predictions")
     except Exception as e:
         rprint(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
@@ -257,5 +632,222 @@ def list_predictions(
         db.close()
 
 
+@app.command()
+def refresh_aggregates(
+    full: bool = typer.Option(
+        False, "--full", help="Rebuild every cell instead of the changed ones"
+    ),
+):
+    """Update the per-blogger, per-target, per-month stance counts."""
+    db = next(get_db())
+    try:
+        started = time.monotonic()
+        cells = aggregates.refresh_aggregates(db, full=full)
+        rprint(
+            f"[green]Recomputed {cells} aggregate cells in "
+            f"{time.monotonic() - started:.1f}s[/green]"
+        )
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        db.close()
+
+
+@app.command()
+def export_aggregates(
+    output: Path = typer.Argument(..., help="CSV, or Parquet for a .parquet name"),
+    target: Optional[str] = typer.Option(
+        None, "--target", "-t", help="Filter by target"
+    ),
+    target_type: Optional[str] = typer.Option(
+        None, "--type", "-y", help="Filter by target type"
+    ),
+    since: Optional[datetime] = typer.Option(
+        None, "--since", formats=["%Y-%m"], help="First month (YYYY-MM)"
+    ),
+):
+    """Export the stance distributions (run refresh-aggregates first)."""
+    db = next(get_db())
+    try:
+        frame = aggregates.load_aggregates(
+            db, target, target_type, since.date() if since else None
+        )
+    finally:
+        db.close()
+
+    if output.suffix == ".parquet":
+        frame.to_parquet(output, index=False)
+    else:
+        frame.to_csv(output, index=False)
+    rprint(f"[green]Exported {len(frame)} rows to {output}[/green]")
+
+
+def make_batch_backend(name: str, job: BatchJob):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown batch backend {name}, expected one of {BACKENDS}")
+    if name == "local":
+        return LocalBatchBackend(job.path / "local-backend", openai_completion())
+    return OpenAIBatchBackend()
+
+
+@batch_app.command("export")
+def batch_export(
+    job_dir: Path = typer.Argument(..., help="Directory holding the job's files"),
+    targets: Optional[List[str]] = typer.Option(
+        None, "--target", "-t", help="Target club, repeat for several clubs"
+    ),
+    target_type: str = typer.Option(
+        "club", "--type", "-y", help="Type of target (club or referee)"
+    ),
+    referee: bool = typer.Option(
+        False, "--referee", "-r", help="Also score refereeing"
+    ),
+    shard_size: int = typer.Option(
+        DEFAULT_SHARD_SIZE, "--shard-size", help="Requests per batch file"
+    ),
+    max_article_tokens: int = typer.Option(
+        3000,
+        "--max-article-tokens",
+        help=(
+            "Cut longer articles to their most relevant paragraphs "
+            "(0 sends articles whole)"
+        ),
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        "-f",
+        help="Export articles that already have predictions as well",
+    ),
+):
+    """Export pending articles as JSONL batch request files."""
+    try:
+        prediction_targets = resolve_targets(targets, target_type, referee)
+    except ValueError as e:
+        rprint(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    db = next(get_db())
+    try:
+        export_batch_job(
+            db,
+            job_dir,
+            prediction_targets,
+            pending_articles_query(prediction_targets, force),
+            shard_size=shard_size,
+            budget=TokenBudget(max_article_tokens) if max_article_tokens else None,
+        )
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        db.close()
+
+
+@batch_app.command("submit")
+def batch_submit(
+    job_dir: Path = typer.Argument(..., help="Directory holding the job's files"),
+    backend: str = typer.Option(
+        "openai", "--backend", help=f"Batch backend ({', '.join(BACKENDS)})"
+    ),
+):
+    """Submit the exported request files to a batch backend."""
+    try:
+        job = BatchJob.load(job_dir)
+        submit_batch_job(job, make_batch_backend(backend, job), backend)
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@batch_app.command("ingest")
+def batch_ingest(
+    job_dir: Path = typer.Argument(..., help="Directory holding the job's files"),
+    wait: bool = typer.Option(
+        True, "--wait/--no-wait", help="Keep polling until every batch has finished"
+    ),
+    poll_interval: float = typer.Option(
+        60.0, "--poll-interval", help="Seconds between status checks"
+    ),
+    batch_size: int = typer.Option(
+        1000, "--batch-size", "-b", help="Number of predictions saved per transaction"
+    ),
+):
+    """Poll the submitted batches and store their predictions."""
+    try:
+        job = BatchJob.load(job_dir)
+        if job.backend is None:
+            raise ValueError("Job has not been submitted yet")
+        backend = make_batch_backend(job.backend, job)
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    db = next(get_db())
+    try:
+        ingested = failed = 0
+        while True:
+            done = poll_batch_job(job, backend)
+            new_ingested, new_failed = ingest_batch_job(db, job, backend, batch_size)
+            ingested += new_ingested
+            failed += new_failed
+            if done or not wait:
+                break
+            time.sleep(poll_interval)
+
+        rprint(
+            f"[bold green]Ingested {ingested} articles, {failed} failed[/bold green]"
+        )
+        if not done:
+            rprint("[yellow]Batches are still running; run ingest again later[/yellow]")
+        failed_shards = [shard.name for shard in job.shards if shard.status == "failed"]
+        if failed_shards:
+            rprint(
+                f"[yellow]Batches of {', '.join(failed_shards)} failed; run submit "
+                "again to resubmit them[/yellow]"
+            )
+        elif failed and done:
+            rprint(
+                "[yellow]Run export again to write the failed requests into new "
+                "shards[/yellow]"
+            )
+    except Exception as e:
+        rprint(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        db.close()
+
+
+@app.command()
+def cache_stats(
+    cache_path: Path = typer.Option(
+        DEFAULT_CACHE_PATH, "--cache-path", help="SQLite file of the response cache"
+    ),
+):
+    """Show hit/miss statistics of the LLM response cache."""
+    if not cache_path.exists():
+        rprint(f"[yellow]No response cache at {cache_path}[/yellow]")
+        return
+
+    cache = ResponseCache(cache_path)
+    try:
+        stats = cache.stats()
+    finally:
+        cache.close()
+
+    lookups = stats["hits"] + stats["misses"]
+    table = Table(title=f"Response cache ({cache_path})")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("Entries", str(stats["entries"]))
+    table.add_row("Size", f"{stats['bytes'] / (1 << 20):.1f} MB")
+    table.add_row("Hits", str(stats["hits"]))
+    table.add_row("Misses", str(stats["misses"]))
+    table.add_row("Hit rate", f"{stats['hits'] / lookups:.1%}" if lookups else "-")
+    table.add_row("Evictions", str(stats["evictions"]))
+    rprint(table)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,25 @@
+"""Greek text normalization shared by the stance classifiers."""
+
+import unicodedata
+from typing import Dict
+
+
+def _accent_table() -> Dict[int, str]:
+    table = {}
+    for codepoint in [*range(0x370, 0x400), *range(0x1F00, 0x2000)]:
+        char = chr(codepoint)
+        decomposed = unicodedata.normalize("NFD", char)
+        base = "".join(c for c in decomposed if not unicodedata.combining(c))
+        if base != char:
+            table[codepoint] = base
+    return table
+
+
+# Greek letters with tonos/dialytika (and polytonic forms) to the bare letter;
+# much faster than decomposing every character of a text
+_ACCENTS = _accent_table()
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip Greek accents, e.g. ``"Ολυμπιακός"`` to ``"ολυμπιακος"``."""
+    return text.lower().translate(_ACCENTS)
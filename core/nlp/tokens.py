@@ -0,0 +1,194 @@
+"""Token counting and per-article token budgets for stance prompts.
+
+``count_tokens`` uses tiktoken's encoding for the model when the optional
+``tiktoken`` package is installed (``pip install greek-news-nlp[tokens]``),
+and otherwise a conservative characters-per-token estimate for Greek text.
+
+``TokenBudget`` fits an article into ``max_tokens`` before it is put in a
+prompt. Articles within the budget are sent verbatim; longer ones are
+handled by one of two strategies:
+
+- ``select``: keep the lead paragraph, then the paragraphs that mention the
+  targets most (any alias, see ``core.nlp.prefilter``), then the rest in
+  order while they fit, all in their original order
+- ``chunk``: split the article into consecutive chunks of at most
+  ``max_tokens``, classify the chunks that mention a target separately and
+  combine their stances with ``aggregate_stances``
+
+Every prepared article is recorded in the budget's ``BudgetStats``.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from core.nlp.prefilter import mentions_pattern
+from core.nlp.prompts import MODEL, NEUTRAL, Target
+from core.nlp.text import fold
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+# Rough Greek-text ratio used when tiktoken is not installed; errs towards
+# overestimating, so budgets stay within the real limit
+CHARS_PER_TOKEN = 3
+
+STRATEGIES = ("select", "chunk")
+
+_PARAGRAPH_BREAK = re.compile(r"\s*\n\s*")
+# Greek uses ";" as its question mark
+_SENTENCE_END = re.compile(r"(?<=[.;!?·])\s+")
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model(MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("o200k_base")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    if tiktoken is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(_get_encoding().encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of ``text`` within ``max_tokens``."""
+    if tiktoken is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    encoding = _get_encoding()
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+def aggregate_stances(results: List[Tuple[str, str]]) -> Tuple[str, str]:
+    """Combine the ``(stance, justification)`` of an article's chunks.
+
+    Chunks that take no stance do not dilute the ones that do: the most
+    common non-neutral stance wins (the earliest on a tie) with the
+    justification of its first chunk.
+    """
+    stances = Counter(stance for stance, _ in results if stance != NEUTRAL)
+    if not stances:
+        return results[0]
+    best = max(stances, key=lambda stance: stances[stance])
+    return next(result for result in results if result[0] == best)
+
+
+@dataclass
+class BudgetStats:
+    articles: int = 0
+    article_tokens: int = 0
+    sent_tokens: int = 0
+    truncated: int = 0
+    chunked: int = 0
+    chunks: int = 0
+    largest: int = 0
+
+    def record(self, article_tokens: int, sent: List[int]):
+        self.articles += 1
+        self.article_tokens += article_tokens
+        self.sent_tokens += sum(sent)
+        self.largest = max(self.largest, article_tokens)
+        if len(sent) > 1:
+            self.chunked += 1
+            self.chunks += len(sent)
+        elif sent[0] < article_tokens:
+            self.truncated += 1
+
+    def summary(self) -> str:
+        saved = self.article_tokens - self.sent_tokens
+        return (
+            f"Article tokens: {self.article_tokens} in {self.articles} articles "
+            f"(largest {self.largest}), {self.sent_tokens} sent ({saved} "
+            f"saved); {self.truncated} truncated, {self.chunked} chunked "
+            f"into {self.chunks} chunks"
+        )
+
+
+class TokenBudget:
+    """Fit article text into a token budget before prompting.
+
+    Args:
+        max_tokens: Largest article text sent in one request
+        strategy: ``select`` or ``chunk`` for articles over the budget
+    """
+
+    def __init__(self, max_tokens: int = 3000, strategy: str = "select"):
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy {strategy}, expected one of {STRATEGIES}"
+            )
+        self.max_tokens = max_tokens
+        self.strategy = strategy
+        self.stats = BudgetStats()
+
+    def _units(self, text: str) -> List[Tuple[str, int]]:
+        """Paragraphs with their token counts, none over the budget."""
+        units = []
+        for paragraph in _PARAGRAPH_BREAK.split(text.strip()):
+            if not paragraph:
+                continue
+            tokens = count_tokens(paragraph)
+            if tokens <= self.max_tokens:
+                units.append((paragraph, tokens))
+                continue
+            for sentence in _SENTENCE_END.split(paragraph):
+                tokens = count_tokens(sentence)
+                if tokens > self.max_tokens:
+                    sentence = truncate_tokens(sentence, self.max_tokens)
+                    tokens = count_tokens(sentence)
+                units.append((sentence, tokens))
+        return units
+
+    def select(self, text: str, targets: List[Target]) -> str:
+        """The lead and the most target-relevant paragraphs within the budget."""
+        units = self._units(text)
+        if not units:
+            return text
+        mentions = mentions_pattern(targets)
+        scores = [len(mentions.findall(fold(unit))) for unit, _ in units]
+        keep = {0}
+        remaining = self.max_tokens - units[0][1]
+        # Relevant paragraphs first, then the others in order
+        for i in sorted(range(1, len(units)), key=lambda i: (-scores[i], i)):
+            if units[i][1] <= remaining:
+                keep.add(i)
+                remaining -= units[i][1]
+        return "\n".join(units[i][0] for i in sorted(keep))
+
+    def chunk(self, text: str, targets: List[Target]) -> List[str]:
+        """Consecutive chunks within the budget that mention a target."""
+        chunks: List[List[str]] = [[]]
+        size = 0
+        for unit, tokens in self._units(text):
+            if chunks[-1] and size + tokens > self.max_tokens:
+                chunks.append([])
+                size = 0
+            chunks[-1].append(unit)
+            size += tokens
+        texts = ["\n".join(chunk) for chunk in chunks]
+
+        mentions = mentions_pattern(targets)
+        relevant = [text for text in texts if mentions.search(fold(text))]
+        return relevant or texts[:1]
+
+    def prepare(self, text: str, targets: List[Target]) -> List[str]:
+        """The text(s) to classify for an article, recorded in ``stats``."""
+        article_tokens = count_tokens(text)
+        if article_tokens <= self.max_tokens:
+            texts = [text]
+        elif self.strategy == "chunk":
+            texts = self.chunk(text, targets)
+        else:
+            texts = [self.select(text, targets)]
+        self.stats.record(article_tokens, [count_tokens(text) for text in texts])
+        return texts
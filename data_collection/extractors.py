@@ -0,0 +1,256 @@
+"""HTML field extraction for Gazzetta pages.
+
+The extractors are plain module-level functions that take raw HTML and return
+only the extracted fields, so they can run either inline or in a worker
+process of a ``ParsePool`` without shipping parse trees across processes.
+
+Three parser backends share the same CSS selectors:
+
+- ``html.parser``: BeautifulSoup with the pure-Python parser
+- ``lxml``: BeautifulSoup with the lxml tree builder
+- ``selectolax``: the lexbor engine via selectolax, the fastest option
+
+The ``scrape`` and ``retry-failed`` commands default to ``selectolax``; the
+functions here and ``ParsePool`` default to ``html.parser``, which needs no
+optional dependency.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from rich import print as rprint
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - optional dependency
+    LexborHTMLParser = None
+
+PARSERS = ("html.parser", "lxml", "selectolax")
+
+ARTICLE_CONTENT_SELECTOR = "div.content.is-relative"
+ARTICLE_LEAD_SELECTOR = "div.content__lead"
+AD_SELECTOR = ".admanager-content"
+PROMO_ARTICLE_SELECTOR = "article.list-article-promo"
+FLEX_ARTICLE_SELECTOR = "article.is-flex"
+FLEX_LINK_SELECTOR = ".list-article__info h3 a"
+FLEX_DATE_SELECTOR = "time.is-category-light"
+FLEX_CATEGORY_SELECTOR = ".is-category.whubcategory, .is-category.whubteam"
+BLOGGER_SELECTOR = "div.bloggers .list-article__blogger"
+
+T = TypeVar("T")
+
+
+def _selectolax_tree(html: str):
+    if LexborHTMLParser is None:
+        raise RuntimeError(
+            "The selectolax parser requires the 'selectolax' package to be installed"
+        )
+    return LexborHTMLParser(html)
+
+
+def extract_article_content(html: str, parser: str = "html.parser") -> str:
+    """Extract the lead and body paragraphs of an article page."""
+    if parser == "selectolax":
+        tree = _selectolax_tree(html)
+        content_div = tree.css_first(ARTICLE_CONTENT_SELECTOR)
+        if content_div is None:
+            return ""
+
+        content_parts = []
+        lead = tree.css_first(ARTICLE_LEAD_SELECTOR)
+        if lead is not None:
+            content_parts.append(lead.text(strip=True))
+
+        for p in content_div.css("p, blockquote"):
+            if p.css_first(AD_SELECTOR) is not None:
+                continue
+            text = p.text(strip=True)
+            if text:
+                content_parts.append(text)
+
+        return "\n\n".join(content_parts)
+
+    soup = BeautifulSoup(html, parser)
+
+    content_div = soup.select_one(ARTICLE_CONTENT_SELECTOR)
+    if not content_div:
+        return ""
+
+    content_parts = []
+
+    lead = soup.select_one(ARTICLE_LEAD_SELECTOR)
+    if lead:
+        content_parts.append(lead.get_text(strip=True))
+
+    for p in content_div.find_all(["p", "blockquote"]):
+        if p.select_one(AD_SELECTOR):
+            continue
+
+        text = p.get_text(strip=True)
+        if text:
+            content_parts.append(text)
+
+    return "\n\n".join(content_parts)
+
+
+def extract_article_list(
+    html: str, base_url: str, parser: str = "html.parser"
+) -> List[Dict]:
+    """Extract article links, titles, dates and categories of a profile page."""
+    articles = []
+
+    if parser == "selectolax":
+        tree = _selectolax_tree(html)
+        elements = tree.css(PROMO_ARTICLE_SELECTOR) + tree.css(FLEX_ARTICLE_SELECTOR)
+        for element in elements:
+            try:
+                classes = (element.attributes.get("class") or "").split()
+                if "list-article-promo" in classes:
+                    link = element.css_first("h2 a")
+                    date = element.css_first("time").text().strip()
+                    cat_elem = element.css_first("a.is-category")
+                    categories = [cat_elem.text().strip()] if cat_elem else []
+                else:
+                    link = element.css_first(FLEX_LINK_SELECTOR)
+                    date = element.css_first(FLEX_DATE_SELECTOR).text().strip()
+                    categories = [
+                        cat.text().strip()
+                        for cat in element.css(FLEX_CATEGORY_SELECTOR)
+                    ]
+
+                href = link.attributes["href"]
+                if href is None:
+                    raise KeyError("href")
+                articles.append(
+                    {
+                        "categories": categories,
+                        "date": date,
+                        "title": link.text().strip(),
+                        "article_url": urljoin(base_url, href),
+                    }
+                )
+            except (AttributeError, KeyError) as e:
+                rprint(f"[red]Error parsing article: {e}[/red]")
+
+        return articles
+
+    soup = BeautifulSoup(html, parser)
+    elements = soup.select(PROMO_ARTICLE_SELECTOR) + soup.select(FLEX_ARTICLE_SELECTOR)
+    for element in elements:
+        try:
+            if "list-article-promo" in element.get("class", []):
+                link = element.select_one("h2 a")
+                date = element.select_one("time").text.strip()
+                cat_elem = element.select_one("a.is-category")
+                categories = [cat_elem.text.strip()] if cat_elem else []
+            else:
+                link = element.select_one(FLEX_LINK_SELECTOR)
+                date = element.select_one(FLEX_DATE_SELECTOR).text.strip()
+                categories = [
+                    cat.text.strip() for cat in element.select(FLEX_CATEGORY_SELECTOR)
+                ]
+
+            articles.append(
+                {
+                    "categories": categories,
+                    "date": date,
+                    "title": link.text.strip(),
+                    "article_url": urljoin(base_url, link["href"]),
+                }
+            )
+        except (AttributeError, KeyError, TypeError) as e:
+            rprint(f"[red]Error parsing article: {e}[/red]")
+
+    return articles
+
+
+def extract_bloggers(
+    html: str, base_url: str, parser: str = "html.parser"
+) -> List[Dict]:
+    """Extract blogger names and profile URLs from a bloggers listing page."""
+    bloggers = []
+
+    if parser == "selectolax":
+        for element in _selectolax_tree(html).css(BLOGGER_SELECTOR):
+            try:
+                href = element.css_first("a").attributes["href"]
+                if href is None:
+                    raise KeyError("href")
+                bloggers.append(
+                    {
+                        "name": element.css_first("h3").text().strip(),
+                        "profile_url": urljoin(base_url, href),
+                    }
+                )
+            except (AttributeError, KeyError) as e:
+                rprint(f"[red]Error parsing blogger: {e}[/red]")
+        return bloggers
+
+    soup = BeautifulSoup(html, parser)
+    for element in soup.select(BLOGGER_SELECTOR):
+        try:
+            bloggers.append(
+                {
+                    "name": element.select_one("h3").text.strip(),
+                    "profile_url": urljoin(base_url, element.select_one("a")["href"]),
+                }
+            )
+        except (AttributeError, KeyError, TypeError) as e:
+            rprint(f"[red]Error parsing blogger: {e}[/red]")
+
+    return bloggers
+
+
+class ParsePool:
+    """Run extractors off the event loop.
+
+    With ``workers > 0`` extraction runs in a process pool, so CPU-bound
+    parsing neither blocks in-flight requests nor is limited to one core.
+    With ``workers == 0`` extractors run inline, which is what tests and
+    small crawls want.
+
+    Args:
+        workers: Number of worker processes (``0`` parses inline)
+        parser: Parser backend, one of ``PARSERS``
+    """
+
+    def __init__(self, workers: int = 0, parser: str = "html.parser"):
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r}; choose from {PARSERS}")
+        if parser == "selectolax" and LexborHTMLParser is None:
+            raise ValueError("The selectolax parser requires 'selectolax' installed")
+
+        self.parser = parser
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        if workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._executor is None:
+            return func(*args, parser=self.parser)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, parser=self.parser)
+        )
+
+    async def article_content(self, html: str) -> str:
+        return await self._run(extract_article_content, html)
+
+    async def article_list(self, html: str, base_url: str) -> List[Dict]:
+        return await self._run(extract_article_list, html, base_url)
+
+    async def bloggers(self, html: str, base_url: str) -> List[Dict]:
+        return await self._run(extract_bloggers, html, base_url)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
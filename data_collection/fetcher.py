@@ -0,0 +1,252 @@
+"""Resilient HTTP fetch layer for the scrapers.
+
+``ResilientFetcher`` wraps an ``aiohttp`` session with:
+
+- exponential backoff with full jitter on 429/5xx responses, timeouts and
+  connection errors (honouring ``Retry-After`` when the server sends it)
+- a per-host ``CircuitBreaker`` that fails fast while a host keeps failing
+- the per-host concurrency/rate limits of ``HostLimiter``
+- streamed body reads that give up once ``max_body_bytes`` is exceeded
+
+Fetches that still fail raise ``FetchError`` so callers can park the URL in
+the dead-letter queue instead of saving an empty result.
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from rich import print as rprint
+
+from data_collection.scheduler import HostLimiter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses that retrying the page later will not change.
+PERMANENT_STATUSES = frozenset({404, 410})
+
+
+@dataclass
+class Page:
+    """Result of fetching a page."""
+
+    status: int
+    html: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    retry_after: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class FetchError(Exception):
+    """A fetch failed after exhausting its retries."""
+
+    def __init__(self, url: str, reason: str, status: Optional[int] = None):
+        super().__init__(f"{reason} ({url})")
+        self.url = url
+        self.reason = reason
+        self.status = status
+
+
+class CircuitOpenError(FetchError):
+    """The circuit breaker for the URL's host is open."""
+
+
+class ResponseTooLargeError(FetchError):
+    """The response body exceeded the configured size limit."""
+
+
+async def read_text(
+    response: aiohttp.ClientResponse, max_bytes: int, chunk_size: int = 64 * 1024
+) -> str:
+    """Stream and decode a response body, refusing bodies over ``max_bytes``.
+
+    Raises:
+        ResponseTooLargeError: The declared or received body exceeds ``max_bytes``
+    """
+    url = str(response.url)
+    if response.content_length is not None and response.content_length > max_bytes:
+        raise ResponseTooLargeError(
+            url, f"body of {response.content_length} bytes exceeds {max_bytes}"
+        )
+
+    chunks = []
+    received = 0
+    async for chunk in response.content.iter_chunked(chunk_size):
+        received += len(chunk)
+        if received > max_bytes:
+            raise ResponseTooLargeError(url, f"body exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+
+    return b"".join(chunks).decode(response.get_encoding(), errors="replace")
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    retry_statuses: FrozenSet[int] = RETRY_STATUSES
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Backoff before retry number ``attempt`` (1-based), with full jitter."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+@dataclass
+class CircuitBreaker:
+    """Open after ``failure_threshold`` consecutive failures of a host.
+
+    While open, requests fail immediately. After ``reset_timeout`` seconds
+    a single trial request is let through (half-open); its outcome closes
+    or re-opens the circuit.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    failures: int = 0
+    opened_at: Optional[float] = None
+    _trial_in_flight: bool = field(default=False, repr=False)
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def release_trial(self):
+        """Let another trial through after one ended without an outcome."""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class ResilientFetcher:
+    """Fetch pages with retries, per-host circuit breakers and rate limits.
+
+    Args:
+        limiter: Per-host concurrency and rate limiter
+        retry_policy: Backoff configuration
+        failure_threshold: Consecutive failures that open a host's circuit
+        reset_timeout: Seconds before an open circuit lets a trial through
+        max_body_bytes: Largest response body accepted
+    """
+
+    def __init__(
+        self,
+        limiter: HostLimiter,
+        retry_policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_body_bytes: int = 5 * 1024 * 1024,
+    ):
+        self.limiter = limiter
+        self.max_body_bytes = max_body_bytes
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlparse(url).netloc
+        if host not in self.breakers:
+            self.breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout
+            )
+        return self.breakers[host]
+
+    async def _request(
+        self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str]
+    ) -> Page:
+        async with self.limiter.acquire(url):
+            async with session.get(url, headers=headers) as response:
+                if response.status != 200:
+                    return Page(
+                        response.status,
+                        retry_after=response.headers.get("Retry-After"),
+                    )
+                return Page(
+                    response.status,
+                    await read_text(response, self.max_body_bytes),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+
+    async def fetch(
+        self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str]
+    ) -> Page:
+        """Fetch ``url``; non-retryable statuses (404, 304, ...) are returned.
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            FetchError: Retries were exhausted
+        """
+        breaker = self.breaker(url)
+        policy = self.retry_policy
+
+        for attempt in range(1, policy.max_attempts + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(url, "circuit open")
+
+            try:
+                page = await self._request(session, url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                reason, status, retry_after = f"{type(e).__name__}: {e}", None, None
+            except asyncio.CancelledError:
+                breaker.release_trial()
+                raise
+            except Exception:
+                # Oversized bodies, unknown charsets, ...: not worth retrying,
+                # but the host still failed (and a half-open trial is over).
+                breaker.record_failure()
+                raise
+            else:
+                if page.status not in policy.retry_statuses:
+                    breaker.record_success()
+                    return page
+                reason, status = f"HTTP {page.status}", page.status
+                retry_after = page.retry_after
+
+            breaker.record_failure()
+            if attempt == policy.max_attempts:
+                raise FetchError(url, reason, status)
+
+            delay = policy.delay(attempt, retry_after)
+            self.retries += 1
+            rprint(
+                f"[yellow]Retrying {url} in {delay:.1f}s "
+                f"(attempt {attempt}/{policy.max_attempts}): {reason}[/yellow]"
+            )
+            await asyncio.sleep(delay)
+
+        raise FetchError(url, "no attempts made")
@@ -0,0 +1,79 @@
+"""Shared aiohttp client factory for the scrapers.
+
+``create_session`` builds a ``ClientSession`` with a tuned connector (pool
+sizes, keep-alive, DNS cache), total/connect/read timeouts and default
+headers, so individual requests only pass per-request headers.
+"""
+
+import importlib.util
+from dataclasses import dataclass
+
+import aiohttp
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# aiohttp only decodes brotli bodies when one of these packages is installed
+BROTLI_AVAILABLE = any(
+    importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")
+)
+
+
+@dataclass
+class HttpClientSettings:
+    """Connection pool, timeout and body size settings of the HTTP client.
+
+    Attributes:
+        connections: Total connection pool size (``0`` for unlimited)
+        connections_per_host: Connection pool size per host
+        keepalive_timeout: Seconds an idle keep-alive connection is kept
+        dns_cache_ttl: Seconds resolved DNS entries are cached
+        total_timeout: Seconds allowed for a whole request
+        connect_timeout: Seconds allowed to get a connection from the pool and
+            establish it
+        read_timeout: Seconds allowed between two reads of the body
+        max_body_bytes: Largest response body accepted
+        user_agent: ``User-Agent`` header sent with every request
+    """
+
+    connections: int = 100
+    connections_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+    total_timeout: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    max_body_bytes: int = 5 * 1024 * 1024
+    user_agent: str = DEFAULT_USER_AGENT
+
+    @property
+    def accept_encoding(self) -> str:
+        return "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+
+def create_session(settings: HttpClientSettings) -> aiohttp.ClientSession:
+    """Create a ``ClientSession`` configured from ``settings``."""
+    connector = aiohttp.TCPConnector(
+        limit=settings.connections,
+        limit_per_host=settings.connections_per_host,
+        keepalive_timeout=settings.keepalive_timeout,
+        use_dns_cache=True,
+        ttl_dns_cache=settings.dns_cache_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=settings.total_timeout,
+        connect=settings.connect_timeout,
+        sock_read=settings.read_timeout,
+    )
+    headers = {
+        "User-Agent": settings.user_agent,
+        "Accept": "text/html,application/xhtml+xml",
+        "Accept-Encoding": settings.accept_encoding,
+        "Accept-Language": "el-GR,el;q=0.9,en;q=0.5",
+    }
+    return aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers=headers, auto_decompress=True
+    )
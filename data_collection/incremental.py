@@ -0,0 +1,81 @@
+"""Persistent state for incremental scraping.
+
+``CrawlState`` keeps two things in ``crawl_state.json``:
+
+- a per-blogger high-water mark (newest article URL and date seen), used to
+  stop paginating a blogger's archive once known content is reached
+- HTTP validators (``ETag``/``Last-Modified``) per listing or profile page,
+  sent back as ``If-None-Match``/``If-Modified-Since`` so unchanged pages
+  come back as ``304 Not Modified``
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from data_collection.fetcher import Page
+
+STATE_FILE_NAME = "crawl_state.json"
+
+
+@dataclass
+class CrawlState:
+    path: Path
+    bloggers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    pages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, data_dir: Path) -> "CrawlState":
+        path = Path(data_dir) / STATE_FILE_NAME
+        if not path.exists():
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(path, data.get("bloggers", {}), data.get("pages", {}))
+
+    def save(self):
+        """Write the state atomically so a crash never leaves it truncated."""
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"bloggers": self.bloggers, "pages": self.pages},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        validators = self.pages.get(url, {})
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def remember_page(self, url: str, page: Page, **extracted: Any):
+        """Store the validators of a 200 response plus any extracted data."""
+        if not (page.etag or page.last_modified):
+            self.pages.pop(url, None)
+            return
+        self.pages[url] = {
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            **extracted,
+        }
+
+    def cached_extract(self, url: str, key: str) -> Optional[List[Dict]]:
+        return self.pages.get(url, {}).get(key)
+
+    def high_water_mark(self, blogger_name: str) -> Optional[str]:
+        return self.bloggers.get(blogger_name, {}).get("newest_url")
+
+    def set_high_water_mark(self, blogger_name: str, article: Dict):
+        self.bloggers[blogger_name] = {
+            "newest_url": article["article_url"],
+            "newest_date": article.get("date"),
+            "updated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
@@ -0,0 +1,174 @@
+"""Prioritized producer/consumer scheduler for the async scrapers.
+
+Listing pages, blogger profile pages and article pages are queued as
+``CrawlTask`` objects on a single priority queue that a pool of workers
+drains. Article pages run first so that discovered work is finished before
+more is discovered, which keeps the queue (and memory) small. Requests are
+throttled per host by ``HostLimiter`` instead of fixed sleeps.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from rich import print as rprint
+
+
+class TaskKind(IntEnum):
+    """Kind of crawl task; the value doubles as its priority (lower first)."""
+
+    ARTICLE = 0
+    PROFILE = 1
+    LISTING = 2
+
+
+@dataclass(order=True)
+class CrawlTask:
+    priority: int
+    sequence: int
+    kind: TaskKind = field(compare=False)
+    url: str = field(compare=False)
+    payload: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+
+class HostLimiter:
+    """Per-host concurrency cap and request rate limit.
+
+    Args:
+        max_concurrency: Maximum in-flight requests per host
+        requests_per_second: Maximum request starts per second per host
+            (``0`` disables rate limiting)
+    """
+
+    def __init__(self, max_concurrency: int = 10, requests_per_second: float = 10.0):
+        self.max_concurrency = max_concurrency
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def _wait_for_slot(self, host: str):
+        if not self.min_interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @asynccontextmanager
+    async def acquire(self, url: str) -> AsyncIterator[None]:
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_concurrency)
+        )
+        async with semaphore:
+            await self._wait_for_slot(host)
+            yield
+
+
+@dataclass
+class CrawlStats:
+    started_at: float = field(default_factory=time.monotonic)
+    articles: int = 0
+    completed: Dict[TaskKind, int] = field(
+        default_factory=lambda: {kind: 0 for kind in TaskKind}
+    )
+    failed: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def articles_per_second(self) -> float:
+        return self.articles / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.articles} articles in {self.elapsed:.1f}s "
+            f"({self.articles_per_second:.2f} articles/s), "
+            f"{self.completed[TaskKind.PROFILE]} profile pages, "
+            f"{self.completed[TaskKind.LISTING]} listing pages, "
+            f"{self.failed} failed tasks"
+        )
+
+
+TaskHandler = Callable[[CrawlTask], Awaitable[None]]
+
+
+class CrawlScheduler:
+    """Drain a priority queue of crawl tasks with a fixed pool of workers.
+
+    Handlers may call ``submit`` to enqueue follow-up tasks; ``run`` returns
+    once the queue is empty and no task is in flight.
+
+    Args:
+        workers: Number of concurrent worker coroutines
+        report_interval: Seconds between throughput reports (``0`` disables)
+    """
+
+    def __init__(self, workers: int = 10, report_interval: float = 30.0):
+        self.workers = workers
+        self.report_interval = report_interval
+        self.queue: asyncio.PriorityQueue[CrawlTask] = asyncio.PriorityQueue()
+        self.stats = CrawlStats()
+        self._sequence = itertools.count()
+
+    def submit(self, kind: TaskKind, url: str, **payload: Any):
+        self.queue.put_nowait(
+            CrawlTask(int(kind), next(self._sequence), kind, url, payload)
+        )
+
+    def record_article(self):
+        self.stats.articles += 1
+
+    async def _worker(self, handler: TaskHandler):
+        while True:
+            task = await self.queue.get()
+            try:
+                await handler(task)
+                self.stats.completed[task.kind] += 1
+            except Exception as e:
+                self.stats.failed += 1
+                rprint(
+                    f"[red]Error in {task.kind.name.lower()} task {task.url}: {e}[/red]"
+                )
+            finally:
+                self.queue.task_done()
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            rprint(
+                f"[blue]Throughput: {self.stats.summary()}, "
+                f"{self.queue.qsize()} queued[/blue]"
+            )
+
+    async def run(self, handler: TaskHandler) -> CrawlStats:
+        self.stats = CrawlStats()
+        workers = [
+            asyncio.create_task(self._worker(handler)) for _ in range(self.workers)
+        ]
+        reporter: Optional[asyncio.Task] = None
+        if self.report_interval:
+            reporter = asyncio.create_task(self._report())
+
+        try:
+            await self.queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            if reporter:
+                reporter.cancel()
+            await asyncio.gather(
+                *workers, *([reporter] if reporter else []), return_exceptions=True
+            )
+
+        return self.stats
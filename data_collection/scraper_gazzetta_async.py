@@ -2,16 +2,37 @@ import asyncio
 import json
 from pathlib import Path
 from typing import Dict, List, Optional, Set
-from urllib.parse import urljoin
 
 import aiofiles
 import aiohttp
-import pandas as pd
 import typer
-from bs4 import BeautifulSoup
 from rich import print as rprint
 from rich.table import Table
 
+from data_collection.extractors import PARSERS, ParsePool
+from data_collection.fetcher import (
+    PERMANENT_STATUSES,
+    FetchError,
+    Page,
+    ResilientFetcher,
+    RetryPolicy,
+)
+from data_collection.http_client import HttpClientSettings, create_session
+from data_collection.incremental import CrawlState
+from data_collection.scheduler import (
+    CrawlScheduler,
+    CrawlTask,
+    HostLimiter,
+    TaskKind,
+)
+from data_collection.sinks import SINKS, DatabaseArticleSink, FileArticleSink
+from data_collection.storage import (
+    LEGACY_ARTICLES_FILE_NAME,
+    DeadLetterQueue,
+    JsonlArticleStore,
+    convert_legacy_json,
+)
+
 app = typer.Typer()
 
 
@@ -21,32 +42,53 @@ class GazzettaBloggerScraper:
         target_bloggers=None,
         max_articles_per_blogger=None,
         output_dir="scraped_data",
+        fsync_every=50,
+        per_host_concurrency=10,
+        rate_limit=10.0,
+        parser="html.parser",
+        parse_workers=0,
+        incremental=False,
+        max_attempts=4,
+        failure_threshold=5,
+        max_body_bytes=5 * 1024 * 1024,
+        article_sink=None,
     ):
         self.base_url = "https://www.gazzetta.gr"
         self.bloggers_url = f"{self.base_url}/bloggers"
-        self.headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            )
-        }
         self.data_dir = Path(output_dir)
         self.data_dir.mkdir(exist_ok=True)
-        self.scraped_articles_file = self.data_dir / "scraped_articles.json"
-        self.scraped_urls = self._load_scraped_urls()
+        self.store: Optional[JsonlArticleStore] = None
+        if article_sink is None:
+            self.store = JsonlArticleStore(self.data_dir, fsync_every=fsync_every)
+            self._convert_legacy_articles()
+            article_sink = FileArticleSink(self.store)
+        self.article_sink = article_sink
         self.target_bloggers = target_bloggers
         self.max_articles = max_articles_per_blogger
         self.progress_file = self.data_dir / "scraping_progress.json"
         self.completed_bloggers = self._load_progress()
-        self.semaphore = asyncio.Semaphore(10)  # Limit concurrent requests
-
-    def _load_scraped_urls(self) -> Set[str]:
-        if self.scraped_articles_file.exists():
-            with open(self.scraped_articles_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return {article["article_url"] for article in data}
-        return set()
+        self.incremental = incremental
+        self.crawl_state = CrawlState.load(self.data_dir)
+        self.limiter = HostLimiter(per_host_concurrency, rate_limit)
+        self.fetcher = ResilientFetcher(
+            self.limiter,
+            RetryPolicy(max_attempts=max_attempts),
+            failure_threshold=failure_threshold,
+            max_body_bytes=max_body_bytes,
+        )
+        self.dead_letters = DeadLetterQueue(self.data_dir)
+        self.parse_pool = ParsePool(workers=parse_workers, parser=parser)
+        self.scheduler: Optional[CrawlScheduler] = None
+        self.bloggers: List[Dict] = []
+        self.blogger_state: Dict[str, Dict] = {}
+        self._progress_lock = asyncio.Lock()
+
+    def _convert_legacy_articles(self):
+        legacy_file = self.data_dir / LEGACY_ARTICLES_FILE_NAME
+        if legacy_file.exists() and not len(self.store):
+            rprint(f"[yellow]Converting legacy {legacy_file} to JSONL...[/yellow]")
+            converted = convert_legacy_json(legacy_file, self.store)
+            rprint(f"[green]Converted {converted} legacy articles[/green]")
 
     def _load_progress(self) -> Set[str]:
         if self.progress_file.exists():
@@ -55,246 +97,327 @@ class GazzettaBloggerScraper:
         return set()
 
     async def _save_progress(self, blogger_name: str):
-        self.completed_bloggers.add(blogger_name)
-        async with aiofiles.open(self.progress_file, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(list(self.completed_bloggers)))
-
-    async def _save_article(self, article: Dict, blogger_name: str):
-        articles = []
-        if self.scraped_articles_file.exists():
-            async with aiofiles.open(
-                self.scraped_articles_file, "r", encoding="utf-8"
-            ) as f:
-                content = await f.read()
-                articles = json.loads(content) if content else []
+        async with self._progress_lock:
+            self.completed_bloggers.add(blogger_name)
+            async with aiofiles.open(self.progress_file, "w", encoding="utf-8") as f:
+                await f.write(json.dumps(list(self.completed_bloggers)))
 
+    async def _save_article(
+        self, article: Dict, blogger_name: str, profile_url: str = ""
+    ):
         article["blogger_name"] = blogger_name
-        articles.append(article)
+        if profile_url:
+            article["blogger_url"] = profile_url
+        await self.article_sink.write(article)
 
-        async with aiofiles.open(
-            self.scraped_articles_file, "w", encoding="utf-8"
-        ) as f:
-            await f.write(json.dumps(articles, ensure_ascii=False, indent=2))
+    async def _fetch_page(
+        self, session: aiohttp.ClientSession, url: str, conditional: bool = False
+    ) -> Page:
+        headers = self.crawl_state.conditional_headers(url) if conditional else {}
 
-        self.scraped_urls.add(article["article_url"])
+        return await self.fetcher.fetch(session, url, headers)
 
-    async def _get_article_content(
-        self, session: aiohttp.ClientSession, article_url: str
-    ) -> str:
-        async with self.semaphore:
-            try:
-                async with session.get(article_url, headers=self.headers) as response:
-                    if response.status != 200:
-                        return ""
+    async def _fetch_html(
+        self, session: aiohttp.ClientSession, url: str
+    ) -> Optional[str]:
+        return (await self._fetch_page(session, url)).html
 
-                    html = await response.text()
-                    soup = BeautifulSoup(html, "html.parser")
-
-                    content_div = soup.select_one("div.content.is-relative")
-                    if not content_div:
-                        return ""
+    async def get_bloggers(
+        self, session: aiohttp.ClientSession, page: int = 0
+    ) -> List[Dict]:
+        """Fetch a single page of the bloggers listing."""
+        try:
+            html = await self._fetch_html(session, f"{self.bloggers_url}?page={page}")
+        except Exception as e:
+            rprint(f"[red]Error fetching bloggers page: {e}[/red]")
+            return []
 
-                    content_parts = []
+        return await self.parse_pool.bloggers(html, self.base_url) if html else []
 
-                    lead = soup.select_one("div.content__lead")
-                    if lead:
-                        content_parts.append(lead.get_text(strip=True))
+    def _track(self, blogger_name: str, delta: int):
+        self.blogger_state[blogger_name]["pending"] += delta
 
-                    for p in content_div.find_all(["p", "blockquote"]):
-                        if p.select_one(".admanager-content"):
-                            continue
+    async def handle_task(self, session: aiohttp.ClientSession, task: CrawlTask):
+        """Scheduler entry point: dispatch a task and track blogger completion."""
+        blogger_name = task.payload.get("blogger_name")
+        try:
+            if task.kind == TaskKind.LISTING:
+                await self._handle_listing_page(session, task)
+            elif task.kind == TaskKind.PROFILE:
+                await self._handle_profile_page(session, task)
+            else:
+                await self._handle_article_page(session, task)
+        except Exception as e:
+            self._dead_letter(task, e)
+            raise
+        finally:
+            if blogger_name:
+                self._track(blogger_name, -1)
+                if self.blogger_state[blogger_name]["pending"] == 0:
+                    await self._complete_blogger(blogger_name)
+
+    def _dead_letter(self, task: CrawlTask, error: Exception):
+        payload = {k: v for k, v in task.payload.items() if k != "attempts"}
+        self.dead_letters.add(
+            task.kind.name.lower(),
+            task.url,
+            payload,
+            str(error),
+            attempts=task.payload.get("attempts", 0) + 1,
+            status=getattr(error, "status", None),
+        )
+        blogger_name = task.payload.get("blogger_name")
+        if blogger_name:
+            self.blogger_state[blogger_name]["failed"] += 1
+
+    async def _complete_blogger(self, blogger_name: str):
+        # Marks and validators are only committed once every article of the
+        # blogger has been saved, so an interrupted run never skips content.
+        state = self.blogger_state[blogger_name]
+        if state["failed"]:
+            rprint(
+                f"[yellow]{blogger_name}: {state['failed']} failed pages in the "
+                "dead-letter queue, not marking as completed[/yellow]"
+            )
+            return
+        if state.get("newest"):
+            self.crawl_state.set_high_water_mark(blogger_name, state["newest"])
+        for url, page in state.get("pages", {}).items():
+            self.crawl_state.remember_page(url, page)
+        await asyncio.to_thread(self.crawl_state.save)
+        await self._save_progress(blogger_name)
+
+    async def _handle_listing_page(
+        self, session: aiohttp.ClientSession, task: CrawlTask
+    ):
+        page = task.payload["page"]
+        result = await self._fetch_page(session, task.url, conditional=self.incremental)
+        if result.not_modified:
+            bloggers = self.crawl_state.cached_extract(task.url, "bloggers") or []
+        else:
+            bloggers = (
+                await self.parse_pool.bloggers(result.html, self.base_url)
+                if result.html
+                else []
+            )
+            if bloggers:
+                self.crawl_state.remember_page(task.url, result, bloggers=bloggers)
+        if not bloggers:
+            return
 
-                        text = p.get_text(strip=True)
-                        if text:
-                            content_parts.append(text)
+        rprint(f"[green]Found {len(bloggers)} bloggers on page {page}[/green]")
+        for blogger in bloggers:
+            name = blogger["name"]
+            if self.target_bloggers and name not in self.target_bloggers:
+                continue
+
+            if name in self.completed_bloggers and not self.incremental:
+                rprint(f"[yellow]Skipping {name} - already scraped[/yellow]")
+                continue
+
+            if name in self.blogger_state:
+                continue
+
+            self.blogger_state[name] = {"pending": 1, "submitted": 0, "failed": 0}
+            self.bloggers.append(blogger)
+            self.scheduler.submit(
+                TaskKind.PROFILE,
+                f"{blogger['profile_url']}?page=0",
+                blogger_name=name,
+                profile_url=blogger["profile_url"],
+                page=0,
+            )
 
-                    return "\n\n".join(content_parts)
+        self.scheduler.submit(
+            TaskKind.LISTING, f"{self.bloggers_url}?page={page + 1}", page=page + 1
+        )
 
-            except Exception as e:
-                rprint(
-                    f"[red]Error fetching article content from {article_url}: {e}[/red]"
-                )
-                return ""
+    async def _handle_profile_page(
+        self, session: aiohttp.ClientSession, task: CrawlTask
+    ):
+        blogger_name = task.payload["blogger_name"]
+        state = self.blogger_state[blogger_name]
+
+        result = await self._fetch_page(session, task.url, conditional=self.incremental)
+        if result.not_modified:
+            rprint(f"[yellow]{blogger_name}: {task.url} not modified[/yellow]")
+            return
+
+        listed = (
+            await self.parse_pool.article_list(result.html, self.base_url)
+            if result.html
+            else []
+        )
+        if not listed:
+            return
 
-    async def get_blogger_articles(
-        self, session: aiohttp.ClientSession, profile_url: str, blogger_name: str
-    ) -> List[Dict]:
-        articles = []
-        page = 0
+        state.setdefault("pages", {})[task.url] = Page(
+            result.status, etag=result.etag, last_modified=result.last_modified
+        )
+        if task.payload["page"] == 0:
+            state["newest"] = listed[0]
+
+        # In incremental mode stop paginating once the page reaches content
+        # we already have: the previous high-water mark or only known URLs.
+        known = await self.article_sink.known(a["article_url"] for a in listed)
+        high_water_mark = self.crawl_state.high_water_mark(blogger_name)
+        reached_known = self.incremental and (
+            all(a["article_url"] in known for a in listed)
+            or any(a["article_url"] == high_water_mark for a in listed)
+        )
 
-        while True:
-            if self.max_articles and len(articles) >= self.max_articles:
+        for article in listed:
+            if self.max_articles and state["submitted"] >= self.max_articles:
                 rprint(
                     "[yellow]Reached maximum articles limit "
                     f"({self.max_articles}) for {blogger_name}[/yellow]"
                 )
-                break
-
-            try:
-                url = f"{profile_url}?page={page}"
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status != 200:
-                        break
-
-                    html = await response.text()
-                    soup = BeautifulSoup(html, "html.parser")
-
-                    all_articles = []
-                    all_articles.extend(soup.select("article.list-article-promo"))
-                    all_articles.extend(soup.select("article.is-flex"))
-
-                    if not all_articles:
-                        break
-
-                    tasks = []
-                    for element in all_articles:
-                        try:
-                            if "list-article-promo" in element.get("class", []):
-                                article_link = element.select_one("h2 a")["href"]
-                                title = element.select_one("h2 a").text.strip()
-                                date = element.select_one("time").text.strip()
-                                categories = []
-                                cat_elem = element.select_one("a.is-category")
-                                if cat_elem:
-                                    categories.append(cat_elem.text.strip())
-                            else:
-                                article_link = element.select_one(
-                                    ".list-article__info h3 a"
-                                )["href"]
-                                title = element.select_one(
-                                    ".list-article__info h3 a"
-                                ).text.strip()
-                                date = element.select_one(
-                                    "time.is-category-light"
-                                ).text.strip()
-                                categories = [
-                                    cat.text.strip()
-                                    for cat in element.select(
-                                        ".is-category.whubcategory, "
-                                        ".is-category.whubteam"
-                                    )
-                                ]
-
-                            article_url = urljoin(self.base_url, article_link)
-
-                            if article_url in self.scraped_urls:
-                                continue
-
-                            tasks.append(
-                                {
-                                    "categories": categories,
-                                    "date": date,
-                                    "title": title,
-                                    "article_url": article_url,
-                                    "task": self._get_article_content(
-                                        session, article_url
-                                    ),
-                                }
-                            )
-
-                        except (AttributeError, KeyError) as e:
-                            rprint(f"[red]Error parsing article: {e}[/red]")
-
-                    # Fetch all article contents concurrently
-                    contents = await asyncio.gather(*(task["task"] for task in tasks))
-
-                    # Save articles
-                    for task, content in zip(tasks, contents):
-                        article = {
-                            "categories": task["categories"],
-                            "date": task["date"],
-                            "title": task["title"],
-                            "article_url": task["article_url"],
-                            "content": content,
-                        }
-                        await self._save_article(article, blogger_name)
-                        articles.append(article)
-                        rprint(f"[green]Scraped article: {task['title']}[/green]")
-
-                    page += 1
-                    await asyncio.sleep(0.5)  # Reduced delay
-
-            except Exception as e:
-                rprint(f"[red]Error fetching blogger articles page: {e}[/red]")
-                break
-
-        return articles
-
-    async def get_bloggers(
-        self, session: aiohttp.ClientSession, page: int = 0
-    ) -> List[Dict]:
-        try:
-            url = f"{self.bloggers_url}?page={page}"
-            async with session.get(url, headers=self.headers) as response:
-                if response.status != 200:
-                    return []
-
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-
-                blogger_elements = soup.select("div.bloggers .list-article__blogger")
-
-                if not blogger_elements:
-                    return []
-
-                bloggers = []
-                for element in blogger_elements:
-                    try:
-                        name = element.select_one("h3").text.strip()
-
-                        if self.target_bloggers and name not in self.target_bloggers:
-                            continue
-
-                        if name in self.completed_bloggers:
-                            rprint(
-                                f"[yellow]Skipping {name} - already scraped[/yellow]"
-                            )
-                            continue
+                return
+
+            if article["article_url"] in known:
+                continue
+
+            state["submitted"] += 1
+            self._track(blogger_name, 1)
+            self.scheduler.submit(
+                TaskKind.ARTICLE,
+                article["article_url"],
+                blogger_name=blogger_name,
+                profile_url=task.payload["profile_url"],
+                article=article,
+            )
 
-                        profile_url = element.select_one("a")["href"]
+        if reached_known:
+            rprint(f"[yellow]{blogger_name}: reached already scraped articles[/yellow]")
+            return
+
+        page = task.payload["page"] + 1
+        self._track(blogger_name, 1)
+        self.scheduler.submit(
+            TaskKind.PROFILE,
+            f"{task.payload['profile_url']}?page={page}",
+            blogger_name=blogger_name,
+            profile_url=task.payload["profile_url"],
+            page=page,
+        )
 
-                        blogger_articles = await self.get_blogger_articles(
-                            session, urljoin(self.base_url, profile_url), name
-                        )
+    async def _handle_article_page(
+        self, session: aiohttp.ClientSession, task: CrawlTask
+    ):
+        page = await self._fetch_page(session, task.url)
+        if page.html is None:
+            raise FetchError(task.url, f"HTTP {page.status}", page.status)
 
-                        bloggers.append(
-                            {
-                                "name": name,
-                                "profile_url": urljoin(self.base_url, profile_url),
-                                "articles": blogger_articles,
-                            }
-                        )
+        content = await self.parse_pool.article_content(page.html)
+        if not content:
+            raise FetchError(task.url, "empty article content", page.status)
 
-                        await self._save_progress(name)
+        article = {**task.payload["article"], "content": content}
+        await self._save_article(
+            article, task.payload["blogger_name"], task.payload.get("profile_url", "")
+        )
+        self.scheduler.record_article()
+        rprint(f"[green]Scraped article: {article['title']}[/green]")
 
-                    except (AttributeError, KeyError) as e:
-                        rprint(f"[red]Error parsing blogger: {e}[/red]")
-                        continue
+    async def crawl(
+        self, session: aiohttp.ClientSession, scheduler: CrawlScheduler
+    ) -> List[Dict]:
+        """Crawl all (target) bloggers through the scheduler.
+
+        Returns:
+            List[Dict]: The bloggers (``name``, ``profile_url``) visited
+        """
+        self.scheduler = scheduler
+        scheduler.submit(TaskKind.LISTING, f"{self.bloggers_url}?page=0", page=0)
+        stats = await scheduler.run(lambda task: self.handle_task(session, task))
+        await self.article_sink.flush()
+        await asyncio.to_thread(self.crawl_state.save)
+        self._report_run(stats)
+        return self.bloggers
+
+    def _report_run(self, stats):
+        rprint(f"[bold blue]Throughput: {stats.summary()}[/bold blue]")
+        if self.fetcher.retries:
+            rprint(f"[yellow]Retried {self.fetcher.retries} requests[/yellow]")
+        if self.dead_letters.added:
+            rprint(
+                f"[yellow]{self.dead_letters.added} failed pages saved to "
+                f"{self.dead_letters.path}; re-run them with retry-failed[/yellow]"
+            )
 
-                return bloggers
+    async def retry_failed(
+        self, session: aiohttp.ClientSession, scheduler: CrawlScheduler
+    ) -> int:
+        """Re-run the tasks parked in the dead-letter queue.
+
+        Entries that fail again are re-queued with an incremented attempt
+        count; the rest are removed from the queue. Entries that failed with a
+        permanent status (404, 410) are dropped without being fetched again.
+
+        Returns:
+            int: Number of dead-letter entries that were recovered
+        """
+        self.scheduler = scheduler
+        retried_up_to = self.dead_letters.size()
+        retried_urls = set()
+        dropped = 0
+        entries = self.dead_letters.entries()
+        scraped = await self.article_sink.known(
+            e["url"] for e in entries if e["kind"] == "article"
+        )
 
-        except Exception as e:
-            rprint(f"[red]Error fetching bloggers page: {e}[/red]")
-            return []
+        for entry in entries:
+            payload = {**entry["payload"], "attempts": entry["attempts"]}
+            kind = TaskKind[entry["kind"].upper()]
+            if kind == TaskKind.ARTICLE and entry["url"] in scraped:
+                continue
+            if entry.get("status") in PERMANENT_STATUSES:
+                dropped += 1
+                continue
+
+            blogger_name = payload.get("blogger_name")
+            if blogger_name:
+                state = self.blogger_state.setdefault(
+                    blogger_name, {"pending": 0, "submitted": 0, "failed": 0}
+                )
+                state["pending"] += 1
+            scheduler.submit(kind, entry["url"], **payload)
+            retried_urls.add(entry["url"])
+
+        stats = await scheduler.run(lambda task: self.handle_task(session, task))
+        await self.article_sink.flush()
+        await asyncio.to_thread(self.crawl_state.save)
+        failed_again = {e["url"] for e in self.dead_letters.entries(retried_up_to)}
+        self.dead_letters.discard_before(retried_up_to)
+        self._report_run(stats)
+        if dropped:
+            rprint(f"[yellow]Dropped {dropped} pages that no longer exist[/yellow]")
+        return len(retried_urls - failed_again)
 
     async def save_to_json(self, data: List[Dict], filename: str):
-        async with aiofiles.open(filename, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(data, ensure_ascii=False, indent=2))
+        await asyncio.to_thread(self.store.export_json, filename, data)
 
     def save_to_csv(self, data: List[Dict], filename: str):
-        flattened_data = []
-        for blogger in data:
-            for article in blogger["articles"]:
-                flattened_data.append(
-                    {
-                        "blogger_name": blogger["name"],
-                        "blogger_url": blogger["profile_url"],
-                        **article,
-                    }
-                )
-
-        df = pd.DataFrame(flattened_data)
-        df.to_csv(filename, index=False, encoding="utf-8")
+        self.store.export_csv(filename, data)
+
+    def close(self):
+        self.parse_pool.close()
+        self.article_sink.close()
+
+
+def create_article_sink(
+    sink: str, output_dir: str, db_batch_size: int, db_flush_interval: float
+) -> Optional[DatabaseArticleSink]:
+    """Sink for ``--sink``; ``None`` keeps the scraper's default JSONL store."""
+    if sink not in SINKS:
+        raise ValueError(f"Unknown sink {sink!r}, expected one of {SINKS}")
+    if sink == "file":
+        return None
+    return DatabaseArticleSink(
+        batch_size=db_batch_size,
+        flush_interval=db_flush_interval,
+        dead_letters=DeadLetterQueue(Path(output_dir)),
+    )
 
 
 async def run_scraper(
@@ -302,29 +425,49 @@ async def run_scraper(
     max_articles: Optional[int] = None,
     output_dir: str = "scraped_data",
     format: List[str] = ["json", "csv"],
+    fsync_every: int = 50,
+    workers: int = 10,
+    per_host_concurrency: int = 10,
+    rate_limit: float = 10.0,
+    parser: str = "selectolax",
+    parse_workers: int = 4,
+    incremental: bool = False,
+    max_attempts: int = 4,
+    http_settings: Optional[HttpClientSettings] = None,
+    sink: str = "file",
+    db_batch_size: int = 100,
+    db_flush_interval: float = 2.0,
 ):
+    article_sink = create_article_sink(
+        sink, output_dir, db_batch_size, db_flush_interval
+    )
+    http_settings = http_settings or HttpClientSettings()
+
     scraper = GazzettaBloggerScraper(
         target_bloggers=bloggers,
         max_articles_per_blogger=max_articles,
         output_dir=output_dir,
+        fsync_every=fsync_every,
+        per_host_concurrency=per_host_concurrency,
+        rate_limit=rate_limit,
+        parser=parser,
+        parse_workers=parse_workers,
+        incremental=incremental,
+        max_attempts=max_attempts,
+        max_body_bytes=http_settings.max_body_bytes,
+        article_sink=article_sink,
     )
+    scheduler = CrawlScheduler(workers=workers)
 
-    async with aiohttp.ClientSession() as session:
-        all_bloggers = []
-        page = 0
+    async with create_session(http_settings) as session:
+        all_bloggers = await scraper.crawl(session, scheduler)
 
-        while True:
-            rprint(f"[yellow]Fetching bloggers page {page}...[/yellow]")
-            bloggers = await scraper.get_bloggers(session, page)
-
-            if not bloggers:
-                break
-
-            all_bloggers.extend(bloggers)
-            rprint(f"[green]Found {len(bloggers)} bloggers on page {page}[/green]")
-
-            page += 1
-            await asyncio.sleep(0.5)
+        if scraper.store is None:
+            rprint(
+                f"[bold green]Inserted {article_sink.inserted} articles into the "
+                "database[/bold green]"
+            )
+            format = []
 
         if "json" in format:
             output_file = Path(output_dir) / "gazzetta_bloggers_articles.json"
@@ -336,11 +479,42 @@ async def run_scraper(
             scraper.save_to_csv(all_bloggers, output_file)
             rprint(f"[bold green]Saved CSV output to {output_file}[/bold green]")
 
+        scraper.close()
         rprint("[bold blue]Scraping completed![/bold blue]")
         rprint(f"Total bloggers scraped: {len(all_bloggers)}")
-        rprint(
-            f"Total articles scraped: {sum(len(b['articles']) for b in all_bloggers)}"
-        )
+        rprint(f"Total articles scraped: {scheduler.stats.articles}")
+
+
+async def run_retry_failed(
+    output_dir: str = "scraped_data",
+    workers: int = 10,
+    rate_limit: float = 10.0,
+    max_attempts: int = 4,
+    http_settings: Optional[HttpClientSettings] = None,
+    sink: str = "file",
+    db_batch_size: int = 100,
+    db_flush_interval: float = 2.0,
+):
+    article_sink = create_article_sink(
+        sink, output_dir, db_batch_size, db_flush_interval
+    )
+    http_settings = http_settings or HttpClientSettings()
+    scraper = GazzettaBloggerScraper(
+        output_dir=output_dir,
+        rate_limit=rate_limit,
+        parser="selectolax",
+        max_attempts=max_attempts,
+        max_body_bytes=http_settings.max_body_bytes,
+        article_sink=article_sink,
+    )
+    scheduler = CrawlScheduler(workers=workers)
+
+    async with create_session(http_settings) as session:
+        recovered = await scraper.retry_failed(session, scheduler)
+        scraper.close()
+
+    rprint(f"[bold blue]Recovered {recovered} failed pages[/bold blue]")
+    rprint(f"Total articles recovered: {scheduler.stats.articles}")
 
 
 @app.command()
@@ -357,16 +531,166 @@ def scrape(
     format: List[str] = typer.Option(
         ["json", "csv"], "--format", "-f", help="Output formats"
     ),
+    fsync_every: int = typer.Option(
+        50, "--fsync-every", help="Flush the article store to disk every N articles"
+    ),
+    workers: int = typer.Option(
+        10, "--workers", "-w", help="Number of concurrent crawl workers"
+    ),
+    per_host_concurrency: int = typer.Option(
+        10, "--per-host-concurrency", help="Maximum in-flight requests per host"
+    ),
+    rate_limit: float = typer.Option(
+        10.0,
+        "--rate-limit",
+        help="Maximum requests per second per host (0 disables the limit)",
+    ),
+    parser: str = typer.Option(
+        "selectolax", "--parser", help=f"HTML parser backend ({', '.join(PARSERS)})"
+    ),
+    parse_workers: int = typer.Option(
+        4, "--parse-workers", help="Worker processes for HTML parsing (0 = inline)"
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        "-i",
+        help="Only fetch articles newer than the last run (revisits all bloggers)",
+    ),
+    max_attempts: int = typer.Option(
+        4, "--max-attempts", help="Attempts per page before it is dead-lettered"
+    ),
+    connections: int = typer.Option(
+        100, "--connections", help="Total HTTP connection pool size (0 = unlimited)"
+    ),
+    keepalive_timeout: float = typer.Option(
+        30.0, "--keepalive-timeout", help="Seconds to keep idle connections open"
+    ),
+    dns_cache_ttl: int = typer.Option(
+        300, "--dns-cache-ttl", help="Seconds to cache DNS lookups"
+    ),
+    timeout: float = typer.Option(
+        60.0, "--timeout", help="Total seconds allowed per request"
+    ),
+    connect_timeout: float = typer.Option(
+        10.0, "--connect-timeout", help="Seconds allowed to establish a connection"
+    ),
+    max_body_mb: float = typer.Option(
+        5.0, "--max-body-mb", help="Largest response body accepted, in MB"
+    ),
+    sink: str = typer.Option(
+        "file",
+        "--sink",
+        help=f"Where articles are written ({', '.join(SINKS)})",
+    ),
+    db_batch_size: int = typer.Option(
+        100, "--db-batch-size", help="Articles per database insert (--sink db)"
+    ),
+    db_flush_interval: float = typer.Option(
+        2.0,
+        "--db-flush-interval",
+        help="Maximum seconds before queued articles are inserted (--sink db)",
+    ),
 ):
     """Scrape articles from Gazzetta.gr bloggers"""
-    asyncio.run(run_scraper(bloggers, max_articles, output_dir, format))
+    http_settings = HttpClientSettings(
+        connections=connections,
+        connections_per_host=per_host_concurrency,
+        keepalive_timeout=keepalive_timeout,
+        dns_cache_ttl=dns_cache_ttl,
+        total_timeout=timeout,
+        connect_timeout=connect_timeout,
+        max_body_bytes=int(max_body_mb * 1024 * 1024),
+    )
+    asyncio.run(
+        run_scraper(
+            bloggers,
+            max_articles,
+            output_dir,
+            format,
+            fsync_every,
+            workers,
+            per_host_concurrency,
+            rate_limit,
+            parser,
+            parse_workers,
+            incremental,
+            max_attempts,
+            http_settings,
+            sink,
+            db_batch_size,
+            db_flush_interval,
+        )
+    )
+
+
+@app.command()
+def retry_failed(
+    output_dir: str = typer.Option(
+        "scraped_data", "--output-dir", "-o", help="Output directory for scraped data"
+    ),
+    workers: int = typer.Option(
+        10, "--workers", "-w", help="Number of concurrent crawl workers"
+    ),
+    rate_limit: float = typer.Option(
+        10.0,
+        "--rate-limit",
+        help="Maximum requests per second per host (0 disables the limit)",
+    ),
+    max_attempts: int = typer.Option(
+        4, "--max-attempts", help="Attempts per page before it is dead-lettered"
+    ),
+    sink: str = typer.Option(
+        "file",
+        "--sink",
+        help=f"Where recovered articles are written ({', '.join(SINKS)}); "
+        "use the sink of the run that failed",
+    ),
+    db_batch_size: int = typer.Option(
+        100, "--db-batch-size", help="Articles per database insert (--sink db)"
+    ),
+    db_flush_interval: float = typer.Option(
+        2.0,
+        "--db-flush-interval",
+        help="Maximum seconds before queued articles are inserted (--sink db)",
+    ),
+):
+    """Re-fetch the pages recorded in the dead-letter queue"""
+    asyncio.run(
+        run_retry_failed(
+            output_dir,
+            workers,
+            rate_limit,
+            max_attempts,
+            sink=sink,
+            db_batch_size=db_batch_size,
+            db_flush_interval=db_flush_interval,
+        )
+    )
+
+
+@app.command()
+def convert_legacy(
+    input_file: Path = typer.Argument(..., help="Legacy JSON array file"),
+    output_dir: str = typer.Option(
+        "scraped_data", "--output-dir", "-o", help="Directory of the JSONL store"
+    ),
+):
+    """Convert a legacy JSON array file into the append-only JSONL store"""
+    if not input_file.exists():
+        rprint(f"[red]Error: File {input_file} not found![/red]")
+        raise typer.Exit(1)
+
+    with JsonlArticleStore(Path(output_dir)) as store:
+        converted = convert_legacy_json(input_file, store)
+    rprint(f"[green]Converted {converted} articles into {store.articles_file}[/green]")
 
 
 @app.command()
 async def list_bloggers():
     """List all available bloggers"""
     scraper = GazzettaBloggerScraper()
-    async with aiohttp.ClientSession() as session:
+    async with create_session(HttpClientSettings()) as session:
         bloggers = await scraper.get_bloggers(session, 0)
 
         table = Table(title="Available Bloggers")
@@ -0,0 +1,175 @@
+"""Destinations for scraped articles.
+
+Both sinks expose an async ``known`` that tells which of a batch of URLs they
+already hold, an async ``write`` for a single article, ``flush`` to wait until
+everything written so far is persisted, and ``close``.
+
+- ``FileArticleSink`` appends to the JSONL ``JsonlArticleStore``
+- ``DatabaseArticleSink`` streams articles through a bounded queue into
+  batched ``BulkArticleLoader`` inserts of the ``Article``/``Blogger``/
+  ``Category`` models, so memory stays flat and new articles are queryable
+  within ``flush_interval`` seconds
+"""
+
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from rich import print as rprint
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.db.loaders import BulkArticleLoader
+from core.db.models import Article
+from data_collection.storage import DeadLetterQueue, JsonlArticleStore
+
+SINKS = ("file", "db")
+
+
+class FileArticleSink:
+    def __init__(self, store: JsonlArticleStore):
+        self.store = store
+        self.urls: Set[str] = store.urls
+
+    async def known(self, urls: Iterable[str]) -> Set[str]:
+        return {url for url in urls if url in self.urls}
+
+    async def write(self, article: Dict):
+        await asyncio.to_thread(self.store.append, article)
+
+    async def flush(self):
+        await asyncio.to_thread(self.store.sync)
+
+    def close(self):
+        self.store.close()
+
+
+class DatabaseArticleSink:
+    """Batch scraped articles into PostgreSQL as they arrive.
+
+    The database is the authority on which articles are already stored:
+    ``known`` looks up just the URLs it is asked about, plus the ones still
+    queued for insert, instead of holding every stored URL in memory.
+
+    Args:
+        session_factory: Callable returning a new SQLAlchemy session
+            (defaults to ``core.db.config.SessionLocal``)
+        batch_size: Maximum articles per insert transaction
+        flush_interval: Maximum seconds an article waits before its batch
+            is written
+        queue_size: Bound of the in-memory queue; writers wait when full
+        dead_letters: Queue that receives articles whose batch failed to
+            insert, so ``retry-failed`` can re-fetch them
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        queue_size: int = 1000,
+        dead_letters: Optional[DeadLetterQueue] = None,
+    ):
+        if session_factory is None:
+            from core.db.config import SessionLocal
+
+            session_factory = SessionLocal
+
+        self.session_factory = session_factory
+        self.db = session_factory()
+        self.loader = BulkArticleLoader(self.db)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dead_letters = dead_letters
+        self.queue: asyncio.Queue[Dict] = asyncio.Queue(maxsize=queue_size)
+        self.pending: Set[str] = set()
+        self.inserted = 0
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def known(self, urls: Iterable[str]) -> Set[str]:
+        urls = set(urls)
+        # Snapshot the queued URLs before querying: a batch committed while
+        # the query runs is then either in the snapshot or in the result.
+        queued = urls & self.pending
+        stored = await asyncio.to_thread(self._stored_urls, urls - queued)
+        return queued | stored
+
+    def _stored_urls(self, urls: Set[str]) -> Set[str]:
+        if not urls:
+            return set()
+        with self.session_factory() as db:
+            query = select(Article.article_url).where(Article.article_url.in_(urls))
+            return set(db.execute(query).scalars())
+
+    async def write(self, article: Dict):
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._consume())
+        self.pending.add(article["article_url"])
+        await self.queue.put(article)
+
+    async def flush(self):
+        if self._consumer is not None:
+            await self.queue.join()
+
+    def close(self):
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+        self.db.close()
+
+    async def _next_batch(self) -> List[Dict]:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _consume(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await asyncio.to_thread(self._insert_batch, batch)
+            except Exception as e:
+                rprint(
+                    f"[red]Error inserting batch of {len(batch)} articles: {e}[/red]"
+                )
+                self._dead_letter(batch, e)
+            finally:
+                # Inserted URLs are now answered by the database; failed ones
+                # must be fetched again.
+                for article in batch:
+                    self.pending.discard(article["article_url"])
+                    self.queue.task_done()
+
+    def _insert_batch(self, batch: List[Dict]):
+        try:
+            inserted = self.loader.load_chunk(batch)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            self.loader.blogger_ids.clear()
+            self.loader.category_ids.clear()
+            raise
+        self.inserted += inserted
+
+    def _dead_letter(self, batch: List[Dict], error: Exception):
+        if self.dead_letters is None:
+            return
+        for article in batch:
+            metadata = {k: v for k, v in article.items() if k != "content"}
+            self.dead_letters.add(
+                "article",
+                article["article_url"],
+                {
+                    "blogger_name": article.get("blogger_name"),
+                    "profile_url": article.get("blogger_url", ""),
+                    "article": metadata,
+                },
+                f"database insert failed: {error}",
+            )
@@ -0,0 +1,377 @@
+"""Append-only JSON Lines storage for scraped articles.
+
+Every article is written as a single line to ``scraped_articles.jsonl`` and a
+compact index line (``offset``, ``length``, ``article_url``, ``blogger_name``)
+is appended to ``scraped_articles.idx``. Saving an article therefore costs a
+constant amount of I/O regardless of how large the archive already is, and
+startup only needs to read the small index to know which URLs were scraped.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+from rich import print as rprint
+
+ARTICLES_FILE_NAME = "scraped_articles.jsonl"
+INDEX_FILE_NAME = "scraped_articles.idx"
+LEGACY_ARTICLES_FILE_NAME = "scraped_articles.json"
+DEAD_LETTER_FILE_NAME = "failed_urls.jsonl"
+
+CSV_COLUMNS = [
+    "blogger_name",
+    "blogger_url",
+    "categories",
+    "date",
+    "title",
+    "article_url",
+    "content",
+]
+
+
+class JsonlArticleStore:
+    """Append-only article store backed by a JSONL file and a URL index.
+
+    Writes are flushed to the OS after every article and ``fsync``-ed every
+    ``fsync_every`` articles, so a crash loses at most that many articles
+    while keeping the per-article cost low. If the process dies between the
+    data write and the index write, the missing index entries are recovered
+    from the tail of the data file on the next start.
+    """
+
+    def __init__(self, data_dir: Path, fsync_every: int = 50):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.articles_file = self.data_dir / ARTICLES_FILE_NAME
+        self.index_file = self.data_dir / INDEX_FILE_NAME
+        self.fsync_every = fsync_every
+
+        self.urls: Set[str] = set()
+        self.blogger_offsets: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.blogger_urls: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._pending_sync = 0
+
+        self._load_index()
+        self._data_fh = open(self.articles_file, "ab")
+        self._index_fh = open(self.index_file, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __contains__(self, article_url: str) -> bool:
+        return article_url in self.urls
+
+    def _register(self, offset: int, length: int, url: str, blogger_name: str):
+        self.urls.add(url)
+        self.blogger_offsets[blogger_name].append((offset, length))
+
+    def _load_index(self):
+        """Read the URL index and recover entries missing from its tail."""
+        indexed_end = 0
+        if self.index_file.exists():
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 4:
+                        continue
+                    offset, length = int(parts[0]), int(parts[1])
+                    self._register(offset, length, parts[2], parts[3])
+                    indexed_end = max(indexed_end, offset + length)
+
+        if not self.articles_file.exists():
+            return
+
+        data_size = self.articles_file.stat().st_size
+        if data_size <= indexed_end:
+            return
+
+        # Index is behind the data file: rebuild entries for the tail and
+        # drop a trailing partial line left by an interrupted write.
+        recovered = []
+        with open(self.articles_file, "rb") as f:
+            f.seek(indexed_end)
+            offset = indexed_end
+            for raw_line in f:
+                if not raw_line.endswith(b"\n"):
+                    break
+                try:
+                    article = json.loads(raw_line)
+                except json.JSONDecodeError:
+                    break
+                recovered.append(
+                    (
+                        offset,
+                        len(raw_line),
+                        article["article_url"],
+                        article.get("blogger_name", ""),
+                    )
+                )
+                offset += len(raw_line)
+
+        if offset < data_size:
+            rprint(
+                "[yellow]Truncating incomplete trailing article in "
+                f"{self.articles_file}[/yellow]"
+            )
+            with open(self.articles_file, "r+b") as f:
+                f.truncate(offset)
+
+        if recovered:
+            rprint(
+                f"[yellow]Recovered {len(recovered)} index entries for "
+                f"{self.articles_file}[/yellow]"
+            )
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                for entry in recovered:
+                    self._register(*entry)
+                    f.write(_format_index_line(*entry))
+
+    def append(self, article: Dict):
+        """Append a single article; cost is independent of the store size."""
+        line = (json.dumps(article, ensure_ascii=False) + "\n").encode("utf-8")
+        blogger_name = article.get("blogger_name", "")
+
+        with self._lock:
+            offset = self._data_fh.tell()
+            self._data_fh.write(line)
+            self._data_fh.flush()
+            self._index_fh.write(
+                _format_index_line(
+                    offset, len(line), article["article_url"], blogger_name
+                )
+            )
+            self._index_fh.flush()
+            self._register(offset, len(line), article["article_url"], blogger_name)
+            if article.get("blogger_url"):
+                self.blogger_urls.setdefault(blogger_name, article["blogger_url"])
+
+            self._pending_sync += 1
+            if self._pending_sync >= self.fsync_every:
+                self._fsync()
+
+    def _fsync(self):
+        os.fsync(self._data_fh.fileno())
+        os.fsync(self._index_fh.fileno())
+        self._pending_sync = 0
+
+    def sync(self):
+        """Force any batched writes to disk."""
+        with self._lock:
+            if self._pending_sync:
+                self._fsync()
+
+    def close(self):
+        self.sync()
+        self._data_fh.close()
+        self._index_fh.close()
+
+    def __enter__(self) -> "JsonlArticleStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def iter_articles(self, blogger_name: Optional[str] = None) -> Iterator[Dict]:
+        """Stream stored articles, optionally only those of a single blogger."""
+        with self._lock:
+            self._data_fh.flush()
+
+        with open(self.articles_file, "rb") as f:
+            if blogger_name is None:
+                for raw_line in f:
+                    yield json.loads(raw_line)
+                return
+
+            for offset, length in list(self.blogger_offsets.get(blogger_name, [])):
+                f.seek(offset)
+                yield json.loads(f.read(length))
+
+    def bloggers(self) -> List[str]:
+        """Blogger names in the order they were first stored."""
+        return list(self.blogger_offsets)
+
+    def export_json(self, filename: Path, bloggers: Optional[List[Dict]] = None):
+        """Write the nested ``[{name, profile_url, articles}]`` format.
+
+        Articles are streamed one at a time, so memory stays flat no matter
+        how many articles the store holds.
+
+        Args:
+            filename: Output path
+            bloggers: Blogger dicts (``name``, ``profile_url``) to export;
+                defaults to every blogger in the store
+        """
+        if bloggers is None:
+            bloggers = [
+                {"name": name, "profile_url": self.blogger_urls.get(name, "")}
+                for name in self.bloggers()
+            ]
+
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write("[")
+            for i, blogger in enumerate(bloggers):
+                f.write(",\n" if i else "\n")
+                header = json.dumps(
+                    {"name": blogger["name"], "profile_url": blogger["profile_url"]},
+                    ensure_ascii=False,
+                )
+                f.write(header[:-1] + ', "articles": [')
+                for j, article in enumerate(self.iter_articles(blogger["name"])):
+                    f.write(",\n" if j else "\n")
+                    f.write(json.dumps(article, ensure_ascii=False))
+                f.write("\n]}")
+            f.write("\n]\n")
+
+    def export_csv(
+        self,
+        filename: Path,
+        bloggers: Optional[List[Dict]] = None,
+        chunk_size: int = 1000,
+    ):
+        """Write a flat CSV (one row per article) in fixed-size chunks."""
+        if bloggers is None:
+            bloggers = [
+                {"name": name, "profile_url": self.blogger_urls.get(name, "")}
+                for name in self.bloggers()
+            ]
+
+        header = True
+        rows = []
+        with open(filename, "w", encoding="utf-8", newline="") as f:
+            for blogger in bloggers:
+                for article in self.iter_articles(blogger["name"]):
+                    rows.append(
+                        {
+                            **article,
+                            "blogger_name": blogger["name"],
+                            "blogger_url": blogger["profile_url"],
+                        }
+                    )
+                    if len(rows) >= chunk_size:
+                        pd.DataFrame(rows, columns=CSV_COLUMNS).to_csv(
+                            f, index=False, header=header
+                        )
+                        header = False
+                        rows = []
+
+            if rows or header:
+                pd.DataFrame(rows, columns=CSV_COLUMNS).to_csv(
+                    f, index=False, header=header
+                )
+
+
+class DeadLetterQueue:
+    """Append-only JSONL log of crawl tasks whose fetch failed for good.
+
+    Each entry records the task kind, URL, the payload needed to re-run it,
+    the error, the HTTP status (if any) and how many times it has failed.
+    ``entries`` collapses the log to the latest entry per URL.
+    """
+
+    def __init__(self, data_dir: Path):
+        self.path = Path(data_dir) / DEAD_LETTER_FILE_NAME
+        self._lock = threading.Lock()
+        self.added = 0
+
+    def add(
+        self,
+        kind: str,
+        url: str,
+        payload: Dict,
+        error: str,
+        attempts: int = 1,
+        status: Optional[int] = None,
+    ):
+        entry = {
+            "kind": kind,
+            "url": url,
+            "payload": payload,
+            "error": error,
+            "status": status,
+            "attempts": attempts,
+            "failed_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.added += 1
+
+    def entries(self, offset: int = 0) -> List[Dict]:
+        """Latest entry per URL, reading the log from byte ``offset``."""
+        if not self.path.exists():
+            return []
+        latest: Dict[str, Dict] = {}
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    latest[entry["url"]] = entry
+        return list(latest.values())
+
+    def size(self) -> int:
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def discard_before(self, offset: int):
+        """Drop entries written before ``offset`` (those already retried)."""
+        if not self.path.exists():
+            return
+        with self._lock:
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                remaining = f.read()
+            if remaining:
+                tmp_path = self.path.with_suffix(".jsonl.tmp")
+                tmp_path.write_bytes(remaining)
+                os.replace(tmp_path, self.path)
+            else:
+                self.path.unlink()
+
+
+def _format_index_line(offset: int, length: int, url: str, blogger_name: str) -> str:
+    return f"{offset}\t{length}\t{url}\t{blogger_name}\n"
+
+
+def iter_legacy_articles(json_file: Path) -> Iterator[Dict]:
+    """Yield flat article dicts from a legacy JSON array file.
+
+    Supports both the flat ``scraped_articles.json`` format and the nested
+    ``gazzetta_bloggers_articles.json`` format.
+    """
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    for item in data:
+        if "articles" in item:
+            for article in item["articles"]:
+                yield {
+                    **article,
+                    "blogger_name": item["name"],
+                    "blogger_url": item.get("profile_url", ""),
+                }
+        else:
+            yield item
+
+
+def convert_legacy_json(json_file: Path, store: JsonlArticleStore) -> int:
+    """Append the articles of a legacy JSON array file to a JSONL store.
+
+    Articles whose URL is already in the store are skipped, so the conversion
+    can be re-run safely.
+
+    Returns:
+        int: Number of articles appended
+    """
+    converted = 0
+    for article in iter_legacy_articles(json_file):
+        if article.get("article_url") in store:
+            continue
+        store.append(article)
+        converted += 1
+    store.sync()
+    return converted
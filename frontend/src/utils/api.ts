@@ -29,6 +29,21 @@ export interface Article {
   stance_predictions: StancePrediction[]
 }
 
+export interface ArticleSummary {
+  id: number
+  title: string
+  article_url: string
+  published_date?: string
+  blogger: Blogger
+  stance_predictions: Omit<StancePrediction, 'justification'>[]
+  excerpt: string | null
+}
+
+export interface ArticlePage<T = Article> {
+  items: T[]
+  next_cursor: string | null
+}
+
 interface GetArticlesParams {
   skip?: number
   limit?: number
@@ -37,11 +52,38 @@ interface GetArticlesParams {
   stance?: string
 }
 
+type GetArticlesPageParams = Omit<GetArticlesParams, 'skip'> & {
+  cursor?: string | null
+}
+
+type GetSummariesParams = GetArticlesPageParams & {
+  // Characters of content to include as an excerpt
+  excerpt?: number
+}
+
 export const api = {
   articles: {
     getAll: async (params: GetArticlesParams = {}): Promise<Article[]> => {
       const { data } = await axios.get(`${API_BASE_URL}/api/v1/articles`, { params })
       return data
     },
+    // Cursor pagination: pass the previous page's next_cursor to continue
+    getPage: async ({ cursor, ...params }: GetArticlesPageParams = {}): Promise<ArticlePage> => {
+      const { data } = await axios.get(`${API_BASE_URL}/api/v1/articles`, {
+        params: { ...params, pagination: 'cursor', ...(cursor ? { cursor } : {}) },
+      })
+      return data
+    },
+    // List view: no content bodies, only an optional excerpt
+    getSummaries: async ({ cursor, ...params }: GetSummariesParams = {}): Promise<ArticlePage<ArticleSummary>> => {
+      const { data } = await axios.get(`${API_BASE_URL}/api/v1/articles`, {
+        params: { ...params, view: 'summary', pagination: 'cursor', ...(cursor ? { cursor } : {}) },
+      })
+      return data
+    },
+    get: async (id: number): Promise<Article> => {
+      const { data } = await axios.get(`${API_BASE_URL}/api/v1/articles/${id}`)
+      return data
+    },
   },
 } 
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""Tests for the article routes."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from api.main import app
+from core.db.config import get_async_db
+from core.db.models import Article, Blogger, Category, StancePrediction
+
+
+@pytest.fixture
+def db(file_engines):
+    """Session for seeding the database the app queries asynchronously."""
+    engine, async_engine = file_engines
+    async_session = async_sessionmaker(async_engine)
+
+    async def override_get_async_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    session = sessionmaker(bind=engine)()
+    yield session
+    app.dependency_overrides.clear()
+    session.close()
+
+
+@pytest.fixture
+def client(db) -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def articles(db):
+    """Articles with two categories and predictions each.
+
+    Articles 0-24 are dated (10 and 11 on the same day), 25 is uncategorized
+    and 26-27 are undated.
+    """
+    bloggers = [
+        Blogger(name=f"Blogger {i}", profile_url=f"https://b/{i}") for i in range(3)
+    ]
+    categories = [Category(name="Ποδόσφαιρο"), Category(name="Μπάσκετ")]
+    articles = []
+    for i in range(28):
+        article = Article(
+            blogger=bloggers[i % 3],
+            title=f"Άρθρο {i}",
+            content="κείμενο",
+            article_url=f"https://a/{i}",
+            published_date=(
+                datetime(2025, 1, 1) + timedelta(days=i if i != 10 else 11)
+                if i < 26
+                else None
+            ),
+            categories=categories if i != 25 else [],
+        )
+        db.add(article)
+        db.flush()
+        db.add_all(
+            [
+                StancePrediction(
+                    article_id=article.id,
+                    target="ΠΑΟΚ",
+                    target_type="club",
+                    stance="θετική" if i % 2 else "αρνητική",
+                ),
+                StancePrediction(
+                    article_id=article.id,
+                    target="διαιτησία",
+                    target_type="referee",
+                    stance="ουδέτερη",
+                ),
+            ]
+        )
+        articles.append(article)
+    db.commit()
+    return articles
+
+
+@pytest.fixture
+def queries(file_engines):
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    engine = file_engines[1].sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("limit", [1, 10, 25])
+def test_articles_page_costs_three_queries(client, articles, queries, limit):
+    response = client.get("/api/v1/articles", params={"limit": limit})
+
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page) == limit
+    assert all(len(article["stance_predictions"]) == 2 for article in page)
+    assert all(len(article["categories"]) == 2 for article in page)
+    assert len(queries) == 3
+
+
+def test_articles_are_paged_newest_first(client, articles):
+    first = client.get("/api/v1/articles", params={"limit": 10}).json()
+    second = client.get("/api/v1/articles", params={"skip": 10, "limit": 10}).json()
+
+    # The uncategorized article 25 is left out, as before
+    titles = [article["title"] for article in first + second]
+    assert titles == [f"Άρθρο {i}" for i in range(24, 4, -1)]
+
+
+def test_articles_filter_by_stance(client, articles, queries):
+    response = client.get(
+        "/api/v1/articles",
+        params={"target": "ΠΑΟΚ", "stance": "θετική", "limit": 50},
+    )
+
+    page = response.json()
+    assert len(page) == 13
+    assert all(
+        {"target": "ΠΑΟΚ", "stance": "θετική"}.items() <= prediction.items()
+        for article in page
+        for prediction in article["stance_predictions"]
+        if prediction["target"] == "ΠΑΟΚ"
+    )
+    # Every prediction of the article is returned, not just the matching one
+    assert all(len(article["stance_predictions"]) == 2 for article in page)
+    assert len(queries) == 3
+
+
+def test_cursor_pages_match_offset_order(client, articles, queries):
+    expected = [
+        article["id"]
+        for article in client.get("/api/v1/articles", params={"limit": 100}).json()
+    ]
+    queries.clear()
+
+    ids, cursor, pages = [], None, 0
+    params = {"pagination": "cursor", "limit": 4}
+    while True:
+        page = client.get("/api/v1/articles", params={**params, "cursor": cursor})
+        assert page.status_code == 200
+        body = page.json()
+        ids += [article["id"] for article in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+        params = {"cursor": cursor, "limit": 4}
+
+    # Dated articles newest first (ties by id), then the undated ones
+    assert ids == expected
+    assert [articles[i].id for i in (11, 10, 9)] == ids[13:16]
+    assert ids[-2:] == [articles[27].id, articles[26].id]
+    assert pages == 7
+    assert len(queries) == 3 * pages
+
+
+def test_cursor_pagination_rejects_bad_requests(client, articles):
+    invalid = client.get("/api/v1/articles", params={"cursor": "not-a-cursor"})
+    combined = client.get(
+        "/api/v1/articles", params={"pagination": "cursor", "skip": 10}
+    )
+
+    assert invalid.status_code == 400
+    assert combined.status_code == 400
+
+
+@pytest.mark.parametrize("pagination", ["offset", "cursor"])
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 101}, {"skip": -1}])
+def test_articles_reject_out_of_range_pages(client, articles, pagination, params):
+    response = client.get(
+        "/api/v1/articles", params={"pagination": pagination, **params}
+    )
+
+    assert response.status_code == 422
+
+
+def test_summary_view_leaves_content_in_the_database(client, articles, db, queries):
+    for article in articles:
+        article.content = "Μακρύ κείμενο άρθρου. " * 500
+    db.commit()
+    full = client.get("/api/v1/articles", params={"limit": 20})
+    queries.clear()
+
+    summary = client.get(
+        "/api/v1/articles", params={"limit": 20, "view": "summary", "excerpt": 40}
+    )
+
+    assert summary.status_code == 200
+    page = summary.json()
+    assert [article["id"] for article in page] == [a["id"] for a in full.json()]
+    assert set(page[0]) == {
+        "id",
+        "title",
+        "article_url",
+        "published_date",
+        "blogger",
+        "stance_predictions",
+        "excerpt",
+    }
+    assert set(page[0]["stance_predictions"][0]) == {"target", "target_type", "stance"}
+    assert page[0]["excerpt"] == ("Μακρύ κείμενο άρθρου. " * 2)[:40]
+    assert len(summary.content) * 10 < len(full.content)
+    # Only the excerpt is read from the content column
+    assert len(queries) == 2
+    assert "articles.content" not in queries[0].replace("substr(articles.content", "")
+
+
+def test_summary_view_with_cursor(client, articles):
+    first = client.get(
+        "/api/v1/articles", params={"view": "summary", "pagination": "cursor"}
+    ).json()
+    second = client.get(
+        "/api/v1/articles",
+        params={"view": "summary", "cursor": first["next_cursor"]},
+    ).json()
+
+    assert len(first["items"]) == len(second["items"]) == 10
+    assert first["items"][0]["excerpt"] is None
+    assert "content" not in first["items"][0]
+    assert first["items"][-1]["id"] != second["items"][0]["id"]
+
+
+def test_get_article_returns_full_article(client, articles):
+    response = client.get(f"/api/v1/articles/{articles[3].id}")
+
+    assert response.status_code == 200
+    article = response.json()
+    assert (article["title"], article["content"]) == ("Άρθρο 3", "κείμενο")
+    assert len(article["categories"]) == len(article["stance_predictions"]) == 2
+    assert client.get("/api/v1/articles/100000").status_code == 404
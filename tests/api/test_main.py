@@ -99,3 +99,16 @@ def test_root_endpoint_method_not_allowed(client: TestClient, method: str) -> No
     """
     response = client.request(method, "/")
     assert response.status_code == 405
+
+
+def test_database_health(client: TestClient) -> None:
+    """Test that the pool metrics endpoint reports checkouts and wait times.
+
+    Args:
+        client: The test client fixture.
+    """
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    assert {"pool", "checkouts", "timeouts", "wait_avg_ms", "wait_max_ms"} <= set(
+        response.json()
+    )
@@ -2,8 +2,11 @@ import os
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
 
+from core.db.config import async_url
 from core.db.models import Base
 
 
@@ -34,6 +37,37 @@ def test_db() -> Session:
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="function")
+def threaded_session_factory():
+    """Session factory on an in-memory database shared across threads.
+
+    For code that hands its session to worker threads (``asyncio.to_thread``).
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def file_engines(tmp_path):
+    """Sync and async engines on one SQLite file, with the tables created.
+
+    For API tests, which seed data synchronously while the routes query
+    through ``AsyncSession``s.
+    """
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    # No pooling, as each TestClient request may run on a new event loop
+    yield engine, create_async_engine(async_url(url), poolclass=NullPool)
+    engine.dispose()
+
+
 @pytest.fixture(scope="function")
 def override_get_db(test_db: Session):
     """Override the get_db dependency for testing."""
@@ -0,0 +1,141 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from core.db.aggregates import load_aggregates, refresh_aggregates
+from core.db.models import Article, Blogger, StanceAggregate, StancePrediction
+from core.nlp.engine import PredictionResult, upsert_predictions
+
+
+@pytest.fixture
+def corpus(test_db):
+    """Two bloggers, articles in January and February, one undated."""
+    bloggers = [
+        Blogger(name=name, profile_url=f"https://b/{name}") for name in ("Α", "Β")
+    ]
+    dates = [datetime(2025, 1, 5), datetime(2025, 1, 20), datetime(2025, 2, 3), None]
+    articles = [
+        Article(
+            blogger=blogger,
+            title="Άρθρο",
+            content="κείμενο",
+            article_url=f"https://a/{blogger.name}/{i}",
+            published_date=published,
+        )
+        for blogger in bloggers
+        for i, published in enumerate(dates)
+    ]
+    test_db.add_all(articles)
+    test_db.commit()
+    return articles
+
+
+def predict(db, article, stance, created_at, target="ΠΑΟΚ"):
+    """Upsert a prediction as the writers do, then backdate it."""
+    upsert_predictions(db, [PredictionResult(article.id, target, "club", stance, "")])
+    db.execute(
+        update(StancePrediction)
+        .where(
+            StancePrediction.article_id == article.id,
+            StancePrediction.target == target,
+        )
+        .values(created_at=created_at)
+    )
+    db.commit()
+
+
+def cells(db):
+    return {
+        (row.blogger_id, row.month, row.stance): row.count
+        for row in db.execute(select(StanceAggregate)).scalars()
+    }
+
+
+def test_refresh_counts_predictions_per_cell(test_db, corpus):
+    a, b = corpus[0].blogger_id, corpus[4].blogger_id
+    stances = ["θετική", "θετική", "αρνητική", "θετική"]
+    for article, stance in zip(corpus, stances * 2):
+        predict(test_db, article, stance, datetime(2025, 3, 1))
+
+    assert refresh_aggregates(test_db) == 4
+    assert cells(test_db) == {
+        (a, date(2025, 1, 1), "θετική"): 2,
+        (a, date(2025, 2, 1), "αρνητική"): 1,
+        (b, date(2025, 1, 1), "θετική"): 2,
+        (b, date(2025, 2, 1), "αρνητική"): 1,
+    }
+
+
+def test_incremental_refresh_only_recomputes_changed_cells(test_db, corpus):
+    a = corpus[0].blogger_id
+    for article in corpus[:3] + corpus[4:7]:
+        predict(test_db, article, "θετική", datetime(2025, 3, 1))
+    refresh_aggregates(test_db)
+    untouched = {
+        row.id
+        for row in test_db.execute(select(StanceAggregate)).scalars()
+        if (row.blogger_id, row.month) != (a, date(2025, 1, 1))
+    }
+
+    # A changed stance and a new target, both in blogger Α's January
+    predict(test_db, corpus[0], "αρνητική", datetime(2025, 3, 2))
+    predict(test_db, corpus[1], "ουδέτερη", datetime(2025, 3, 2), target="ΑΕΚ")
+
+    assert refresh_aggregates(test_db) == 2
+    rows = test_db.execute(select(StanceAggregate)).scalars().all()
+    assert untouched <= {row.id for row in rows}
+    january = {
+        (row.target, row.stance): row.count
+        for row in rows
+        if (row.blogger_id, row.month) == (a, date(2025, 1, 1))
+    }
+    assert january == {
+        ("ΠΑΟΚ", "θετική"): 1,
+        ("ΠΑΟΚ", "αρνητική"): 1,
+        ("ΑΕΚ", "ουδέτερη"): 1,
+    }
+
+    assert refresh_aggregates(test_db) == 0
+    full = cells(test_db)
+    refresh_aggregates(test_db, full=True)
+    assert cells(test_db) == full
+
+
+def test_refresh_counts_predictions_committed_late(test_db, corpus):
+    predict(test_db, corpus[0], "θετική", datetime(2025, 3, 2))
+    refresh_aggregates(test_db)
+
+    # A slower writer commits a prediction stamped before the last refresh
+    predict(test_db, corpus[1], "αρνητική", datetime(2025, 3, 1))
+
+    assert refresh_aggregates(test_db) == 1
+    assert cells(test_db) == {
+        (corpus[0].blogger_id, date(2025, 1, 1), "θετική"): 1,
+        (corpus[0].blogger_id, date(2025, 1, 1), "αρνητική"): 1,
+    }
+
+
+def test_load_aggregates_pivots_stances(test_db, corpus):
+    stances = ["θετική", "αρνητική", "αρνητική"]
+    for article, stance in zip(corpus, stances):
+        predict(test_db, article, stance, datetime(2025, 3, 1))
+    refresh_aggregates(test_db)
+
+    frame = load_aggregates(test_db, target="ΠΑΟΚ")
+
+    assert list(frame.columns) == [
+        "blogger",
+        "target",
+        "target_type",
+        "month",
+        "αρνητική",
+        "θετική",
+        "total",
+        "share_αρνητική",
+        "share_θετική",
+    ]
+    january = frame[frame["month"] == date(2025, 1, 1)].iloc[0]
+    assert (january["θετική"], january["αρνητική"], january["total"]) == (1, 1, 2)
+    assert january["share_θετική"] == 0.5
+    assert load_aggregates(test_db, since=date(2025, 2, 1))["total"].tolist() == [1]
@@ -0,0 +1,158 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from core.db.models import Article, StancePrediction
+from core.nlp import batch
+from core.nlp.batch import (
+    BatchJob,
+    LocalBatchBackend,
+    export_batch_job,
+    ingest_batch_job,
+    poll_batch_job,
+    submit_batch_job,
+)
+from core.nlp.stance_predictor import pending_articles_query
+
+TARGETS = [("ΠΑΟΚ", "club"), ("διαιτησία", "referee")]
+
+
+def add_articles(db, texts):
+    db.add_all(
+        Article(title=f"Άρθρο {i}", content=text, article_url=f"https://a/{i}")
+        for i, text in enumerate(texts)
+    )
+    db.commit()
+
+
+def complete(body):
+    prompt = body["messages"][-1]["content"]
+    if "σπασμένο" in prompt:
+        raise RuntimeError("bad request")
+    stance = "αρνητική" if "διαιτητής" in prompt else "θετική"
+    targets = body["response_format"]["json_schema"]["schema"]["properties"]
+    names = targets["predictions"]["items"]["properties"]["target"]["enum"]
+    return json.dumps(
+        {
+            "predictions": [
+                {"target": name, "stance": stance, "justification": "Α"}
+                for name in names
+            ]
+        }
+    )
+
+
+def test_batch_job_exports_submits_and_ingests(test_db, tmp_path):
+    add_articles(
+        test_db, ["Η ομάδα κέρδισε."] * 3 + ["Ο διαιτητής έκανε λάθη."] + ["σπασμένο"]
+    )
+    job_dir = tmp_path / "job"
+
+    job = export_batch_job(
+        test_db, job_dir, TARGETS, pending_articles_query(TARGETS), shard_size=2
+    )
+    assert [shard.requests for shard in job.shards] == [2, 2, 1]
+    request = json.loads(
+        (job_dir / "shard-0000.requests.jsonl").read_text().split("\n")[0]
+    )
+    assert request["custom_id"] == "article-1"
+    assert request["url"] == "/v1/chat/completions"
+    assert "response_format" in request["body"]
+
+    backend = LocalBatchBackend(tmp_path / "backend", complete)
+    submit_batch_job(job, backend, "local")
+    assert poll_batch_job(job, backend)
+    assert ingest_batch_job(test_db, job, backend, batch_size=3) == (4, 1)
+
+    predictions = test_db.execute(select(StancePrediction)).scalars().all()
+    assert len(predictions) == 8
+    assert sum(p.stance == "αρνητική" for p in predictions) == 2
+
+    # The state survives a restart and nothing is ingested twice
+    job = BatchJob.load(job_dir)
+    assert {shard.status for shard in job.shards} == {"ingested"}
+    assert ingest_batch_job(test_db, job, backend) == (0, 0)
+    # Only the failed article is left for the next job
+    pending = test_db.execute(pending_articles_query(TARGETS)).all()
+    assert [content for _, content in pending] == ["σπασμένο"]
+
+
+def test_batch_export_resumes_after_crash(test_db, tmp_path, monkeypatch):
+    add_articles(test_db, [f"Κείμενο {i}" for i in range(7)])
+    build_request = batch.build_request
+    calls = []
+
+    def crash_on_sixth_request(article_text, targets):
+        calls.append(article_text)
+        if len(calls) == 6:
+            raise KeyboardInterrupt
+        return build_request(article_text, targets)
+
+    monkeypatch.setattr(batch, "build_request", crash_on_sixth_request)
+    query = pending_articles_query(TARGETS)
+    with pytest.raises(KeyboardInterrupt):
+        export_batch_job(test_db, tmp_path, TARGETS, query, shard_size=2)
+
+    job = BatchJob.load(tmp_path)
+    assert (job.last_article_id, len(job.shards), job.exported) == (4, 2, False)
+
+    job = export_batch_job(test_db, tmp_path, TARGETS, query, shard_size=2)
+    assert [shard.requests for shard in job.shards] == [2, 2, 2, 1]
+    # The interrupted shard was exported again from its first article
+    assert calls[6] == "Κείμενο 4"
+    with pytest.raises(ValueError):
+        export_batch_job(test_db, tmp_path, TARGETS[:1], query)
+
+
+class FlakyBackend(LocalBatchBackend):
+    """Fails the first batch outright and the broken article once."""
+
+    def __init__(self, root):
+        self.failed_batches = set()
+        self.broken_calls = 0
+        super().__init__(root, self.complete_once)
+
+    def complete_once(self, body):
+        if "σπασμένο" in body["messages"][-1]["content"]:
+            self.broken_calls += 1
+            if self.broken_calls == 1:
+                raise RuntimeError("timeout")
+            # Answered like any other article on the retry
+            body = {**body, "messages": [{"content": "διορθωμένο"}]}
+        return complete(body)
+
+    def status(self, batch_id):
+        if not self.failed_batches:
+            self.failed_batches.add(batch_id)
+        if batch_id in self.failed_batches:
+            return "failed"
+        return super().status(batch_id)
+
+
+def test_batch_job_retries_failed_shards_and_requests(test_db, tmp_path):
+    add_articles(test_db, ["Η ομάδα κέρδισε."] * 3 + ["σπασμένο"])
+    query = pending_articles_query(TARGETS)
+    job = export_batch_job(test_db, tmp_path / "job", TARGETS, query, shard_size=2)
+    backend = FlakyBackend(tmp_path / "backend")
+
+    submit_batch_job(job, backend, "local")
+    assert poll_batch_job(job, backend)
+    assert [shard.status for shard in job.shards] == ["failed", "completed"]
+    assert ingest_batch_job(test_db, job, backend) == (1, 1)
+
+    # The failed batch is submitted again
+    submit_batch_job(job, backend, "local")
+    assert job.shards[0].submissions == 2
+    poll_batch_job(job, backend)
+    assert ingest_batch_job(test_db, job, backend) == (2, 0)
+
+    # The failed request goes into a new shard, once
+    job = export_batch_job(test_db, tmp_path / "job", TARGETS, query)
+    assert [shard.requests for shard in job.shards] == [2, 2, 1]
+    export_batch_job(test_db, tmp_path / "job", TARGETS, query)
+    assert len(BatchJob.load(tmp_path / "job").shards) == 3
+    submit_batch_job(job, backend, "local")
+    poll_batch_job(job, backend)
+    assert ingest_batch_job(test_db, job, backend) == (1, 0)
+    assert test_db.execute(query).all() == []
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+
+from data_collection.extractors import (
+    PARSERS,
+    ParsePool,
+    extract_article_content,
+    extract_article_list,
+    extract_bloggers,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "gazzetta"
+BASE_URL = "https://www.gazzetta.gr"
+
+
+def fixture_html(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("parser", PARSERS)
+def test_parsers_extract_identical_fields(parser):
+    reference = "html.parser"
+
+    assert extract_article_content(
+        fixture_html("article.html"), parser
+    ) == extract_article_content(fixture_html("article.html"), reference)
+    assert extract_article_list(
+        fixture_html("profile.html"), BASE_URL, parser
+    ) == extract_article_list(fixture_html("profile.html"), BASE_URL, reference)
+    assert extract_bloggers(
+        fixture_html("bloggers.html"), BASE_URL, parser
+    ) == extract_bloggers(fixture_html("bloggers.html"), BASE_URL, reference)
+
+
+def test_extract_article_list_fields():
+    articles = extract_article_list(fixture_html("profile.html"), BASE_URL)
+
+    assert [a["title"] for a in articles] == [
+        "Ο Θρύλος και το VAR",
+        "Η διαιτησία στο ντέρμπι",
+        "Η ΑΕΚ στο ΟΑΚΑ",
+    ]
+    assert articles[0] == {
+        "categories": ["Ποδόσφαιρο"],
+        "date": "12/01/2025 - 21:30",
+        "title": "Ο Θρύλος και το VAR",
+        "article_url": f"{BASE_URL}/football/article/1001/o-thrylos-kai-to-var",
+    }
+
+
+async def test_parse_pool_offloads_to_worker_process():
+    pool = ParsePool(workers=1, parser="html.parser")
+    try:
+        content = await pool.article_content(fixture_html("article.html"))
+    finally:
+        pool.close()
+
+    assert content == extract_article_content(fixture_html("article.html"))
+    assert "Διαφήμιση" not in content
+
+
+def test_parse_pool_rejects_unknown_parser():
+    with pytest.raises(ValueError):
+        ParsePool(parser="regex")
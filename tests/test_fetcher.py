@@ -0,0 +1,154 @@
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from data_collection.fetcher import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FetchError,
+    ResilientFetcher,
+    ResponseTooLargeError,
+    RetryPolicy,
+)
+from data_collection.http_client import HttpClientSettings, create_session
+from data_collection.scheduler import HostLimiter
+
+
+@pytest.fixture
+async def flaky_server():
+    """Server whose /flaky page fails twice before succeeding."""
+    calls = {"flaky": 0, "down": 0}
+
+    async def flaky(request):
+        calls["flaky"] += 1
+        if calls["flaky"] <= 2:
+            return web.Response(status=503, headers={"Retry-After": "0"})
+        return web.Response(text="<html>ok</html>", headers={"ETag": '"v1"'})
+
+    async def down(request):
+        calls["down"] += 1
+        return web.Response(status=500)
+
+    async def missing(request):
+        return web.Response(status=404)
+
+    async def large(request):
+        return web.Response(text="x" * 4096)
+
+    async def echo_headers(request):
+        return web.Response(
+            text=f"{request.headers['User-Agent']}|{request.headers['Accept-Encoding']}"
+        )
+
+    app = web.Application()
+    app.router.add_get("/flaky", flaky)
+    app.router.add_get("/down", down)
+    app.router.add_get("/missing", missing)
+    app.router.add_get("/large", large)
+    app.router.add_get("/headers", echo_headers)
+
+    server = TestServer(app)
+    await server.start_server()
+    server.calls = calls
+    yield server
+    await server.close()
+
+
+def make_fetcher(**kwargs):
+    return ResilientFetcher(
+        HostLimiter(requests_per_second=0),
+        RetryPolicy(max_attempts=3, base_delay=0, max_delay=0),
+        **kwargs,
+    )
+
+
+async def test_session_sends_default_headers(flaky_server):
+    settings = HttpClientSettings(user_agent="greek-news-nlp-test")
+    async with create_session(settings) as session:
+        page = await make_fetcher().fetch(
+            session, str(flaky_server.make_url("/headers")), {}
+        )
+
+    assert page.html == f"greek-news-nlp-test|{settings.accept_encoding}"
+
+
+async def test_fetch_rejects_oversized_body(flaky_server):
+    fetcher = make_fetcher(max_body_bytes=1024)
+    async with create_session(HttpClientSettings()) as session:
+        with pytest.raises(ResponseTooLargeError):
+            await fetcher.fetch(session, str(flaky_server.make_url("/large")), {})
+
+
+async def test_fetch_retries_transient_errors(flaky_server):
+    fetcher = make_fetcher()
+    async with aiohttp.ClientSession() as session:
+        page = await fetcher.fetch(session, str(flaky_server.make_url("/flaky")), {})
+
+    assert page.status == 200
+    assert page.html == "<html>ok</html>"
+    assert page.etag == '"v1"'
+    assert fetcher.retries == 2
+
+
+async def test_fetch_raises_after_exhausting_retries(flaky_server):
+    fetcher = make_fetcher()
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(FetchError) as excinfo:
+            await fetcher.fetch(session, str(flaky_server.make_url("/down")), {})
+
+    assert excinfo.value.status == 500
+    assert flaky_server.calls["down"] == 3
+
+
+async def test_fetch_returns_non_retryable_status(flaky_server):
+    fetcher = make_fetcher()
+    async with aiohttp.ClientSession() as session:
+        page = await fetcher.fetch(session, str(flaky_server.make_url("/missing")), {})
+
+    assert page.status == 404
+    assert page.html is None
+
+
+async def test_circuit_opens_and_fails_fast(flaky_server):
+    fetcher = make_fetcher(failure_threshold=3, reset_timeout=60)
+    async with aiohttp.ClientSession() as session:
+        with pytest.raises(FetchError):
+            await fetcher.fetch(session, str(flaky_server.make_url("/down")), {})
+        with pytest.raises(CircuitOpenError):
+            await fetcher.fetch(session, str(flaky_server.make_url("/flaky")), {})
+
+    assert flaky_server.calls["flaky"] == 0
+
+
+async def test_failed_half_open_trial_lets_the_next_trial_through(flaky_server):
+    fetcher = make_fetcher(failure_threshold=1, reset_timeout=0, max_body_bytes=1024)
+    async with create_session(HttpClientSettings()) as session:
+        with pytest.raises(FetchError):
+            await fetcher.fetch(session, str(flaky_server.make_url("/down")), {})
+        # The half-open trial fails on its body instead of its status
+        with pytest.raises(ResponseTooLargeError):
+            await fetcher.fetch(session, str(flaky_server.make_url("/large")), {})
+        page = await fetcher.fetch(session, str(flaky_server.make_url("/flaky")), {})
+
+    assert page.status == 200
+
+
+def test_circuit_breaker_half_open_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.is_open
+
+    # After the reset timeout a single trial request is allowed through
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_retry_policy_honours_retry_after():
+    policy = RetryPolicy(base_delay=1, max_delay=10)
+    assert policy.delay(1, retry_after="3") == 3
+    assert policy.delay(1, retry_after="120") == 10
+    assert 0 <= policy.delay(3) <= 4
@@ -0,0 +1,189 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+from core.db.loaders import BulkArticleLoader, load_data_bulk
+from core.db.models import Article, Base, Blogger, Category, article_categories
+from core.db.parallel_load import load_data_parallel, plan_partitions
+
+
+def make_article(i, blogger="Blogger A", categories=("Ποδόσφαιρο",)):
+    return {
+        "categories": list(categories),
+        "date": "01/02/2025 - 12:00",
+        "title": f"Άρθρο {i}",
+        "article_url": f"https://www.gazzetta.gr/article/{i}",
+        "content": f"Κείμενο {i}",
+        "blogger_name": blogger,
+        "blogger_url": f"https://www.gazzetta.gr/blogger/{blogger}",
+    }
+
+
+def count(db, table):
+    return db.scalar(select(func.count()).select_from(table))
+
+
+def test_bulk_loader_inserts_chunk_with_constant_queries(test_db):
+    articles = [
+        make_article(i, blogger=f"Blogger {i % 3}", categories=("A", f"C{i % 4}"))
+        for i in range(50)
+    ]
+    statements = []
+    event.listen(
+        test_db.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    loader = BulkArticleLoader(test_db)
+    assert loader.load_chunk(articles) == 50
+    test_db.commit()
+
+    # Existing URLs, bloggers (select + insert), categories (select + insert),
+    # articles and article_categories: independent of the chunk size.
+    assert len(statements) <= 8
+    assert count(test_db, Article) == 50
+    assert count(test_db, Blogger) == 3
+    assert count(test_db, Category) == 5
+    assert count(test_db, article_categories) == 100
+
+    article = test_db.execute(
+        select(Article).where(Article.article_url.endswith("/article/7"))
+    ).scalar_one()
+    assert article.blogger.name == "Blogger 1"
+    assert article.published_date == datetime(2025, 2, 1, 12, 0)
+    assert {c.name for c in article.categories} == {"A", "C3"}
+
+
+def test_bulk_loader_skips_existing_rows(test_db):
+    loader = BulkArticleLoader(test_db)
+    loader.load_chunk([make_article(1), make_article(2)])
+    test_db.commit()
+
+    # A fresh loader has no cached ids and must find existing rows in the db
+    loader = BulkArticleLoader(test_db)
+    inserted = loader.load_chunk(
+        [make_article(2), make_article(3), make_article(3, blogger="Blogger B")]
+    )
+    test_db.commit()
+
+    assert inserted == 1
+    assert count(test_db, Article) == 3
+    assert count(test_db, Blogger) == 1
+    assert count(test_db, Category) == 1
+
+
+def test_load_data_bulk_reads_nested_exports(test_db, tmp_path):
+    export = tmp_path / "gazzetta_bloggers_articles.json"
+    export.write_text(
+        json.dumps(
+            [
+                {
+                    "name": "Blogger A",
+                    "profile_url": "https://www.gazzetta.gr/blogger/a",
+                    "articles": [
+                        {**make_article(i), "date": "2025-02-01 12:00:00"}
+                        for i in range(5)
+                    ],
+                }
+            ],
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+
+    assert load_data_bulk(test_db, export, chunk_size=2) == 5
+    assert load_data_bulk(test_db, export, chunk_size=2) == 0
+
+    blogger = test_db.execute(select(Blogger)).scalar_one()
+    assert blogger.profile_url == "https://www.gazzetta.gr/blogger/a"
+    assert len(blogger.articles) == 5
+
+
+def test_load_data_bulk_resumes_after_crash(test_db, tmp_path, monkeypatch):
+    store = tmp_path / "scraped_articles.jsonl"
+    store.write_text(
+        "".join(json.dumps(make_article(i)) + "\n" for i in range(10)),
+        encoding="utf-8",
+    )
+    load_chunk = BulkArticleLoader.load_chunk
+    chunks = []
+
+    def crash_on_third_chunk(self, articles):
+        chunks.append([a["article_url"] for a in articles])
+        if len(chunks) == 3:
+            raise KeyboardInterrupt
+        return load_chunk(self, articles)
+
+    monkeypatch.setattr(BulkArticleLoader, "load_chunk", crash_on_third_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        load_data_bulk(test_db, store, chunk_size=3)
+    test_db.rollback()
+    assert count(test_db, Article) == 6
+
+    # The second run starts at the chunk that was interrupted
+    assert load_data_bulk(test_db, store, chunk_size=3) == 10
+    assert chunks[3][0].endswith("/article/6")
+    assert count(test_db, Article) == 10
+    assert not (tmp_path / "scraped_articles.jsonl.checkpoint").exists()
+
+
+def test_load_data_bulk_retries_failed_batches(test_db, tmp_path, monkeypatch):
+    store = tmp_path / "scraped_articles.jsonl"
+    store.write_text(
+        "".join(json.dumps(make_article(i)) + "\n" for i in range(10)),
+        encoding="utf-8",
+    )
+    load_chunk = BulkArticleLoader.load_chunk
+    calls = []
+
+    def fail_second_chunk_once(self, articles):
+        calls.append(articles[0]["article_url"])
+        if len(calls) == 2:
+            raise RuntimeError("server closed the connection unexpectedly")
+        return load_chunk(self, articles)
+
+    monkeypatch.setattr(BulkArticleLoader, "load_chunk", fail_second_chunk_once)
+    assert load_data_bulk(test_db, store, chunk_size=3) == 7
+    checkpoint = tmp_path / "scraped_articles.jsonl.checkpoint"
+    assert checkpoint.exists()
+
+    # The next run retries only the failed chunk
+    assert load_data_bulk(test_db, store, chunk_size=3) == 10
+    assert calls[4:] == ["https://www.gazzetta.gr/article/3"]
+    assert count(test_db, Article) == 10
+    assert not checkpoint.exists()
+
+
+def test_load_data_parallel_splits_work_across_processes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'parallel.db'}")
+    Base.metadata.create_all(engine)
+    store = tmp_path / "scraped_articles.jsonl"
+    store.write_text(
+        "".join(
+            json.dumps(
+                make_article(
+                    i, blogger=f"Blogger {i % 4}", categories=("A", f"C{i % 3}")
+                )
+            )
+            + "\n"
+            # Every URL appears twice, in different partitions
+            for i in list(range(40)) * 2
+        ),
+        encoding="utf-8",
+    )
+
+    partitions, bloggers, categories = plan_partitions(store, chunk_size=15)
+    assert [count for _, count in partitions] == [15] * 5 + [5]
+    assert len(bloggers) == 4
+    assert categories == {"A", "C0", "C1", "C2"}
+
+    with Session(engine) as db:
+        assert load_data_parallel(db, store, workers=2, chunk_size=15) == 40
+        assert load_data_parallel(db, store, workers=2, chunk_size=15) == 0
+        assert count(db, Article) == 40
+        assert count(db, Blogger) == 4
+        assert count(db, article_categories) == 80
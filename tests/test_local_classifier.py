@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import select
+
+from core.db.models import Article, StancePrediction
+from core.nlp.stance_predictor import classify_article_with_explanation
+
+pytest.importorskip("sklearn")
+
+from core.nlp.local_classifier import (  # noqa: E402
+    LocalStanceClassifier,
+    evaluate_local_classifier,
+    load_labels,
+    predict_local,
+    train_local_classifier,
+)
+
+PAOK = ("ΠΑΟΚ", "club")
+PHRASES = {
+    "θετική": "Ο ΠΑΟΚ έπαιξε εξαιρετικά και κέρδισε δίκαια",
+    "αρνητική": "Ο ΠΑΟΚ απογοήτευσε με άσχημη εμφάνιση και ήττα",
+    "ουδέτερη": "Ο ΠΑΟΚ δίνει το παιχνίδι της αγωνιστικής την Κυριακή",
+}
+
+
+def add_labelled_articles(db, per_stance=20):
+    for i in range(per_stance):
+        for stance, phrase in PHRASES.items():
+            article = Article(
+                title=f"{stance} {i}",
+                content=f"{phrase}. Σχόλιο {i}.",
+                article_url=f"https://a/{stance}/{i}",
+            )
+            db.add(article)
+            db.flush()
+            db.add(
+                StancePrediction(
+                    article_id=article.id,
+                    target=PAOK[0],
+                    target_type=PAOK[1],
+                    stance=stance,
+                    justification="LLM",
+                )
+            )
+    db.commit()
+
+
+def test_train_reports_agreement_on_holdout(test_db):
+    add_labelled_articles(test_db)
+
+    classifier, report = train_local_classifier(test_db, holdout=0.25)
+
+    assert classifier.targets == [PAOK]
+    assert report[PAOK]["articles"] == 15
+    assert report[PAOK]["accuracy"] > 0.9
+    stance, justification = classify_article_with_explanation(
+        classifier, "Ο ΠΑΟΚ κέρδισε δίκαια, έπαιξε εξαιρετικά!", *PAOK
+    )
+    assert stance == "θετική"
+    assert "τοπικού μοντέλου" in justification
+
+
+def test_local_predictions_are_not_training_labels(test_db, tmp_path):
+    add_labelled_articles(test_db, per_stance=10)
+    classifier, _ = train_local_classifier(test_db, holdout=0)
+    classifier.save(tmp_path / "model.joblib")
+    classifier = LocalStanceClassifier.load(tmp_path / "model.joblib")
+
+    test_db.add_all(
+        Article(title=f"Νέο {i}", content=PHRASES["αρνητική"], article_url=f"n/{i}")
+        for i in range(5)
+    )
+    test_db.commit()
+    new_articles = test_db.execute(
+        select(Article.id, Article.content).where(Article.title.startswith("Νέο"))
+    )
+
+    assert predict_local(test_db, new_articles, [PAOK], classifier, batch_size=2) == 5
+    local = test_db.execute(
+        select(StancePrediction).where(StancePrediction.source == "local")
+    ).scalars()
+    assert {p.stance for p in local} == {"αρνητική"}
+
+    texts, labels = load_labels(test_db)
+    assert len(texts) == len(labels[PAOK][0]) == 30
+    assert evaluate_local_classifier(test_db, classifier)[PAOK]["accuracy"] == 1.0
+
+    with pytest.raises(ValueError, match="ΑΕΚ"):
+        classifier.predict_batch(["κείμενο"], [("ΑΕΚ", "club")])
+
+
+def test_local_run_keeps_llm_labels(test_db):
+    add_labelled_articles(test_db, per_stance=10)
+    classifier, _ = train_local_classifier(test_db, holdout=0)
+    labelled = test_db.execute(
+        select(StancePrediction.article_id, StancePrediction.stance)
+    ).all()
+
+    # A forced run rescoring every article, labelled ones included
+    articles = test_db.execute(select(Article.id, Article.content)).all()
+    predict_local(test_db, articles, [PAOK], classifier)
+
+    rows = test_db.execute(
+        select(
+            StancePrediction.article_id,
+            StancePrediction.stance,
+            StancePrediction.source,
+        )
+    ).all()
+    assert {(article_id, stance, "llm") for article_id, stance in labelled} == set(rows)
@@ -0,0 +1,337 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from openai import AsyncOpenAI
+from sqlalchemy import event, select
+
+from core.db.models import Article, StancePrediction
+from core.nlp.cache import ResponseCache
+from core.nlp.engine import (
+    PredictionEngine,
+    PredictionResult,
+    PredictionWriter,
+    TokenBucket,
+    upsert_predictions,
+)
+from core.nlp.prefilter import TargetMatcher
+
+
+@pytest.fixture
+async def stub_api():
+    """Chat completions stub: slow replies, a 429 burst, one broken article."""
+    state = {
+        "calls": 0,
+        "in_flight": 0,
+        "peak": 0,
+        "rate_limited": 0,
+        "multi_target_calls": 0,
+    }
+
+    async def completions(request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        state["calls"] += 1
+        if state["calls"] <= 3:
+            state["rate_limited"] += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "requests"}},
+                status=429,
+                headers={"retry-after-ms": "50"},
+            )
+        if "σπασμένο" in prompt:
+            return web.json_response(
+                {"error": {"message": "bad request", "type": "invalid"}}, status=400
+            )
+
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.05)
+        state["in_flight"] -= 1
+
+        stance = "αρνητική" if "διαιτητής" in prompt else "θετική"
+        content = f"{stance}\nΑιτιολόγηση"
+        if "response_format" in body:
+            state["multi_target_calls"] += 1
+            schema = body["response_format"]["json_schema"]["schema"]
+            item = schema["properties"]["predictions"]["items"]
+            content = json.dumps(
+                {
+                    "predictions": [
+                        {"target": target, "stance": stance, "justification": "Α"}
+                        for target in item["properties"]["target"]["enum"]
+                    ]
+                }
+            )
+        return web.json_response(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {
+                            "role": "assistant",
+                            "content": content,
+                        },
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 100,
+                    "completion_tokens": 10,
+                    "total_tokens": 110,
+                },
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    server = TestServer(app)
+    await server.start_server()
+    client = AsyncOpenAI(
+        base_url=str(server.make_url("/v1")), api_key="test", max_retries=0
+    )
+    yield client, state
+    await client.close()
+    await server.close()
+
+
+def add_articles(db, texts):
+    articles = [
+        Article(title=f"Άρθρο {i}", content=text, article_url=f"https://a/{i}")
+        for i, text in enumerate(texts)
+    ]
+    db.add_all(articles)
+    db.commit()
+    return [(article.id, article.content) for article in articles]
+
+
+async def test_engine_classifies_concurrently_and_writes(
+    stub_api, threaded_session_factory
+):
+    client, state = stub_api
+    db = threaded_session_factory()
+    texts = ["Η ομάδα έπαιξε εξαιρετικά."] * 30 + ["Ο διαιτητής έκανε λάθη."] * 9
+    articles = add_articles(db, texts + ["σπασμένο άρθρο"])
+
+    writer = PredictionWriter(db, batch_size=8)
+    engine = PredictionEngine(
+        client,
+        [("διαιτησία", "referee")],
+        writer,
+        concurrency=8,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        base_delay=0.01,
+    )
+    started = time.monotonic()
+    stats = await engine.run(articles)
+    elapsed = time.monotonic() - started
+
+    assert stats.completed == 39
+    assert stats.failed == 1
+    assert stats.rate_limited == state["rate_limited"] == 3
+    assert stats.prompt_tokens == 39 * 100
+    assert state["peak"] == 8
+    # 39 requests of 50ms each with 8 in flight, far below sequential time
+    assert elapsed < 39 * 0.05 / 2
+
+    predictions = db.execute(select(StancePrediction)).scalars().all()
+    assert len(predictions) == 39
+    assert sum(p.stance == "αρνητική" for p in predictions) == 9
+    assert {p.justification for p in predictions} == {"Αιτιολόγηση"}
+    db.close()
+
+
+async def test_writer_updates_existing_predictions(threaded_session_factory):
+    db = threaded_session_factory()
+    [(article_id, _)] = add_articles(db, ["κείμενο"])
+    db.add(
+        StancePrediction(
+            article_id=article_id, target="ΠΑΟΚ", target_type="club", stance="θετική"
+        )
+    )
+    db.commit()
+
+    writer = PredictionWriter(db, flush_interval=0.01)
+    await writer.put(PredictionResult(article_id, "ΠΑΟΚ", "club", "αρνητική", "νέα"))
+    await writer.close()
+
+    prediction = db.execute(select(StancePrediction)).scalar_one()
+    assert (prediction.stance, prediction.justification) == ("αρνητική", "νέα")
+    db.close()
+
+
+async def test_engine_scores_all_targets_in_one_call(
+    stub_api, threaded_session_factory
+):
+    client, state = stub_api
+    state["calls"] = 3  # skip the 429 burst
+    db = threaded_session_factory()
+    articles = add_articles(db, ["Ο διαιτητής έκανε λάθη."] * 4)
+    targets = [("ΠΑΟΚ", "club"), ("ΑΕΚ", "club"), ("διαιτησία", "referee")]
+
+    engine = PredictionEngine(
+        client, targets, PredictionWriter(db), requests_per_minute=0
+    )
+    stats = await engine.run(articles)
+
+    assert stats.completed == 4
+    assert stats.predictions == 12
+    assert state["multi_target_calls"] == 4
+    rows = db.execute(
+        select(StancePrediction.target, StancePrediction.target_type)
+    ).all()
+    assert sorted(rows) == sorted(targets * 4)
+    db.close()
+
+
+async def test_engine_prefilter_skips_unmentioned_targets(
+    stub_api, threaded_session_factory
+):
+    client, state = stub_api
+    state["calls"] = 3  # skip the 429 burst
+    db = threaded_session_factory()
+    articles = add_articles(
+        db,
+        ["Ο ΠΑΟΚ κέρδισε, ο διαιτητής έκανε λάθη."] * 2
+        + ["Ο Δικέφαλος του Βορρά νίκησε."] * 3
+        + ["Η Εθνική ετοιμάζεται για το Euro."] * 5,
+    )
+    targets = [("ΠΑΟΚ", "club"), ("διαιτησία", "referee")]
+
+    engine = PredictionEngine(
+        client,
+        targets,
+        PredictionWriter(db),
+        requests_per_minute=0,
+        prefilter=TargetMatcher(targets),
+    )
+    stats = await engine.run(articles)
+
+    assert (stats.completed, stats.skipped) == (10, 5)
+    assert stats.predictions == 20
+    assert stats.auto_neutral == 3 + 5 * 2
+    # Only articles mentioning both targets need a multi-target request
+    assert state["calls"] - 3 == 5
+    assert state["multi_target_calls"] == 2
+    rows = db.execute(select(StancePrediction.source, StancePrediction.stance)).all()
+    assert sorted(set(rows)) == [
+        ("llm", "αρνητική"),
+        ("llm", "θετική"),
+        ("prefilter", "ουδέτερη"),
+    ]
+    db.close()
+
+
+async def test_engine_reads_articles_off_the_event_loop(
+    stub_api, threaded_session_factory
+):
+    client, state = stub_api
+    state["calls"] = 3  # skip the 429 burst
+    db = threaded_session_factory()
+    articles = add_articles(db, ["Ο διαιτητής έκανε λάθη."] * 6)
+    loop_thread = threading.get_ident()
+    reader_threads = set()
+
+    def pending():
+        # Stands in for iter_pending_articles, which fetches pages as it goes
+        for article in articles:
+            reader_threads.add(threading.get_ident())
+            yield article
+
+    engine = PredictionEngine(
+        client,
+        [("διαιτησία", "referee")],
+        PredictionWriter(db),
+        concurrency=2,
+        requests_per_minute=0,
+    )
+    stats = await engine.run(pending())
+
+    assert stats.completed == 6
+    assert reader_threads and loop_thread not in reader_threads
+    db.close()
+
+
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate_per_minute=600, capacity=5)
+    started = time.monotonic()
+    for _ in range(10):
+        await bucket.acquire()
+    # 5 from the full bucket, 5 more refilled at 10 per second
+    assert 0.4 < time.monotonic() - started < 1.0
+
+
+async def test_engine_skips_api_for_cached_replies(
+    stub_api, threaded_session_factory, tmp_path
+):
+    client, state = stub_api
+    state["calls"] = 3  # skip the 429 burst
+    db = threaded_session_factory()
+    articles = add_articles(db, ["Η ομάδα έπαιξε εξαιρετικά."] * 5)
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+
+    def make_engine():
+        return PredictionEngine(
+            client,
+            [("ΠΑΟΚ", "club")],
+            PredictionWriter(db),
+            concurrency=1,
+            requests_per_minute=0,
+            cache=cache,
+        )
+
+    first = await make_engine().run(articles)
+    calls = state["calls"]
+    second = await make_engine().run(articles)
+
+    assert (first.completed, first.cached) == (5, 4)
+    assert (second.completed, second.cached) == (5, 5)
+    assert state["calls"] == calls
+    cache.close()
+    db.close()
+
+
+def test_upsert_writes_a_batch_in_one_statement(test_db):
+    articles = add_articles(test_db, ["κείμενο"] * 3)
+    upsert_predictions(
+        test_db, [PredictionResult(articles[0][0], "ΠΑΟΚ", "club", "θετική", "α")]
+    )
+    statements = []
+    event.listen(
+        test_db.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    upsert_predictions(
+        test_db,
+        [
+            PredictionResult(article_id, "ΠΑΟΚ", "club", "αρνητική", "β")
+            for article_id, _ in articles
+        ]
+        # A later result for the same key wins
+        + [PredictionResult(articles[1][0], "ΠΑΟΚ", "club", "ουδέτερη", "γ")],
+    )
+
+    # One for the predictions, one logging their aggregate cells
+    assert [s.split()[2] for s in statements if s.lstrip().startswith("INSERT")] == [
+        "stance_predictions",
+        "stance_aggregate_changes",
+    ]
+    rows = test_db.execute(
+        select(StancePrediction.article_id, StancePrediction.stance)
+    ).all()
+    assert sorted(rows) == [
+        (articles[0][0], "αρνητική"),
+        (articles[1][0], "ουδέτερη"),
+        (articles[2][0], "αρνητική"),
+    ]
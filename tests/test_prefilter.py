@@ -0,0 +1,42 @@
+import pytest
+
+from core.nlp.prefilter import TargetMatcher, stem
+
+TARGETS = [
+    ("Ολυμπιακός", "club"),
+    ("Παναθηναϊκός", "club"),
+    ("ΠΑΟΚ", "club"),
+    ("διαιτησία", "referee"),
+]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Νίκη του Ολυμπιακού στο Φάληρο", {"Ολυμπιακός"}),
+        ("Ο Θρύλος πήρε το ντέρμπι", {"Ολυμπιακός"}),
+        ("Το ΠΑΟ κέρδισε με 2-0", {"Παναθηναϊκός"}),
+        ("Ο ΠΑΟΚ κέρδισε με 2-0", {"ΠΑΟΚ"}),
+        ("Οι ασπρόμαυροι προκρίθηκαν", {"ΠΑΟΚ"}),
+        ("Το VAR ακύρωσε το γκολ", {"διαιτησία"}),
+        ("Κόκκινη Κάρτα στο 80'", {"διαιτησία"}),
+        (
+            "ΟΣΦΠ - ΠΑΟ: ο διαιτητής του αγώνα",
+            {"Ολυμπιακός", "Παναθηναϊκός", "διαιτησία"},
+        ),
+        ("Η Εθνική ετοιμάζεται για το Euro", set()),
+    ],
+)
+def test_matcher_finds_aliases_and_inflections(text, expected):
+    mentioned = TargetMatcher(TARGETS).mentioned(text)
+    assert {target for target, _ in mentioned} == expected
+
+
+def test_stem_keeps_short_words():
+    assert stem("ολυμπιακου") == "ολυμπιακ"
+    assert stem("αρης") == "αρη"
+    assert stem("παο") == "παο"
+
+
+def test_matcher_handles_missing_content():
+    assert TargetMatcher(TARGETS).mentioned(None) == set()
@@ -0,0 +1,80 @@
+from unittest.mock import Mock
+
+from core.nlp.cache import ResponseCache, cache_key
+from core.nlp.prompts import MODEL
+from core.nlp.stance_predictor import classify_article_with_explanation
+
+
+def test_cache_key_ignores_whitespace_but_not_targets():
+    key = cache_key(MODEL, [("ΠΑΟΚ", "club")], "Η ομάδα  έπαιξε\n καλά. ")
+    assert key == cache_key(MODEL, [("ΠΑΟΚ", "club")], "Η ομάδα έπαιξε καλά.")
+    assert key != cache_key(MODEL, [("ΑΕΚ", "club")], "Η ομάδα έπαιξε καλά.")
+    assert key != cache_key("other-model", [("ΠΑΟΚ", "club")], "Η ομάδα έπαιξε καλά.")
+
+
+def test_cache_counts_hits_and_persists(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path)
+    assert cache.get("a") is None
+    cache.put("a", "θετική\nΑιτιολόγηση")
+    assert cache.get("a") == "θετική\nΑιτιολόγηση"
+    cache.close()
+
+    cache = ResponseCache(path)
+    assert cache.get("a") == "θετική\nΑιτιολόγηση"
+    stats = cache.stats()
+    cache.close()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+
+def test_cache_buffers_lookups_until_flushed(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path, flush_interval=3600)
+    cache.put("a", "θετική")
+    for _ in range(5):
+        cache.get("a")
+        cache.get("b")
+
+    reader = ResponseCache(path)
+    assert (reader.stats()["hits"], reader.stats()["misses"]) == (0, 0)
+    cache.flush()
+    assert (reader.stats()["hits"], reader.stats()["misses"]) == (5, 5)
+    reader.close()
+    cache.close()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    # Lookups stay buffered, and eviction still sees them
+    cache = ResponseCache(
+        tmp_path / "responses.sqlite", max_bytes=300, flush_interval=3600
+    )
+    for key in "abc":
+        cache.put(key, key * 100)
+    cache.get("a")
+    cache.put("d", "d" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.total_bytes <= 300
+    assert cache.stats()["evictions"] >= 1
+    cache.close()
+
+
+def test_classify_reuses_cached_reply(tmp_path):
+    client = Mock()
+    client.chat.completions.create.return_value.choices = [
+        Mock(message=Mock(content="θετική\nΘετική αναφορά"))
+    ]
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+
+    first = classify_article_with_explanation(
+        client, "Η ομάδα κέρδισε.", "ΠΑΟΚ", cache=cache
+    )
+    second = classify_article_with_explanation(
+        client, "Η ομάδα  κέρδισε.\n", "ΠΑΟΚ", cache=cache
+    )
+
+    assert first == second == ("θετική", "Θετική αναφορά")
+    assert client.chat.completions.create.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
@@ -0,0 +1,308 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from core.db.models import Article, Blogger
+from data_collection.fetcher import FetchError, Page
+from data_collection.scheduler import CrawlScheduler, HostLimiter, TaskKind
+from data_collection.scraper_gazzetta_async import GazzettaBloggerScraper
+from data_collection.sinks import DatabaseArticleSink
+from data_collection.storage import DeadLetterQueue
+
+FIXTURES = Path(__file__).parent / "fixtures" / "gazzetta"
+
+
+def fixture_html(name):
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def make_scraper(tmp_path, broken_urls=(), **kwargs):
+    """Scraper whose fetches are served from the saved fixture pages."""
+    scraper = GazzettaBloggerScraper(output_dir=tmp_path, rate_limit=0, **kwargs)
+    base = scraper.base_url
+    article = fixture_html("article.html")
+    pages = {
+        f"{base}/bloggers?page=0": fixture_html("bloggers.html"),
+        f"{base}/blogger/kostas-nikolakopoulos?page=0": fixture_html("profile.html"),
+        f"{base}/football/article/1001/o-thrylos-kai-to-var": article,
+        f"{base}/football/superleague/article/1002/i-diaitisia-sto-derby": article,
+        f"{base}/football/article/1003/i-aek-sto-oaka": article,
+    }
+
+    async def fake_fetch(session, url, conditional=False):
+        # Behave like a server whose pages never change: every page carries
+        # an ETag and revalidation requests get a 304.
+        if url in broken_urls:
+            raise FetchError(url, "HTTP 503", 503)
+        if url not in pages:
+            return Page(404)
+        if conditional and scraper.crawl_state.conditional_headers(url):
+            return Page(304)
+        return Page(200, pages[url], etag=f'"{hash(url)}"')
+
+    scraper._fetch_page = fake_fetch
+    return scraper
+
+
+async def test_scheduler_runs_articles_before_listing_pages():
+    scheduler = CrawlScheduler(workers=1, report_interval=0)
+    order = []
+
+    async def handler(task):
+        order.append(task.kind)
+
+    scheduler.submit(TaskKind.LISTING, "https://example.com/l")
+    scheduler.submit(TaskKind.PROFILE, "https://example.com/p")
+    scheduler.submit(TaskKind.ARTICLE, "https://example.com/a")
+    stats = await scheduler.run(handler)
+
+    assert order == [TaskKind.ARTICLE, TaskKind.PROFILE, TaskKind.LISTING]
+    assert stats.completed[TaskKind.ARTICLE] == 1
+
+
+async def test_host_limiter_caps_concurrency_per_host():
+    limiter = HostLimiter(max_concurrency=2, requests_per_second=0)
+    in_flight = {"a.gr": 0, "b.gr": 0}
+    peak = {"a.gr": 0, "b.gr": 0}
+
+    async def request(host):
+        async with limiter.acquire(f"https://{host}/page"):
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+
+    await asyncio.gather(*(request(h) for h in ["a.gr", "b.gr"] * 5))
+    assert peak == {"a.gr": 2, "b.gr": 2}
+
+
+async def test_crawl_scrapes_target_blogger(tmp_path):
+    scraper = make_scraper(tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"])
+    bloggers = await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    stored = list(scraper.store.iter_articles("Κώστας Νικολακόπουλος"))
+    scraper.close()
+
+    assert [b["name"] for b in bloggers] == ["Κώστας Νικολακόπουλος"]
+    assert scraper.scheduler.stats.articles == 3
+    assert "Κώστας Νικολακόπουλος" in scraper.completed_bloggers
+
+    assert {a["title"] for a in stored} == {
+        "Ο Θρύλος και το VAR",
+        "Η διαιτησία στο ντέρμπι",
+        "Η ΑΕΚ στο ΟΑΚΑ",
+    }
+    derby = next(a for a in stored if a["title"] == "Η διαιτησία στο ντέρμπι")
+    assert derby["categories"] == ["Super League", "Ολυμπιακός"]
+    assert derby["content"].startswith("Ο Ολυμπιακός κέρδισε")
+    assert "Διαφήμιση" not in derby["content"]
+
+
+async def test_crawl_respects_max_articles(tmp_path):
+    scraper = make_scraper(
+        tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"], max_articles_per_blogger=2
+    )
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+
+    assert scraper.scheduler.stats.articles == 2
+
+
+async def test_incremental_run_stops_at_known_content(tmp_path):
+    scraper = make_scraper(tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"])
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+    assert scraper.crawl_state.high_water_mark("Κώστας Νικολακόπουλος") == (
+        "https://www.gazzetta.gr/football/article/1001/o-thrylos-kai-to-var"
+    )
+
+    # Second run without validators: page 0 only holds known articles, so the
+    # blogger's archive is not paginated any further.
+    scraper = make_scraper(
+        tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"], incremental=True
+    )
+    scraper.crawl_state.pages.clear()
+    fetched = []
+    fetch_page = scraper._fetch_page
+
+    async def recording_fetch(session, url, conditional=False):
+        fetched.append(url)
+        return await fetch_page(session, url, conditional)
+
+    scraper._fetch_page = recording_fetch
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+
+    assert scraper.scheduler.stats.articles == 0
+    assert not any("kostas-nikolakopoulos?page=1" in url for url in fetched)
+
+
+async def test_incremental_run_uses_conditional_requests(tmp_path):
+    scraper = make_scraper(tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"])
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+
+    scraper = make_scraper(
+        tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"], incremental=True
+    )
+    bloggers = await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+
+    # The bloggers listing and profile page are served as 304s from the
+    # stored validators, and the cached blogger list is reused.
+    assert [b["name"] for b in bloggers] == ["Κώστας Νικολακόπουλος"]
+    assert scraper.crawl_state.conditional_headers(
+        "https://www.gazzetta.gr/blogger/kostas-nikolakopoulos?page=0"
+    )
+    assert scraper.scheduler.stats.articles == 0
+
+
+async def test_failed_articles_are_dead_lettered_and_retried(tmp_path):
+    derby_url = (
+        "https://www.gazzetta.gr/football/superleague/article/1002/"
+        "i-diaitisia-sto-derby"
+    )
+    scraper = make_scraper(
+        tmp_path, broken_urls={derby_url}, target_bloggers=["Κώστας Νικολακόπουλος"]
+    )
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+
+    # The failed article is neither saved nor marked as scraped, and the
+    # blogger is not marked completed while it sits in the dead-letter queue.
+    assert scraper.scheduler.stats.articles == 2
+    assert derby_url not in scraper.store.urls
+    assert "Κώστας Νικολακόπουλος" not in scraper.completed_bloggers
+    entries = scraper.dead_letters.entries()
+    assert [(e["kind"], e["url"], e["attempts"]) for e in entries] == [
+        ("article", derby_url, 1)
+    ]
+
+    scraper = make_scraper(tmp_path)
+    retried = await scraper.retry_failed(
+        None, CrawlScheduler(workers=4, report_interval=0)
+    )
+    scraper.close()
+
+    assert retried == 1
+    assert derby_url in scraper.store.urls
+    assert scraper.dead_letters.entries() == []
+    assert "Κώστας Νικολακόπουλος" in scraper.completed_bloggers
+
+
+async def test_retry_failed_counts_recovered_pages_and_drops_missing_ones(tmp_path):
+    base = "https://www.gazzetta.gr/football"
+    derby_url = f"{base}/superleague/article/1002/i-diaitisia-sto-derby"
+    down_url = f"{base}/article/1004/o-server-peftei"
+    missing_url = f"{base}/article/1005/diagrafike"
+    dead_letters = DeadLetterQueue(tmp_path)
+    for url, status in [(derby_url, 503), (down_url, 503), (missing_url, 404)]:
+        payload = {"article": {"title": "", "article_url": url}, "blogger_name": "X"}
+        dead_letters.add("article", url, payload, f"HTTP {status}", status=status)
+
+    scraper = make_scraper(tmp_path, broken_urls={down_url})
+    fetched = []
+    fetch_page = scraper._fetch_page
+
+    async def recording_fetch(session, url, conditional=False):
+        fetched.append(url)
+        return await fetch_page(session, url, conditional)
+
+    scraper._fetch_page = recording_fetch
+    recovered = await scraper.retry_failed(
+        None, CrawlScheduler(workers=4, report_interval=0)
+    )
+    scraper.close()
+
+    # Only the derby article came back; the 404 was dropped without a fetch
+    # and the page that still fails stays queued with one more attempt.
+    assert recovered == 1
+    assert missing_url not in fetched
+    assert [(e["url"], e["attempts"]) for e in dead_letters.entries()] == [
+        (down_url, 2)
+    ]
+
+
+async def test_database_sink_streams_articles_into_models(
+    tmp_path, threaded_session_factory
+):
+    session_factory = threaded_session_factory
+    sink = DatabaseArticleSink(session_factory, batch_size=2, flush_interval=0.05)
+    scraper = make_scraper(
+        tmp_path, target_bloggers=["Κώστας Νικολακόπουλος"], article_sink=sink
+    )
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+
+    assert scraper.store is None
+    assert sink.inserted == 3
+    with session_factory() as db:
+        articles = db.execute(select(Article)).scalars().all()
+        assert len(articles) == 3
+        blogger = db.execute(select(Blogger)).scalar_one()
+        assert blogger.name == "Κώστας Νικολακόπουλος"
+        assert blogger.profile_url.endswith("/blogger/kostas-nikolakopoulos")
+        derby = next(a for a in articles if a.title == "Η διαιτησία στο ντέρμπι")
+        assert {c.name for c in derby.categories} == {"Super League", "Ολυμπιακός"}
+
+    # A new sink looks up which URLs the database already holds.
+    sink = DatabaseArticleSink(session_factory)
+    urls = {a.article_url for a in articles}
+    new_url = "https://www.gazzetta.gr/football/article/1/new"
+    assert await sink.known(urls | {new_url}) == urls
+    sink.close()
+
+
+async def test_retry_failed_recovers_into_the_database_sink(
+    tmp_path, threaded_session_factory
+):
+    derby_url = (
+        "https://www.gazzetta.gr/football/superleague/article/1002/"
+        "i-diaitisia-sto-derby"
+    )
+    sink = DatabaseArticleSink(threaded_session_factory, flush_interval=0.05)
+    scraper = make_scraper(
+        tmp_path,
+        broken_urls={derby_url},
+        target_bloggers=["Κώστας Νικολακόπουλος"],
+        article_sink=sink,
+    )
+    await scraper.crawl(None, CrawlScheduler(workers=4, report_interval=0))
+    scraper.close()
+    assert sink.inserted == 2
+
+    sink = DatabaseArticleSink(threaded_session_factory, flush_interval=0.05)
+    scraper = make_scraper(tmp_path, article_sink=sink)
+    recovered = await scraper.retry_failed(
+        None, CrawlScheduler(workers=4, report_interval=0)
+    )
+    scraper.close()
+
+    assert recovered == 1
+    assert sink.inserted == 1
+    assert not (tmp_path / "scraped_articles.jsonl").exists()
+    with threaded_session_factory() as db:
+        assert db.execute(select(func.count(Article.id))).scalar() == 3
+
+
+@pytest.mark.parametrize("with_dead_letters", [True, False])
+async def test_database_sink_forgets_failed_batches(
+    tmp_path, threaded_session_factory, with_dead_letters
+):
+    dead_letters = DeadLetterQueue(tmp_path) if with_dead_letters else None
+    sink = DatabaseArticleSink(
+        threaded_session_factory, flush_interval=0.05, dead_letters=dead_letters
+    )
+    url = "https://www.gazzetta.gr/football/article/1/broken"
+    # "title" is missing, so building the Article fails
+    await sink.write({"article_url": url, "blogger_name": "X", "content": "c"})
+    await sink.flush()
+    sink.close()
+
+    # The article is fetched again on the next run (or by retry-failed).
+    assert sink.inserted == 0
+    assert await sink.known([url]) == set()
+    if with_dead_letters:
+        entries = dead_letters.entries()
+        assert [(e["kind"], e["url"]) for e in entries] == [("article", url)]
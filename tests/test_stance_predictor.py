@@ -1,8 +1,19 @@
+import json
 from unittest.mock import Mock
 
 import pytest
+from sqlalchemy import event
 
-from core.nlp.stance_predictor import classify_article_with_explanation
+from core.db.models import Article, StancePrediction
+from core.nlp.prefilter import AUTO_NEUTRAL, TargetMatcher
+from core.nlp.prompts import parse_multi_target_reply
+from core.nlp.stance_predictor import (
+    classify_article_multi_target,
+    classify_article_with_explanation,
+    iter_pending_articles,
+    pending_articles_query,
+    resolve_targets,
+)
 
 
 @pytest.fixture
@@ -48,3 +59,140 @@ def test_classify_article_variations(
 
     assert stance == expected_stance
     assert justification == "Test explanation"
+
+
+TARGETS = [("ΠΑΟΚ", "club"), ("ΑΕΚ", "club"), ("διαιτησία", "referee")]
+
+
+def test_classify_article_prefilter_checks_the_requested_target(
+    mock_openai_client,
+):
+    prefilter = TargetMatcher([("Ολυμπιακός", "club"), ("ΠΑΟΚ", "club")])
+    article_text = "Ο ΠΑΟΚ κέρδισε εύκολα στην Τούμπα."
+
+    skipped = classify_article_with_explanation(
+        mock_openai_client, article_text, "Ολυμπιακός", prefilter=prefilter
+    )
+    mock_openai_client.chat.completions.create.assert_not_called()
+    classified = classify_article_with_explanation(
+        mock_openai_client, article_text, "ΠΑΟΚ", prefilter=prefilter
+    )
+
+    assert skipped == AUTO_NEUTRAL
+    assert classified[0] == "θετική"
+    mock_openai_client.chat.completions.create.assert_called_once()
+
+
+def test_classify_article_multi_target(mock_openai_client):
+    mock_openai_client.chat.completions.create.return_value.choices[
+        0
+    ].message.content = json.dumps(
+        {
+            "predictions": [
+                {"target": "ΠΑΟΚ", "stance": "θετική", "justification": "Νίκη"},
+                {"target": "ΑΕΚ", "stance": "Αρνητική", "justification": "Ήττα"},
+                {"target": "διαιτησία", "stance": "άγνωστη", "justification": ""},
+                {"target": "Άγνωστη ομάδα", "stance": "θετική", "justification": ""},
+            ]
+        }
+    )
+
+    results = classify_article_multi_target(mock_openai_client, "Κείμενο", TARGETS)
+
+    assert results == {
+        ("ΠΑΟΚ", "club"): ("θετική", "Νίκη"),
+        ("ΑΕΚ", "club"): ("αρνητική", "Ήττα"),
+        ("διαιτησία", "referee"): ("ουδέτερη", ""),
+    }
+    # The article text is sent once for all targets
+    [call] = mock_openai_client.chat.completions.create.call_args_list
+    assert call.kwargs["messages"][-1]["content"].count("Κείμενο") == 1
+    schema = call.kwargs["response_format"]["json_schema"]["schema"]
+    target_schema = schema["properties"]["predictions"]["items"]["properties"]
+    assert target_schema["target"]["enum"] == ["ΠΑΟΚ", "ΑΕΚ", "διαιτησία"]
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        "θετική",
+        '{"predictions": [{"target": "ΠΑΟΚ", "stance": "θετική"}]}',
+    ],
+)
+def test_parse_multi_target_reply_rejects_incomplete_output(reply):
+    with pytest.raises(ValueError):
+        parse_multi_target_reply(reply, TARGETS)
+
+
+def test_resolve_targets():
+    assert resolve_targets([], "referee") == [("διαιτησία", "referee")]
+    assert resolve_targets(["ΠΑΟΚ", "ΑΕΚ", "ΠΑΟΚ"], "club", referee=True) == TARGETS
+    with pytest.raises(ValueError):
+        resolve_targets([], "club")
+
+
+def test_pending_articles_query(test_db):
+    articles = [
+        Article(title=str(i), content="κείμενο", article_url=f"https://a/{i}")
+        for i in range(3)
+    ]
+    test_db.add_all(articles)
+    test_db.flush()
+    # Article 0 is fully scored, article 1 only for one target
+    for target, target_type in TARGETS:
+        test_db.add(
+            StancePrediction(
+                article_id=articles[0].id,
+                target=target,
+                target_type=target_type,
+                stance="ουδέτερη",
+            )
+        )
+    test_db.add(
+        StancePrediction(
+            article_id=articles[1].id,
+            target="ΠΑΟΚ",
+            target_type="club",
+            stance="θετική",
+        )
+    )
+    test_db.commit()
+
+    pending = test_db.execute(pending_articles_query(TARGETS)).all()
+    assert sorted(row.id for row in pending) == [articles[1].id, articles[2].id]
+    assert len(test_db.execute(pending_articles_query(TARGETS, force=True)).all()) == 3
+
+
+def test_iter_pending_articles_pages_by_id(test_db):
+    articles = [
+        Article(title=str(i), content=f"κείμενο {i}", article_url=f"https://a/{i}")
+        for i in range(7)
+    ]
+    test_db.add_all(articles)
+    test_db.flush()
+    test_db.add(
+        StancePrediction(
+            article_id=articles[3].id, target="ΠΑΟΚ", target_type="club", stance="θ"
+        )
+    )
+    test_db.commit()
+    expected = [article.id for i, article in enumerate(articles) if i != 3]
+    statements = []
+    event.listen(
+        test_db.get_bind(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    pending = list(iter_pending_articles(test_db, TARGETS[:1], page_size=2))
+
+    assert [article_id for article_id, _ in pending] == expected
+    assert pending[0][1] == "κείμενο 0"
+    # Three full pages and an empty one; no statement sorts at random
+    assert len(statements) == 4
+    assert not any("random" in statement for statement in statements)
+
+    limited = iter_pending_articles(test_db, TARGETS[:1], limit=3, page_size=2)
+    assert len(list(limited)) == 3
+    assert len(list(iter_pending_articles(test_db, TARGETS[:1], sample=100))) == 6
+    assert list(iter_pending_articles(test_db, TARGETS[:1], sample=0)) == []
@@ -0,0 +1,91 @@
+import json
+
+from data_collection.storage import (
+    JsonlArticleStore,
+    convert_legacy_json,
+)
+
+
+def make_article(i, blogger="Blogger A"):
+    return {
+        "categories": ["Ποδόσφαιρο"],
+        "date": "01/02/2025 - 12:00",
+        "title": f"Άρθρο {i}",
+        "article_url": f"https://www.gazzetta.gr/article/{i}",
+        "content": f"Κείμενο {i}",
+        "blogger_name": blogger,
+    }
+
+
+def test_append_and_reload_index(tmp_path):
+    with JsonlArticleStore(tmp_path, fsync_every=2) as store:
+        store.append(make_article(1))
+        store.append(make_article(2, blogger="Blogger B"))
+
+    lines = (tmp_path / "scraped_articles.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["title"] == "Άρθρο 1"
+
+    with JsonlArticleStore(tmp_path) as store:
+        assert store.urls == {
+            "https://www.gazzetta.gr/article/1",
+            "https://www.gazzetta.gr/article/2",
+        }
+        assert [a["title"] for a in store.iter_articles("Blogger B")] == ["Άρθρο 2"]
+
+
+def test_recovers_missing_index_entries_and_partial_line(tmp_path):
+    with JsonlArticleStore(tmp_path) as store:
+        store.append(make_article(1))
+
+    # Simulate a crash after the data write but before the index write
+    with open(tmp_path / "scraped_articles.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(make_article(2), ensure_ascii=False) + "\n")
+        f.write('{"title": "half written')
+
+    with JsonlArticleStore(tmp_path) as store:
+        assert "https://www.gazzetta.gr/article/2" in store
+        assert len(list(store.iter_articles())) == 2
+
+
+def test_export_json_and_csv(tmp_path):
+    with JsonlArticleStore(tmp_path) as store:
+        store.append(make_article(1))
+        store.append(make_article(2, blogger="Blogger B"))
+        store.append(make_article(3))
+
+        bloggers = [
+            {"name": "Blogger A", "profile_url": "https://www.gazzetta.gr/a"},
+            {"name": "Blogger B", "profile_url": "https://www.gazzetta.gr/b"},
+        ]
+        store.export_json(tmp_path / "out.json", bloggers)
+        store.export_csv(tmp_path / "out.csv", bloggers, chunk_size=2)
+
+    exported = json.loads((tmp_path / "out.json").read_text())
+    assert [b["name"] for b in exported] == ["Blogger A", "Blogger B"]
+    assert [a["title"] for a in exported[0]["articles"]] == ["Άρθρο 1", "Άρθρο 3"]
+    assert exported[1]["profile_url"] == "https://www.gazzetta.gr/b"
+
+    csv_lines = (tmp_path / "out.csv").read_text().splitlines()
+    assert csv_lines[0].startswith("blogger_name,blogger_url")
+    assert len(csv_lines) == 4
+
+
+def test_convert_legacy_json(tmp_path):
+    legacy_flat = tmp_path / "scraped_articles.json"
+    legacy_flat.write_text(json.dumps([make_article(1), make_article(2)]))
+    legacy_nested = tmp_path / "gazzetta_bloggers_articles.json"
+    nested_article = make_article(3)
+    del nested_article["blogger_name"]
+    legacy_nested.write_text(
+        json.dumps(
+            [{"name": "Blogger C", "profile_url": "/c", "articles": [nested_article]}]
+        )
+    )
+
+    with JsonlArticleStore(tmp_path / "store") as store:
+        assert convert_legacy_json(legacy_flat, store) == 2
+        assert convert_legacy_json(legacy_nested, store) == 1
+        # Re-running the conversion does not duplicate articles
+        assert convert_legacy_json(legacy_flat, store) == 0
+        assert [a["title"] for a in store.iter_articles("Blogger C")] == ["Άρθρο 3"]
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from core.db.streaming import LoadCheckpoint, StreamPosition, _JsonReader, iter_articles
+
+
+def nested_export(bloggers=3, articles=4):
+    return [
+        {
+            "name": f"Μπλόγκερ {b}",
+            "profile_url": f"https://www.gazzetta.gr/blogger/{b}",
+            "articles": [
+                {"title": f"Άρθρο {b}-{i}", "article_url": f"u/{b}/{i}", "views": i}
+                for i in range(articles if b != 1 else 0)
+            ],
+        }
+        for b in range(bloggers)
+    ]
+
+
+@pytest.fixture
+def tiny_chunks(monkeypatch):
+    """Read a few bytes at a time so values straddle chunk boundaries."""
+    monkeypatch.setattr(_JsonReader.__init__, "__defaults__", (5,))
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streams_nested_export(tmp_path, tiny_chunks, indent):
+    path = tmp_path / "gazzetta_bloggers_articles.json"
+    path.write_text(
+        json.dumps(nested_export(), ensure_ascii=False, indent=indent),
+        encoding="utf-8",
+    )
+
+    articles = [article for article, _ in iter_articles(path)]
+
+    assert [a["article_url"] for a in articles] == [
+        f"u/{b}/{i}" for b in (0, 2) for i in range(4)
+    ]
+    assert articles[5] == {
+        "title": "Άρθρο 2-1",
+        "article_url": "u/2/1",
+        "views": 1,
+        "blogger_name": "Μπλόγκερ 2",
+        "blogger_url": "https://www.gazzetta.gr/blogger/2",
+    }
+
+
+@pytest.mark.parametrize(
+    "file_name, content",
+    [
+        ("flat.json", json.dumps(nested_export()[0]["articles"], indent=1)),
+        ("export.json", json.dumps(nested_export(), ensure_ascii=False)),
+        (
+            "scraped_articles.jsonl",
+            "".join(
+                json.dumps(a, ensure_ascii=False) + "\n"
+                for a in nested_export()[2]["articles"]
+            ),
+        ),
+    ],
+)
+def test_resumes_from_every_position(tmp_path, tiny_chunks, file_name, content):
+    path = tmp_path / file_name
+    path.write_text(content, encoding="utf-8")
+    read = list(iter_articles(path))
+    urls = [article["article_url"] for article, _ in read]
+
+    for i, (_, position) in enumerate(read):
+        resumed = [a["article_url"] for a, _ in iter_articles(path, position)]
+        assert resumed == urls[i + 1 :]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    data_file = tmp_path / "scraped_articles.jsonl"
+    data_file.write_text("{}\n" * 10)
+
+    checkpoint = LoadCheckpoint.for_file(data_file)
+    checkpoint.save(StreamPosition(9, {"name": "Μπλόγκερ"}), loaded=3)
+
+    restored = LoadCheckpoint.for_file(data_file)
+    assert restored.position == StreamPosition(9, {"name": "Μπλόγκερ"})
+    assert restored.loaded == 3
+
+    # A replaced, shorter file invalidates the checkpoint
+    data_file.write_text("{}\n")
+    assert LoadCheckpoint.for_file(data_file).offset == 0
+
+    checkpoint.clear()
+    assert not checkpoint.path.exists()
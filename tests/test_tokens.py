@@ -0,0 +1,106 @@
+from unittest.mock import Mock
+
+import pytest
+
+from core.nlp.prefilter import mentions_pattern
+from core.nlp.stance_predictor import classify_article_with_explanation
+from core.nlp.text import fold
+from core.nlp.tokens import (
+    TokenBudget,
+    aggregate_stances,
+    count_tokens,
+)
+
+FILLER = "Η αγωνιστική συνεχίζεται με πολλά παιχνίδια το Σαββατοκύριακο. " * 20
+LEAD = "Εισαγωγή του άρθρου για την αγωνιστική."
+ABOUT_PAOK = "Ο ΠΑΟΚ έπαιξε εξαιρετικά και κέρδισε δίκαια."
+ABOUT_REFEREE = "Ο διαιτητής έκανε σοβαρά λάθη στο ματς."
+
+
+def make_article():
+    return "\n\n".join(
+        [LEAD, FILLER, FILLER, ABOUT_PAOK, FILLER, ABOUT_REFEREE, FILLER]
+    )
+
+
+def test_mentions_match_inflected_and_unaccented_forms():
+    pattern = mentions_pattern([("Ολυμπιακός", "club"), ("Άρης", "club")])
+    for text in ["του Ολυμπιακού", "ΟΛΥΜΠΙΑΚΟΣ", "στον Άρη", "ο αρης"]:
+        assert pattern.search(fold(text)), text
+    assert not pattern.search(fold("ο Παναθηναϊκός"))
+    assert mentions_pattern([("διαιτησία", "referee")]).search(fold(ABOUT_REFEREE))
+
+
+def test_short_articles_are_sent_whole():
+    budget = TokenBudget(max_tokens=1000)
+    assert budget.prepare(ABOUT_PAOK, [("ΠΑΟΚ", "club")]) == [ABOUT_PAOK]
+    assert budget.stats.truncated == 0
+
+
+def test_select_keeps_lead_and_relevant_paragraphs_in_order():
+    article = make_article()
+    max_tokens = count_tokens(FILLER) + 50
+    budget = TokenBudget(max_tokens=max_tokens)
+
+    [text] = budget.prepare(article, [("ΠΑΟΚ", "club"), ("διαιτησία", "referee")])
+
+    lines = text.split("\n")
+    assert lines[0] == LEAD
+    assert lines.index(ABOUT_PAOK) < lines.index(ABOUT_REFEREE)
+    assert count_tokens(text) <= max_tokens
+    assert budget.stats.truncated == 1
+    assert budget.stats.article_tokens == count_tokens(article)
+    assert budget.stats.sent_tokens < budget.stats.article_tokens
+
+    # Relevant paragraphs come before filler when the budget is tight
+    relevant = [LEAD, ABOUT_PAOK, ABOUT_REFEREE]
+    budget = TokenBudget(max_tokens=sum(map(count_tokens, relevant)) + 3)
+    [text] = budget.prepare(article, [("ΠΑΟΚ", "club"), ("διαιτησία", "referee")])
+    assert text == "\n".join(relevant)
+
+
+def test_chunk_sends_only_chunks_mentioning_a_target():
+    budget = TokenBudget(max_tokens=count_tokens(FILLER) + 50, strategy="chunk")
+
+    chunks = budget.prepare(make_article(), [("ΠΑΟΚ", "club")])
+
+    assert len(chunks) == 1
+    assert ABOUT_PAOK in chunks[0]
+    assert budget.stats.chunked == 0
+    chunks = budget.prepare(
+        make_article(), [("διαιτησία", "referee"), ("ΠΑΟΚ", "club")]
+    )
+    assert len(chunks) == 2
+    assert budget.stats.chunked == 1
+    with pytest.raises(ValueError):
+        TokenBudget(strategy="summarize")
+
+
+def test_aggregate_stances_prefers_non_neutral_majority():
+    assert aggregate_stances([("ουδέτερη", "α"), ("αρνητική", "β")]) == (
+        "αρνητική",
+        "β",
+    )
+    assert aggregate_stances(
+        [("θετική", "α"), ("αρνητική", "β"), ("αρνητική", "γ")]
+    ) == ("αρνητική", "β")
+    assert aggregate_stances([("ουδέτερη", "α"), ("ουδέτερη", "β")]) == (
+        "ουδέτερη",
+        "α",
+    )
+
+
+def test_classify_with_chunk_budget_aggregates_chunks():
+    client = Mock()
+    replies = iter(["ουδέτερη\nΑ", "αρνητική\nΒ"])
+    client.chat.completions.create.side_effect = lambda **kwargs: Mock(
+        choices=[Mock(message=Mock(content=next(replies)))]
+    )
+    budget = TokenBudget(max_tokens=count_tokens(FILLER) + 50, strategy="chunk")
+    article = make_article().replace(ABOUT_PAOK, "Ο ΠΑΟΚ ηττήθηκε.")
+    article = article.replace(ABOUT_REFEREE, "Ο ΠΑΟΚ δεν είχε καλό διαιτητή.")
+
+    stance = classify_article_with_explanation(client, article, "ΠΑΟΚ", budget=budget)
+
+    assert stance == ("αρνητική", "Β")
+    assert client.chat.completions.create.call_count == 2